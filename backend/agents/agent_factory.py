@@ -3,12 +3,13 @@ Agent Factory - Creates LangChain Agents for each sub-agent
 """
 
 import os
-from typing import List
+from typing import List, Optional
 from langchain.agents import create_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.tools import BaseTool
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 
+from .llm_registry import get_llm
 from .tools import (
     GOOGLEMAP_TOOLS,
     CALENDAR_TOOLS,
@@ -19,17 +20,29 @@ from .tools import (
 load_dotenv()
 
 
-def create_googlemap_agent():
+def _direct_return_enabled(direct_return: Optional[bool]) -> bool:
+    """Resolve direct-return mode (defaults to AGENT_DIRECT_RETURN, "true")."""
+    if direct_return is None:
+        return os.getenv("AGENT_DIRECT_RETURN", "true").lower() == "true"
+    return direct_return
+
+
+def _agent_tools(tools: List[BaseTool], direct_return: bool) -> List[BaseTool]:
+    """
+    Tools for an agent. In direct-return mode each tool is marked
+    return_direct, so the ReAct loop ends with the tool's structured result
+    instead of another model turn rephrasing it; the supervisor formats the
+    result locally.
+    """
+    if not direct_return:
+        return tools
+    return [t.model_copy(update={"return_direct": True}) for t in tools]
+
+
+def create_googlemap_agent(direct_return: Optional[bool] = None):
     """Create GoogleMap Agent with LangChain."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found")
-    
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=api_key,
-        temperature=0.3
-    )
+    # Shared, pooled client (see llm_registry)
+    model = get_llm(temperature=0.3)
     
     system_prompt = """You are a Google Maps search assistant. Your role is to help users find nearby places, restaurants, businesses, and locations.
 
@@ -43,22 +56,15 @@ Always provide helpful, accurate location information."""
     
     return create_agent(
         model=model,
-        tools=GOOGLEMAP_TOOLS,
+        tools=_agent_tools(GOOGLEMAP_TOOLS, _direct_return_enabled(direct_return)),
         system_prompt=system_prompt
     )
 
 
-def create_calendar_agent():
+def create_calendar_agent(direct_return: Optional[bool] = None):
     """Create Calendar Agent with LangChain."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found")
-    
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=api_key,
-        temperature=0.3
-    )
+    # Shared, pooled client (see llm_registry)
+    model = get_llm(temperature=0.3)
     
     system_prompt = """You are a calendar management assistant. Your role is to help users manage their schedule and events.
 
@@ -78,22 +84,15 @@ Always use 24-hour format (HH:MM) when calling the tool, even if the user specif
     
     return create_agent(
         model=model,
-        tools=CALENDAR_TOOLS,
+        tools=_agent_tools(CALENDAR_TOOLS, _direct_return_enabled(direct_return)),
         system_prompt=system_prompt
     )
 
 
-def create_telephone_agent():
+def create_telephone_agent(direct_return: Optional[bool] = None):
     """Create Telephone Agent with LangChain."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found")
-    
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=api_key,
-        temperature=0.3
-    )
+    # Shared, pooled client (see llm_registry)
+    model = get_llm(temperature=0.3)
     
     system_prompt = """You are a telephone assistant. Your role is to help users make phone calls via Fonoster.
 
@@ -108,22 +107,15 @@ Always confirm call initiation and provide call details."""
     
     return create_agent(
         model=model,
-        tools=TELEPHONE_TOOLS,
+        tools=_agent_tools(TELEPHONE_TOOLS, _direct_return_enabled(direct_return)),
         system_prompt=system_prompt
     )
 
 
-def create_research_agent():
+def create_research_agent(direct_return: Optional[bool] = None):
     """Create Research Agent with LangChain."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found")
-    
-    model = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=api_key,
-        temperature=0.7
-    )
+    # Shared, pooled client (see llm_registry)
+    model = get_llm(temperature=0.7)
     
     system_prompt = """You are a research assistant. Your role is to provide accurate, well-structured information on various topics.
 
@@ -138,7 +130,7 @@ Always provide helpful, accurate research results."""
     
     return create_agent(
         model=model,
-        tools=RESEARCH_TOOLS,
+        tools=_agent_tools(RESEARCH_TOOLS, _direct_return_enabled(direct_return)),
         system_prompt=system_prompt
     )
 
@@ -0,0 +1,283 @@
+"""
+TTL/LRU Cache
+Size-bounded cache with per-entry expiry and pluggable storage backends:
+an in-process dict or a SQLite file that survives restarts and can be
+shared by several worker processes.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Dict
+
+from .metrics import metrics
+
+
+class CacheBackend:
+    """Storage interface used by TTLCache. Values must be JSON-serializable."""
+
+    # True if calls do I/O (TTLCache.aget/aset then run them in a worker thread)
+    blocking = False
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) and mark the key as recently used."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def evict(self, max_entries: int) -> int:
+        """Drop least-recently-used entries beyond max_entries; return the count removed."""
+        raise NotImplementedError
+
+    def purge_expired(self, now: float) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend; an OrderedDict keeps LRU order."""
+
+    def __init__(self):
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def evict(self, max_entries: int) -> int:
+        removed = 0
+        with self._lock:
+            while len(self._data) > max_entries:
+                self._data.popitem(last=False)
+                removed += 1
+        return removed
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [k for k, (_, expires_at) in self._data.items() if expires_at <= now]
+            for k in expired:
+                del self._data[k]
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite-file backend. Each cache uses its own table (namespace) so several
+    caches can share one file; WAL mode lets multiple workers read and write.
+
+    A hit only refreshes the entry's LRU timestamp if it is older than
+    CACHE_TOUCH_INTERVAL_SECONDS (default 60), so most reads write nothing.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, namespace: str, touch_interval: Optional[float] = None):
+        if not namespace.replace("_", "").isalnum():
+            raise ValueError(f"Invalid cache namespace: {namespace}")
+        self.path = path
+        self.table = f"cache_{namespace}"
+        self.touch_interval = (
+            touch_interval if touch_interval is not None
+            else float(os.getenv("CACHE_TOUCH_INTERVAL_SECONDS", "60"))
+        )
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # With WAL this is still safe against corruption; only the last
+            # commits may be lost on power failure, which a cache can afford
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, expires_at, accessed_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] >= self.touch_interval:
+                self._conn.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, time.time())
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def evict(self, max_entries: int) -> int:
+        with self._lock, self._conn:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            excess = count - max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+        return excess
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+def create_backend(kind: str, namespace: str, path: Optional[str] = None) -> CacheBackend:
+    """
+    Create a cache backend by name.
+
+    Args:
+        kind: "memory" or "sqlite"
+        namespace: Cache name (SQLite table suffix)
+        path: SQLite file path (defaults to CACHE_SQLITE_PATH or cache.sqlite3)
+    """
+    kind = (kind or "memory").lower()
+    if kind == "memory":
+        return MemoryCacheBackend()
+    if kind == "sqlite":
+        return SQLiteCacheBackend(path or os.getenv("CACHE_SQLITE_PATH", "cache.sqlite3"), namespace)
+    raise ValueError(f"Unknown cache backend: {kind}. Use 'memory' or 'sqlite'")
+
+
+class TTLCache:
+    """
+    LRU cache with time-to-live expiry on top of a CacheBackend.
+
+    Hits, misses and evictions are recorded as cache.<name>.* metrics.
+    Returned values are shared with the cache - treat them as read-only.
+    Async code should use aget/aset, which keep blocking backends (SQLite)
+    off the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: Optional[CacheBackend] = None,
+        max_entries: int = 1024,
+        ttl: float = 3600.0
+    ):
+        self.name = name
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        metrics.register(f"cache.{name}", self.stats)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                metrics.incr(f"cache.{self.name}.hits")
+                return value
+            self.backend.delete(key)
+            metrics.incr(f"cache.{self.name}.expired")
+        metrics.incr(f"cache.{self.name}.misses")
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; evicts least-recently-used entries beyond max_entries."""
+        self.backend.set(key, value, time.time() + (self.ttl if ttl is None else ttl))
+        evicted = self.backend.evict(self.max_entries)
+        if evicted:
+            metrics.incr(f"cache.{self.name}.evictions", evicted)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() without blocking the event loop."""
+        if not self.backend.blocking:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """set() without blocking the event loop."""
+        if not self.backend.blocking:
+            self.set(key, value, ttl)
+            return
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit ratio for the metrics endpoint."""
+        hits = metrics.get(f"cache.{self.name}.hits")
+        misses = metrics.get(f"cache.{self.name}.misses")
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "evictions": metrics.get(f"cache.{self.name}.evictions"),
+            "hit_ratio": round(hits / total, 4) if total else None
+        }
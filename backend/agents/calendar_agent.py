@@ -170,7 +170,30 @@ class CalendarAgent:
         except ValueError:
             return None
     
-    def format_events(self, result: Dict[str, Any]) -> str:
+    @staticmethod
+    def format_result(result: Dict[str, Any]) -> str:
+        """Format an add-event or list-events result as a readable string."""
+        if "events" in result:
+            return CalendarAgent.format_events(result)
+        return CalendarAgent.format_added_event(result)
+    
+    @staticmethod
+    def format_added_event(result: Dict[str, Any]) -> str:
+        """Format the result of adding an event as a readable string."""
+        if not result.get("success"):
+            return f"❌ Error: {result.get('error', 'Unknown error')}"
+        
+        event = result.get("event", {})
+        formatted = f"📅 {result.get('message', 'Event added to calendar')}\n"
+        if event.get("location"):
+            formatted += f"  📍 Location: {event['location']}\n"
+        if event.get("description"):
+            formatted += f"  📝 {event['description']}\n"
+        
+        return formatted
+    
+    @staticmethod
+    def format_events(result: Dict[str, Any]) -> str:
         """Format events as a readable string."""
         if not result.get("success"):
             return f"❌ Error: {result.get('error', 'Unknown error')}"
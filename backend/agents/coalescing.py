@@ -0,0 +1,221 @@
+"""
+Query Coalescing
+Single-flight execution for identical in-flight queries: concurrent callers
+with the same normalized query share one supervisor run. The run's chunks are
+fanned out to every subscriber, and late joiners get the chunks they missed
+replayed first.
+
+Queries with side effects (phone calls, calendar events) are never shared.
+They are excluded up front when the intent matcher predicts such agents, and
+again once the real plan arrives: callers that joined before the plan was
+known detach and run the query on their own.
+"""
+
+import os
+import asyncio
+from contextlib import aclosing
+from typing import Dict, Any, List, Optional, AsyncIterator
+
+from .deadline import deadline_after, request_budget
+from .metrics import metrics
+
+
+# Plan flags whose agents act on the outside world
+SIDE_EFFECT_FLAGS = ("use_telephone", "use_calendar")
+
+# End-of-stream marker on subscriber queues
+_END = object()
+
+
+def coalesce_key(query: str) -> str:
+    """Normalize a query for single-flight matching (case and whitespace only)."""
+    return " ".join(query.lower().split())
+
+
+def has_side_effects(plan: Dict[str, Any]) -> bool:
+    return any(plan.get(flag) for flag in SIDE_EFFECT_FLAGS)
+
+
+class _Flight:
+    """One shared supervisor run and its subscribers."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.history: List[Dict[str, Any]] = []
+        self.queues: List[asyncio.Queue] = []
+        self.plan_seen = False
+        self.shareable = True
+        self.deadline: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class QueryCoalescer:
+    """
+    Shares supervisor runs between concurrent identical queries.
+
+    The shared run belongs to the flight, not to any caller: it is cancelled
+    only when every subscriber has gone. It runs under the first caller's
+    deadline; a caller whose own deadline is more than
+    COALESCE_DEADLINE_SLACK_SECONDS (default 10) later starts a new run
+    instead, which later callers then join.
+
+    Metrics:
+        coalesce.leaders / followers: callers that started / joined a run
+        coalesce.bypassed: side-effecting queries run alone up front
+        coalesce.detached: followers that left once the plan showed side effects
+        coalesce.outlasted: callers that did not join because the run's deadline was too early
+        coalesce.flights (gauge): shared runs in flight
+    """
+
+    def __init__(self, supervisor: Any, enabled: Optional[bool] = None):
+        """
+        Args:
+            supervisor: SupervisorAgentLangGraph (stream_query / process_query / intent_matcher)
+            enabled: Defaults to QUERY_COALESCING ("true")
+        """
+        if enabled is None:
+            enabled = os.getenv("QUERY_COALESCING", "true").lower() == "true"
+        self.supervisor = supervisor
+        self.enabled = enabled
+        self.deadline_slack = float(os.getenv("COALESCE_DEADLINE_SLACK_SECONDS", "10"))
+        self._flights: Dict[str, _Flight] = {}
+
+    def _coalescable(self, query: str) -> bool:
+        if not self.enabled:
+            return False
+        if has_side_effects(self.supervisor.intent_matcher.match(query).plan):
+            metrics.incr("coalesce.bypassed")
+            return False
+        return True
+
+    async def stream(self, query: str, deadline_seconds: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Drop-in for supervisor.stream_query that shares identical runs."""
+        if self._coalescable(query):
+            source = self._shared_stream(query, deadline_seconds)
+        else:
+            source = self.supervisor.stream_query(query, deadline_seconds=deadline_seconds)
+        async with aclosing(source) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    async def run(self, query: str, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Drop-in for supervisor.process_query that shares identical runs."""
+        if not self._coalescable(query):
+            return await self.supervisor.process_query(query, deadline_seconds=deadline_seconds)
+
+        final_state: Dict[str, Any] = {}
+        async with aclosing(self._shared_stream(query, deadline_seconds)) as chunks:
+            async for chunk in chunks:
+                if "summary_delta" not in chunk:
+                    final_state = chunk
+        return self.supervisor.build_result(query, final_state)
+
+    async def _shared_stream(self, query: str, deadline_seconds: Optional[float]) -> AsyncIterator[Dict[str, Any]]:
+        key = coalesce_key(query)
+        deadline = deadline_after(request_budget(deadline_seconds))
+        flight = self._flights.get(key)
+        if flight is not None and not self._covers(flight, deadline):
+            # Joining would cut this caller off well before its own deadline
+            metrics.incr("coalesce.outlasted")
+            flight = None
+        leader = flight is None
+        if leader:
+            flight = self._start(key, query, deadline_seconds, deadline)
+            metrics.incr("coalesce.leaders")
+        else:
+            metrics.incr("coalesce.followers")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for chunk in flight.history:
+            queue.put_nowait(chunk)
+        flight.queues.append(queue)
+
+        detached = False
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                # The plan is the first chunk; a follower must not share a
+                # run that places calls or books events
+                if not leader and not flight.shareable:
+                    detached = True
+                    break
+                yield item
+        finally:
+            self._unsubscribe(flight, queue)
+
+        if detached:
+            metrics.incr("coalesce.detached")
+            async with aclosing(self.supervisor.stream_query(query, deadline_seconds=deadline_seconds)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+
+    def _covers(self, flight: _Flight, deadline: Optional[float]) -> bool:
+        """Whether a flight's deadline is close enough to a caller's for it to join."""
+        if flight.deadline is None:
+            return True
+        if deadline is None:
+            return False
+        return flight.deadline >= deadline - self.deadline_slack
+
+    def _start(
+        self,
+        key: str,
+        query: str,
+        deadline_seconds: Optional[float],
+        deadline: Optional[float]
+    ) -> _Flight:
+        previous = self._flights.get(key)
+        if previous is not None:
+            # Keeps running for its subscribers; new callers join this one
+            self._release(previous)
+        flight = _Flight(key)
+        flight.deadline = deadline
+        self._flights[key] = flight
+        metrics.add_gauge("coalesce.flights", 1)
+        flight.task = asyncio.ensure_future(self._produce(flight, query, deadline_seconds))
+        return flight
+
+    async def _produce(self, flight: _Flight, query: str, deadline_seconds: Optional[float]) -> None:
+        """Run the query once and publish every chunk to the subscribers."""
+        try:
+            async with aclosing(self.supervisor.stream_query(query, deadline_seconds=deadline_seconds)) as chunks:
+                async for chunk in chunks:
+                    if not flight.plan_seen and chunk.get("plan"):
+                        flight.plan_seen = True
+                        if has_side_effects(chunk["plan"]):
+                            # Nobody else may join; current followers detach
+                            flight.shareable = False
+                            self._release(flight)
+                    self._publish(flight, chunk)
+            self._publish(flight, _END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._publish(flight, e)
+        finally:
+            self._release(flight)
+
+    @staticmethod
+    def _publish(flight: _Flight, item: Any) -> None:
+        if isinstance(item, dict):
+            flight.history.append(item)
+        for queue in flight.queues:
+            queue.put_nowait(item)
+
+    def _unsubscribe(self, flight: _Flight, queue: asyncio.Queue) -> None:
+        if queue in flight.queues:
+            flight.queues.remove(queue)
+        # Last subscriber gone: stop paying for the run
+        if not flight.queues and flight.task and not flight.task.done():
+            self._release(flight)
+            flight.task.cancel()
+
+    def _release(self, flight: _Flight) -> None:
+        """Stop new callers from joining a flight."""
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+            metrics.add_gauge("coalesce.flights", -1)
@@ -0,0 +1,99 @@
+"""
+Request Deadlines
+End-to-end time budget for one query. The absolute deadline travels in the
+graph state and is bound to a context variable inside each node, so tools
+and HTTP calls made deeper in the stack size their timeouts to what is left.
+"""
+
+import os
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Optional, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+# Slack on top of the budget for the outer guard around a whole run, so nodes
+# that honour the deadline get to return their partial results first
+GRACE_SECONDS = 2.0
+
+# Absolute deadline (time.time() seconds) for the current request, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request's time budget is used up."""
+
+
+def default_budget() -> Optional[float]:
+    """Default per-request budget in seconds (REQUEST_DEADLINE_SECONDS; 0 disables)."""
+    seconds = float(os.getenv("REQUEST_DEADLINE_SECONDS", "60"))
+    return seconds if seconds > 0 else None
+
+
+def request_budget(requested: Optional[float] = None) -> Optional[float]:
+    """Budget for one request: the client's request, capped by the default."""
+    default = default_budget()
+    if not requested or requested <= 0:
+        return default
+    return min(requested, default) if default else requested
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """Absolute deadline `seconds` from now (None for no deadline)."""
+    if seconds is None or seconds <= 0:
+        return None
+    return time.time() + seconds
+
+
+def use_deadline(at: Optional[float]) -> None:
+    """Bind a deadline to the current context (a graph node's task)."""
+    _deadline.set(at)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def remaining(at: Optional[float] = None) -> Optional[float]:
+    """Seconds left before the deadline (None if there is no deadline)."""
+    at = at if at is not None else _deadline.get()
+    if at is None:
+        return None
+    return at - time.time()
+
+
+def call_timeout(default: float) -> float:
+    """
+    Timeout for one outbound call: the call's usual timeout, capped by the
+    remaining budget.
+
+    Raises:
+        DeadlineExceeded: if the budget is already used up
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+
+async def within_deadline(awaitable: Awaitable[T], at: Optional[float] = None) -> T:
+    """
+    Await with the remaining budget as timeout (no limit without a deadline).
+
+    Raises:
+        DeadlineExceeded: if the budget runs out first
+    """
+    left = remaining(at)
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded("Request deadline exceeded") from e
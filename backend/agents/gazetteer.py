@@ -0,0 +1,280 @@
+"""
+Landmark Gazetteer
+Offline coordinates for well-known landmarks and districts, checked before
+the Geocoding API. Names (and aliases) are normalized like geocode cache
+keys and kept as one sorted NumPy string array next to a float32
+coordinate array, so lookups are binary searches.
+
+Lookup order: exact name, the name without trailing region words
+("Taipei 101, Taipei, Taiwan"), a unique prefix of whole words ("Shilin
+Night"), then a fuzzy match for small typos ("Ximenting"). Short or partial
+keys ("Taipei 1", "Dan") match neither and go to the geocoder.
+
+Build the compact file from a CSV (name, lat, lng, aliases separated by |):
+    python -m agents.gazetteer build data/gazetteer.csv -o data/gazetteer.npz
+Look up a name, or measure lookup latency and geocoding calls avoided:
+    python -m agents.gazetteer lookup "Taipei 101"
+    python -m agents.gazetteer bench [--queries locations.txt]
+"""
+
+import os
+import csv
+import time
+import difflib
+import argparse
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .geocode_cache import normalize_address, parse_coordinates
+from .metrics import metrics
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEFAULT_CSV = os.path.join(DATA_DIR, "gazetteer.csv")
+DEFAULT_PATH = os.path.join(DATA_DIR, "gazetteer.npz")
+
+# Trailing words that only narrow down the region ("..., Taipei City, Taiwan")
+REGION_WORDS = {"taiwan", "roc", "taipei", "city", "district", "台灣", "臺灣", "台北", "臺北", "台北市", "臺北市"}
+
+
+def read_csv(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read a gazetteer CSV into sorted normalized names and their coordinates.
+
+    Columns: name, lat, lng and optionally aliases (separated by |). Each
+    alias becomes its own entry; if two rows share a name the first wins.
+    """
+    entries: Dict[str, Tuple[float, float]] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            names = [row["name"]] + [a for a in (row.get("aliases") or "").split("|") if a.strip()]
+            for name in names:
+                key = normalize_address(name)
+                if key and key not in entries:
+                    entries[key] = (float(row["lat"]), float(row["lng"]))
+    keys = sorted(entries)
+    names = np.array(keys, dtype=str)
+    coords = np.array([entries[k] for k in keys], dtype=np.float32).reshape(-1, 2)
+    return names, coords
+
+
+def build(csv_path: str, out_path: str) -> int:
+    """Write the compact .npz gazetteer built from a CSV; returns the number of names."""
+    names, coords = read_csv(csv_path)
+    np.savez_compressed(out_path, names=names, coords=coords)
+    return len(names)
+
+
+class Gazetteer:
+    """
+    Sorted-name gazetteer.
+
+    Configuration (environment):
+        GAZETTEER: "true" (default) to check it before geocoding
+        GAZETTEER_PATH: built .npz file (default data/gazetteer.npz; the
+            bundled data/gazetteer.csv is read if it does not exist)
+        GAZETTEER_FUZZY_CUTOFF: similarity needed for a fuzzy match, 0-1 (default 0.85)
+        GAZETTEER_MIN_KEY_LENGTH: shortest key matched by prefix or fuzzily (default 6)
+    """
+
+    def __init__(
+        self,
+        names: np.ndarray,
+        coords: np.ndarray,
+        fuzzy_cutoff: Optional[float] = None,
+        min_key_length: Optional[int] = None
+    ):
+        self.names = names
+        self.coords = coords
+        self.fuzzy_cutoff = fuzzy_cutoff or float(os.getenv("GAZETTEER_FUZZY_CUTOFF", "0.85"))
+        self.min_key_length = min_key_length or int(os.getenv("GAZETTEER_MIN_KEY_LENGTH", "6"))
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "Gazetteer":
+        """Load a built .npz file, or build in memory from a .csv."""
+        path = path or os.getenv("GAZETTEER_PATH", DEFAULT_PATH)
+        if not os.path.exists(path) and path == DEFAULT_PATH:
+            path = DEFAULT_CSV
+        if path.lower().endswith(".csv"):
+            names, coords = read_csv(path)
+        else:
+            with np.load(path) as data:
+                names, coords = data["names"], data["coords"]
+        return cls(names, coords)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _coordinates(self, index: int) -> Dict[str, float]:
+        lat, lng = self.coords[index]
+        # float32 keeps about 1 m of precision
+        return {"lat": round(float(lat), 5), "lng": round(float(lng), 5)}
+
+    def _exact(self, key: str) -> Optional[int]:
+        i = int(np.searchsorted(self.names, key))
+        if i < len(self.names) and self.names[i] == key:
+            return i
+        return None
+
+    def _prefix_range(self, key: str) -> Tuple[int, int]:
+        return int(np.searchsorted(self.names, key)), int(np.searchsorted(self.names, key + "\uffff"))
+
+    def prefix(self, text: str, limit: int = 10) -> List[str]:
+        """Names starting with the normalized text, in sorted order."""
+        key = normalize_address(text)
+        if not key:
+            return []
+        start, end = self._prefix_range(key)
+        return self.names[start:min(end, start + limit)].tolist()
+
+    def _fuzzy(self, key: str) -> Optional[int]:
+        # Only names with the same first character are compared
+        start, end = self._prefix_range(key[0])
+        matches = difflib.get_close_matches(key, self.names[start:end].tolist(), n=1, cutoff=self.fuzzy_cutoff)
+        if not matches:
+            return None
+        # "Taipei 103" must not resolve to "Taipei 101"
+        if [c for c in matches[0] if c.isdigit()] != [c for c in key if c.isdigit()]:
+            return None
+        return self._exact(matches[0])
+
+    def find(self, location: str) -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Resolve a location string.
+
+        Returns:
+            (matched name, {"lat", "lng"}), or None if not in the gazetteer
+        """
+        if parse_coordinates(location) is not None:
+            return None
+        key = normalize_address(location)
+        if not key:
+            return None
+
+        index = self._exact(key)
+        if index is None:
+            words = key.split(" ")
+            while len(words) > 1 and words[-1] in REGION_WORDS:
+                words.pop()
+                index = self._exact(" ".join(words))
+                if index is not None:
+                    break
+            key = " ".join(words)
+        # Short keys are too ambiguous to guess at ("Dan" is not "Daan")
+        if index is None and len(key) >= self.min_key_length:
+            # Whole words only ("Taipei 1" is not a prefix of "Taipei 101"), and
+            # only if all names it starts are the same place
+            start, end = self._prefix_range(key + " ")
+            candidates = range(start, min(end, start + 20))
+            if candidates and len({tuple(self.coords[i]) for i in candidates}) == 1:
+                index = start
+            if index is None:
+                index = self._fuzzy(key)
+        if index is None:
+            return None
+        return str(self.names[index]), self._coordinates(index)
+
+    def lookup(self, location: str) -> Optional[Dict[str, float]]:
+        """Coordinates for a location string, or None; counted as gazetteer.* metrics."""
+        started = time.perf_counter()
+        found = self.find(location)
+        metrics.incr("gazetteer.lookup_seconds", time.perf_counter() - started)
+        metrics.incr("gazetteer.hits" if found else "gazetteer.misses")
+        return found[1] if found else None
+
+
+def stats() -> Dict[str, Any]:
+    """Gazetteer size, hit ratio (each hit is a geocoding lookup avoided) and mean latency."""
+    hits = metrics.get("gazetteer.hits")
+    lookups = hits + metrics.get("gazetteer.misses")
+    return {
+        "names": len(_shared) if _shared is not None else 0,
+        "lookups": lookups,
+        "hits": hits,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "geocode_lookups_avoided": hits,
+        "mean_lookup_us": round(metrics.get("gazetteer.lookup_seconds") / lookups * 1e6, 2) if lookups else None
+    }
+
+
+_shared: Optional[Gazetteer] = None
+_load_failed = False
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Process-wide gazetteer (None if disabled or it could not be loaded)."""
+    global _shared, _load_failed
+    if os.getenv("GAZETTEER", "true").lower() != "true" or _load_failed:
+        return None
+    if _shared is None:
+        try:
+            _shared = Gazetteer.load()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Gazetteer] Could not load gazetteer: {type(e).__name__} {e}")
+            _load_failed = True
+            return None
+    return _shared
+
+
+metrics.register("gazetteer", stats)
+
+
+def _bench_queries(gazetteer: Gazetteer) -> List[str]:
+    """Sample location strings: every name as users write it, with region suffixes, typos and misses."""
+    queries = []
+    for name in gazetteer.names.tolist():
+        queries += [name.title(), f"{name}, Taipei, Taiwan"]
+        if len(name) > 8 and name.isascii():
+            queries.append(name[:-2] + name[-1] + name[-2])
+    queries += ["Xinyi Road Section 5", "Taipei 103", "Some Unknown Place", "25.0339,121.5645", "Tokyo Tower"]
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Landmark gazetteer tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="build the .npz gazetteer from a CSV")
+    build_cmd.add_argument("csv", nargs="?", default=DEFAULT_CSV)
+    build_cmd.add_argument("-o", "--output", default=DEFAULT_PATH)
+    lookup_cmd = sub.add_parser("lookup", help="resolve location strings")
+    lookup_cmd.add_argument("locations", nargs="+")
+    bench_cmd = sub.add_parser("bench", help="lookup latency and geocoding calls avoided")
+    bench_cmd.add_argument("--queries", help="file with one location string per line (default: generated samples)")
+    bench_cmd.add_argument("--path", help="gazetteer file (default GAZETTEER_PATH)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build(args.csv, args.output)
+        print(f"Wrote {count} names to {args.output} ({os.path.getsize(args.output)} bytes)")
+        return
+
+    if args.command == "lookup":
+        gazetteer = Gazetteer.load()
+        for location in args.locations:
+            print(f"{location!r}: {gazetteer.find(location)}")
+        return
+
+    gazetteer = Gazetteer.load(args.path)
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = _bench_queries(gazetteer)
+    timings, hits = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        found = gazetteer.find(query)
+        timings.append((time.perf_counter() - started) * 1e6)
+        hits += found is not None
+    timings = np.array(timings)
+    print(f"{len(gazetteer)} names, {gazetteer.names.nbytes + gazetteer.coords.nbytes} bytes of arrays")
+    print(f"{len(queries)} lookups: {hits} resolved offline ({hits / len(queries):.1%} of geocoding calls avoided)")
+    print(
+        f"latency us: p50 {np.percentile(timings, 50):.1f}, p95 {np.percentile(timings, 95):.1f}, "
+        f"p99 {np.percentile(timings, 99):.1f}, max {timings.max():.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Geocode Cache
+Long-lived cache of Geocoding API results keyed by a normalized address, so
+popular landmarks ("Taipei 101", "Ximending") are geocoded once rather than
+on every search. Backed by SQLite by default so entries survive restarts and
+are shared by all workers; a seed file can pre-load known places.
+"""
+
+import os
+import re
+import csv
+import json
+import asyncio
+import unicodedata
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .cache import TTLCache, create_backend
+from .metrics import metrics
+
+
+_SEPARATORS = re.compile(r"[\s,;/|]+")
+_PUNCTUATION = re.compile(r"[^\w\s-]")
+_COORDINATES = re.compile(r"^\s*(-?\d{1,3}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+
+def normalize_address(address: str) -> str:
+    """
+    Cache key for an address: Unicode-normalized, case-folded, punctuation
+    dropped and separators collapsed, e.g. "Taipei 101," and " taipei  101"
+    share a key. CJK text is kept as is.
+    """
+    text = unicodedata.normalize("NFKC", address).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def parse_coordinates(location: str) -> Optional[Dict[str, float]]:
+    """Return {"lat", "lng"} if the location is already a "lat,lng" pair."""
+    match = _COORDINATES.match(location)
+    if not match:
+        return None
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if -90 <= lat <= 90 and -180 <= lng <= 180:
+        return {"lat": lat, "lng": lng}
+    return None
+
+
+class GeocodeCache:
+    """
+    Cache of address -> coordinates lookups.
+
+    Addresses the API could not resolve are cached as {} for a shorter time,
+    so a misspelled landmark is not re-queried on every search.
+
+    Configuration (environment):
+        GEOCODE_CACHE_BACKEND: "sqlite" (default), "memory", or "off"
+        GEOCODE_CACHE_PATH: SQLite file (defaults to CACHE_SQLITE_PATH)
+        GEOCODE_CACHE_MAX_ENTRIES: size bound, least recently used evicted (default 10000)
+        GEOCODE_CACHE_TTL_SECONDS: entry lifetime (default 30 days)
+        GEOCODE_CACHE_NEGATIVE_TTL_SECONDS: lifetime of "not found" entries (default 3600)
+        GEOCODE_CACHE_SEED_FILE: JSON or CSV file of known places loaded at startup
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        seed_file: Optional[str] = None
+    ):
+        backend = (backend or os.getenv("GEOCODE_CACHE_BACKEND", "sqlite")).lower()
+        self.enabled = backend != "off"
+        self.negative_ttl = float(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", "3600"))
+        self.cache: Optional[TTLCache] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        if self.enabled:
+            self.cache = TTLCache(
+                "geocode",
+                backend=create_backend(backend, "geocode", path or os.getenv("GEOCODE_CACHE_PATH")),
+                max_entries=max_entries or int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000")),
+                ttl=ttl or float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+            )
+            seed_file = seed_file or os.getenv("GEOCODE_CACHE_SEED_FILE")
+            if seed_file:
+                self.load_seed(seed_file)
+
+    def load_seed(self, path: str) -> int:
+        """
+        Pre-load coordinates from a seed file, skipping addresses already cached.
+
+        Args:
+            path: JSON object ({"Taipei 101": {"lat": ..., "lng": ...}}) or
+                CSV file with address, lat and lng columns
+
+        Returns:
+            Number of entries added
+        """
+        if not self.enabled:
+            return 0
+        try:
+            if path.lower().endswith(".csv"):
+                with open(path, newline="", encoding="utf-8") as f:
+                    rows = [(row["address"], row["lat"], row["lng"]) for row in csv.DictReader(f)]
+            else:
+                with open(path, encoding="utf-8") as f:
+                    rows = [(address, c["lat"], c["lng"]) for address, c in json.load(f).items()]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"[GeocodeCache] Could not load seed file {path}: {type(e).__name__} {e}")
+            return 0
+
+        added = 0
+        for address, lat, lng in rows:
+            key = normalize_address(address)
+            # Checked on the backend directly so seeding does not count as misses
+            if not key or self.cache.backend.get(key) is not None:
+                continue
+            self.cache.set(key, {"lat": float(lat), "lng": float(lng)})
+            added += 1
+        print(f"[GeocodeCache] Loaded {added} of {len(rows)} seed entries from {path}")
+        return added
+
+    async def lookup(
+        self,
+        address: str,
+        geocode: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, float]]:
+        """
+        Coordinates for an address, from the cache or by calling `geocode`.
+
+        Concurrent lookups of the same address share one API call.
+
+        Args:
+            address: Location string, or a "lat,lng" pair (returned without a lookup)
+            geocode: Coroutine returning {"lat", "lng"}, {} if the address was
+                not found, or None on errors (not cached)
+
+        Returns:
+            {"lat", "lng"}, or None if the address could not be geocoded
+        """
+        coordinates = parse_coordinates(address)
+        if coordinates is not None:
+            return coordinates
+        if not self.enabled:
+            return await geocode(address) or None
+
+        key = normalize_address(address)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached or None
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            metrics.incr("cache.geocode.shared")
+            return await asyncio.shield(pending) or None
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await geocode(address)
+            if result is not None:
+                await self.cache.aset(key, result, ttl=None if result else self.negative_ttl)
+            future.set_result(result)
+        except BaseException:
+            # Waiters go without coordinates rather than share this caller's failure
+            future.set_result(None)
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+        return result or None
+
+
+_shared: Optional[GeocodeCache] = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """Process-wide geocode cache, created on first use."""
+    global _shared
+    if _shared is None:
+        _shared = GeocodeCache()
+    return _shared
@@ -4,9 +4,16 @@ Searches nearby businesses using Google Maps API.
 """
 
 import os
-import httpx
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+from .places import (
+    maps_api_base, place_result, fetch_details, geocode_location, request_text_search, request_place_details,
+    text_search_request
+)
+from .text_search_cache import get_text_search_cache
+from .place_details_cache import get_place_details_cache
+from .place_index import get_place_index
+from .ranking import rank_places, ranking_fields
 
 load_dotenv()
 
@@ -19,7 +26,7 @@ class GoogleMapAgent:
         if not self.api_key:
             raise ValueError("GOOGLE_MAPS_API_KEY not found in environment variables")
         
-        self.base_url = "https://maps.googleapis.com/maps/api/place"
+        self.base_url = f"{maps_api_base()}/place"
     
     async def search_nearby(
         self,
@@ -49,28 +56,28 @@ class GoogleMapAgent:
                     lat = geocode_result["lat"]
                     lng = geocode_result["lng"]
             
+            # Answer from the local index if this area was searched recently
+            if lat is not None and lng is not None:
+                indexed = get_place_index().search(query, lat, lng, radius, max_results)
+                if indexed is not None:
+                    return {
+                        "success": True,
+                        "query": query,
+                        "location": location,
+                        "results": indexed,
+                        "count": len(indexed),
+                        "partial": False,
+                        "source": "index"
+                    }
+            
             # Prefer Text Search API as it's more flexible for specific queries
             # Text Search works better for queries like "Indian restaurant near Taipei 101"
-            if location:
-                # Include location in search query for better results
-                search_query = f"{query} near {location}"
-            else:
-                search_query = query
-            
-            # Use Text Search API (better for specific cuisine/type searches)
-            url = f"{self.base_url}/textsearch/json"
-            params = {
-                "query": search_query,
-                "key": self.api_key
-            }
+            # Results are biased towards the geocoded location within the radius
+            coordinates = {"lat": lat, "lng": lng} if lat is not None and lng is not None else None
+            params, key = text_search_request(query, location, self.api_key, coordinates, radius)
             
-            # If we have coordinates, we can optionally add them for better relevance
-            # But Text Search handles location names well, so coordinates are optional
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
+            # Repeated searches are served from the cache
+            data = await get_text_search_cache().lookup(key, lambda: request_text_search(params))
             
             if data.get("status") != "OK":
                 error_msg = data.get("error_message", "")
@@ -99,34 +106,27 @@ class GoogleMapAgent:
                     "results": []
                 }
             
-            # Process results
+            # Process results; details are looked up concurrently
             places = data.get("results", [])[:max_results]
-            results = []
-            
-            for place in places:
-                place_id = place.get("place_id")
-                place_details = await self._get_place_details(place_id) if place_id else {}
-                
-                result = {
-                    "name": place.get("name", "Unknown"),
-                    "address": place.get("formatted_address", place.get("vicinity", "N/A")),
-                    "rating": place.get("rating", "N/A"),
-                    "phone_number": place_details.get("formatted_phone_number", "N/A"),
-                    "location": {
-                        "lat": place.get("geometry", {}).get("location", {}).get("lat"),
-                        "lng": place.get("geometry", {}).get("location", {}).get("lng")
-                    },
-                    "types": place.get("types", []),
-                    "place_id": place_id
-                }
-                results.append(result)
+            if lat is not None and lng is not None:
+                # Rank every candidate around the origin, then look up details for the top ones
+                places = rank_places(data.get("results", []), lat, lng, radius, max_results, query)
+            details, failed = await fetch_details(places, self._get_place_details)
+            results = [place_result(place, place_details) for place, place_details in zip(places, details)]
+            if lat is not None and lng is not None and not failed:
+                get_place_index().add(
+                    query, lat, lng, results,
+                    complete=len(data.get("results", [])) < max_results,
+                    ranking=ranking_fields(places, data.get("results", []))
+                )
             
             return {
                 "success": True,
                 "query": query,
                 "location": location,
                 "results": results,
-                "count": len(results)
+                "count": len(results),
+                "partial": failed > 0
             }
             
         except Exception as e:
@@ -137,57 +137,21 @@ class GoogleMapAgent:
             }
     
     async def _geocode_location(self, location: str) -> Optional[Dict[str, float]]:
-        """Geocode a location string to coordinates."""
-        try:
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
-            params = {
-                "address": location,
-                "key": self.api_key
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-            
-            if data.get("status") == "OK" and data.get("results"):
-                location_data = data["results"][0]["geometry"]["location"]
-                return {
-                    "lat": location_data["lat"],
-                    "lng": location_data["lng"]
-                }
-            
-            # Log error for debugging
-            if data.get("status") != "OK":
-                error_msg = data.get("error_message", "")
-                print(f"Geocoding API Error: {data.get('status')} - {error_msg}")
-            
-            return None
-        except Exception:
-            return None
+        """Geocode a location string to coordinates (cached, see geocode_cache)."""
+        return await geocode_location(location, self.api_key)
     
     async def _get_place_details(self, place_id: str) -> Dict[str, Any]:
-        """Get detailed information about a place."""
-        try:
-            url = f"{self.base_url}/details/json"
-            params = {
-                "place_id": place_id,
-                "fields": "formatted_phone_number,opening_hours,website",
-                "key": self.api_key
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-            
-            if data.get("status") == "OK":
-                return data.get("result", {})
-            return {}
-        except Exception:
-            return {}
+        """
+        Get detailed information about a place (cached per field, see place_details_cache).
+        
+        Raises on transport errors; fetch_details turns those into partial results.
+        """
+        return await get_place_details_cache().lookup(
+            place_id, lambda fields: request_place_details(place_id, self.api_key, fields)
+        )
     
-    def format_results(self, search_result: Dict[str, Any]) -> str:
+    @staticmethod
+    def format_results(search_result: Dict[str, Any]) -> str:
         """Format search results as a readable string."""
         if not search_result.get("success"):
             return f"❌ Error: {search_result.get('error', 'Unknown error')}"
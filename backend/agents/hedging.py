@@ -0,0 +1,218 @@
+"""
+Hedged LLM Requests
+Cuts tail latency of idempotent LLM calls: if the first attempt has not
+answered by a percentile of recent latency, an identical second request is
+sent and whichever finishes first wins; the other is cancelled (and, for
+streams, closed).
+
+Only wrap pure text-generation calls (planning, summaries, research answers).
+Never wrap models bound to tools in a ReAct loop - a duplicated turn there
+could execute a tool twice.
+"""
+
+import os
+import time
+import asyncio
+import contextvars
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
+
+from .metrics import metrics
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p-th percentile (0-100) of the window, None while empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+# True inside hedge (duplicate) attempts, so the LLM registry can keep them
+# out of the regular per-model limit
+_hedge_attempt = contextvars.ContextVar("llm_hedge_attempt", default=False)
+
+
+def is_hedge_attempt() -> bool:
+    """Whether the current call is a hedge duplicate of another attempt."""
+    return _hedge_attempt.get()
+
+
+# Latency windows shared by every wrapper of the same name
+_trackers: Dict[str, LatencyTracker] = {}
+
+
+def _tracker(name: str) -> LatencyTracker:
+    if name not in _trackers:
+        _trackers[name] = LatencyTracker(int(os.getenv("HEDGE_WINDOW", "200")))
+    return _trackers[name]
+
+
+class HedgedLLM:
+    """
+    Wraps an LLM client (or any runnable with ainvoke/astream) with hedging.
+
+    ainvoke hedges on the full response; astream hedges on the first chunk
+    and then keeps streaming from the winner.
+
+    Settings:
+        LLM_HEDGING: "true" (default) or "false"
+        HEDGE_PERCENTILE: latency percentile that triggers the hedge (95)
+        HEDGE_MIN_SAMPLES: calls observed before the percentile is trusted (20)
+        HEDGE_INITIAL_DELAY_SECONDS: hedge delay until then (3.0)
+        HEDGE_MIN_DELAY_SECONDS: lower bound on the hedge delay (0.5)
+
+    Metrics (per name):
+        llm.<name>.calls / hedged / hedge_wins
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        name: str,
+        enabled: Optional[bool] = None,
+        percentile: Optional[float] = None
+    ):
+        """
+        Args:
+            llm: Client to wrap
+            name: Metrics / latency window name, e.g. "planner"
+            enabled: Defaults to LLM_HEDGING
+            percentile: Defaults to HEDGE_PERCENTILE
+        """
+        if enabled is None:
+            enabled = os.getenv("LLM_HEDGING", "true").lower() == "true"
+        if percentile is None:
+            percentile = float(os.getenv("HEDGE_PERCENTILE", "95"))
+        self.llm = llm
+        self.name = name
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+        self.initial_delay = float(os.getenv("HEDGE_INITIAL_DELAY_SECONDS", "3.0"))
+        self.min_delay = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "0.5"))
+        self.latency = _tracker(name)
+
+    def __getattr__(self, attr: str) -> Any:
+        # Everything that is not hedged goes straight to the wrapped client
+        return getattr(self.llm, attr)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first attempt before sending the hedge."""
+        if len(self.latency.samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    async def ainvoke(self, input: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        if not self.enabled:
+            return await self.llm.ainvoke(input, config=config, **kwargs)
+        return await self._race(lambda: self.llm.ainvoke(input, config=config, **kwargs))
+
+    async def astream(self, input: Any, config: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[Any]:
+        if not self.enabled:
+            async for chunk in self.llm.astream(input, config=config, **kwargs):
+                yield chunk
+            return
+
+        streams = []
+
+        async def first_chunk() -> Tuple[AsyncIterator[Any], Any]:
+            stream = self.llm.astream(input, config=config, **kwargs).__aiter__()
+            streams.append(stream)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, _EMPTY
+
+        try:
+            stream, chunk = await self._race(first_chunk)
+            if chunk is _EMPTY:
+                return
+            yield chunk
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # Close the losing attempt's stream (and the winner's, if the
+            # consumer stopped early) so no HTTP stream is left open
+            for opened in streams:
+                if hasattr(opened, "aclose"):
+                    await opened.aclose()
+
+    async def _race(self, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Run attempt(), hedging with a second one if it is slower than usual."""
+        metrics.incr(f"llm.{self.name}.calls")
+        delay = self.hedge_delay()
+        started = {}
+
+        async def hedge() -> Any:
+            # Set in the hedge task's own context only
+            _hedge_attempt.set(True)
+            return await attempt()
+
+        def launch(duplicate: bool = False) -> asyncio.Task:
+            task = asyncio.ensure_future(hedge() if duplicate else attempt())
+            started[task] = time.monotonic()
+            return task
+
+        primary = launch()
+        pending = {primary}
+        error = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                metrics.incr(f"llm.{self.name}.hedged")
+                pending.add(launch(duplicate=True))
+
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record(time.monotonic() - started[task])
+                        if task is not primary:
+                            metrics.incr(f"llm.{self.name}.hedge_wins")
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled attempts unwind before their streams are closed
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Hedge rate and hedge win rate per wrapped client."""
+        stats = {}
+        for name, tracker in _trackers.items():
+            calls = metrics.get(f"llm.{name}.calls")
+            hedged = metrics.get(f"llm.{name}.hedged")
+            wins = metrics.get(f"llm.{name}.hedge_wins")
+            p95 = tracker.percentile(95)
+            stats[name] = {
+                "calls": calls,
+                "hedged": hedged,
+                "hedge_wins": wins,
+                "hedge_rate": round(hedged / calls, 4) if calls else None,
+                "win_rate": round(wins / hedged, 4) if hedged else None,
+                "p95_seconds": round(p95, 3) if p95 is not None else None
+            }
+        return stats
+
+
+# Marker for a stream that ended before its first chunk
+_EMPTY = object()
+
+
+metrics.register("llm_hedging", HedgedLLM.stats)
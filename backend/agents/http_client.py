@@ -0,0 +1,155 @@
+"""
+Shared HTTP Client
+One process-wide httpx.AsyncClient for Google Maps and Fonoster calls, so
+requests reuse kept-alive connections instead of paying a TCP + TLS
+handshake each time.
+
+The client is opened by startup() and closed by shutdown(), which main.py
+wires into the Quart app lifecycle; outside the app it is created lazily on
+first use.
+
+Configuration (environment):
+    HTTP_MAX_CONNECTIONS: total connection limit (default 100)
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: idle connections kept open (default 20)
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: idle connection lifetime (default 30)
+    HTTP_MAX_CONNECTIONS_PER_HOST: concurrent requests per host (default 10)
+    HTTP2: "true" to negotiate HTTP/2 (needs the h2 package, httpx[http2])
+"""
+
+import os
+import socket
+import asyncio
+from typing import Dict, Any, Optional
+import httpx
+
+from .metrics import metrics
+
+
+_client: Optional[httpx.AsyncClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+_in_flight: Dict[str, int] = {}
+_http2 = False
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("HTTP2", "false").lower() != "true":
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        print("[HTTP] HTTP2=true but the h2 package is not installed; using HTTP/1.1")
+        return False
+
+
+def _create_client() -> httpx.AsyncClient:
+    global _http2
+    _http2 = _http2_enabled()
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    )
+    return httpx.AsyncClient(limits=limits, http2=_http2, timeout=10.0)
+
+
+def _retire(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a client left behind by another event loop."""
+    if client.is_closed:
+        return
+    if loop is not None and loop.is_running():
+        # Its connections are bound to that loop, so close it there
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    # The loop is gone and can no longer run aclose(); shut the sockets down so
+    # the connections end now instead of whenever the transports are collected
+    pool = getattr(client._transport, "_pool", None)
+    for connection in list(getattr(pool, "connections", [])):
+        stream = getattr(getattr(connection, "_connection", None), "_network_stream", None)
+        sock = stream.get_extra_info("socket") if stream is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client (re-created if closed or used from a new event loop)."""
+    global _client, _loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _loop is not loop:
+        if _client is not None:
+            _retire(_client, _loop)
+        _client = _create_client()
+        _loop = loop
+        _host_slots.clear()
+    return _client
+
+
+def _host_slot(host: str) -> asyncio.Semaphore:
+    if host not in _host_slots:
+        _host_slots[host] = asyncio.Semaphore(int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10")))
+    return _host_slots[host]
+
+
+async def startup() -> None:
+    """Open the shared client (app startup hook)."""
+    get_client()
+    print(f"[HTTP] Shared client ready (HTTP/2 {'on' if _http2 else 'off'})")
+
+
+async def shutdown() -> None:
+    """Close the shared client and its connections (app shutdown hook)."""
+    global _client, _loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _loop = None
+    _host_slots.clear()
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the shared client, within the host's limit."""
+    host = httpx.URL(url).host
+    client = get_client()
+    async with _host_slot(host):
+        metrics.incr(f"http.{host}.requests")
+        _in_flight[host] = _in_flight.get(host, 0) + 1
+        try:
+            return await client.request(method, url, **kwargs)
+        finally:
+            _in_flight[host] -= 1
+
+
+async def http_get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def http_post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+def stats() -> Dict[str, Any]:
+    """Connection pool state and request counts per host."""
+    if _client is None or _client.is_closed:
+        return {"open": False}
+    pool = getattr(_client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    return {
+        "open": True,
+        "http2": _http2,
+        "connections": len(connections),
+        "idle_connections": sum(1 for c in connections if c.is_idle()),
+        "hosts": {
+            host: {
+                "requests": metrics.get(f"http.{host}.requests"),
+                "in_flight": _in_flight.get(host, 0)
+            }
+            for host in _host_slots
+        }
+    }
+
+
+metrics.register("http_client", stats)
@@ -0,0 +1,201 @@
+"""
+Intent Matcher
+Deterministic, rule-based planner used as a fast path before the planner LLM.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Pattern
+
+from .metrics import metrics
+
+
+# Plan flag for each agent intent
+INTENT_FLAGS = {
+    "googlemap": "use_googlemap",
+    "calendar": "use_calendar",
+    "telephone": "use_telephone",
+    "research": "use_research",
+}
+
+# Score at which an intent is considered present
+ACTIVATION_SCORE = 0.5
+
+
+@dataclass
+class IntentRule:
+    """Weighted signals for one intent."""
+    name: str
+    patterns: List[Tuple[Pattern, float]]
+    # Other intents switched on (at this rule's score) when this one matches
+    implies: List[str] = field(default_factory=list)
+
+    def score(self, text: str) -> Tuple[float, List[str]]:
+        """
+        Combine matched signal weights with a noisy-OR.
+
+        Returns:
+            (score in [0, 1), list of matched pattern sources)
+        """
+        miss = 1.0
+        matched = []
+        for pattern, weight in self.patterns:
+            if pattern.search(text):
+                miss *= (1.0 - weight)
+                matched.append(pattern.pattern)
+        return 1.0 - miss, matched
+
+
+def _rule(name: str, signals: List[Tuple[str, float]], implies: Optional[List[str]] = None) -> IntentRule:
+    return IntentRule(
+        name=name,
+        patterns=[(re.compile(p, re.IGNORECASE), w) for p, w in signals],
+        implies=implies or []
+    )
+
+
+DEFAULT_RULES = [
+    _rule("reservation", [
+        (r"\b(make|get) (a |an )?(reservation|booking)\b", 0.9),
+        (r"\breserv(e|ation)\b", 0.8),
+        (r"\bbook (a |an )?(table|seat|room)\b", 0.9),
+        (r"\bbook(ing)?\b", 0.5),
+    ], implies=["googlemap", "calendar", "telephone"]),
+    _rule("googlemap", [
+        (r"\b(find|search|look(ing)? for|locate|where (is|are|can i))\b", 0.6),
+        (r"\b(near(by)?|around|close to|in the area)\b", 0.6),
+        (r"\b(restaurants?|cafes?|coffee( shops?)?|bars?|hotels?|shops?|stores?|places?|"
+         r"sushi|ramen|pizza|noodles?|bakery|bakeries|pharmac(y|ies)|hospitals?|museums?|parks?)\b", 0.5),
+        (r"\b(directions?|address|location)\b", 0.4),
+    ]),
+    _rule("calendar", [
+        (r"\b(calendar|schedule|appointment|meeting|remind( me)?|reminder|event)\b", 0.7),
+        (r"\b(add|put|create|set up) (it |this |an? )?(to|on|in)? ?(my )?(calendar|schedule)\b", 0.8),
+        (r"\b(today|tomorrow|tonight|next week|(mon|tues|wednes|thurs|fri|satur|sun)day)\b", 0.3),
+        (r"\b\d{1,2}(:\d{2})?\s*(am|pm)\b|\b\d{1,2}:\d{2}\b", 0.3),
+    ]),
+    _rule("telephone", [
+        (r"\b(call|phone|ring|dial|telephone)\b", 0.7),
+        (r"\+?\d[\d\s\-()]{7,}\d", 0.5),
+    ]),
+    _rule("research", [
+        (r"^\s*(what|how|why|who|when|which)\b", 0.5),
+        (r"\b(explain|research|tell me about|information (about|on)|history of|difference between)\b", 0.8),
+        (r"\?\s*$", 0.3),
+    ]),
+]
+
+
+# "<what> near <where>" for plain place searches
+_PLACE_SEARCH = re.compile(
+    r"^\s*(?:please\s+)?(?:find|search for|search|look for|locate|show me)?\s*(?:me\s+)?"
+    r"(?:some\s+|a\s+|an\s+|the\s+)?(?P<query>[^?.!]+?)\s+(?:near|around|close to|in)\s+"
+    r"(?P<location>[^?.!]+?)\s*[?.!]*\s*$",
+    re.IGNORECASE
+)
+
+
+def extract_place_search(query: str) -> Optional[Dict[str, str]]:
+    """Pull search_nearby_places arguments out of a plain "X near Y" query."""
+    m = _PLACE_SEARCH.match(query)
+    if not m:
+        return None
+    return {"query": m.group("query").strip(), "location": m.group("location").strip()}
+
+
+@dataclass
+class IntentMatch:
+    """Result of matching a query against the intent rules."""
+    plan: Dict[str, Any]
+    confidence: float
+    scores: Dict[str, float]
+    confident: bool
+
+
+class IntentMatcher:
+    """
+    Scores each agent intent from compiled keyword/regex rules.
+
+    Each intent's confidence is its distance from the activation score, so a
+    query only takes the fast path when every intent is clearly on or clearly
+    off and at least one agent is selected. Everything else goes to the LLM.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, rules: Optional[List[IntentRule]] = None):
+        """
+        Args:
+            threshold: Minimum confidence to skip the planner LLM.
+                Defaults to PLANNER_FAST_PATH_THRESHOLD or 0.8; above 1 disables the fast path.
+            rules: Intent rules (defaults to DEFAULT_RULES)
+        """
+        if threshold is None:
+            threshold = float(os.getenv("PLANNER_FAST_PATH_THRESHOLD", "0.8"))
+        self.threshold = threshold
+        self.rules = rules or DEFAULT_RULES
+
+    def match(self, query: str) -> IntentMatch:
+        """Score a query and build the corresponding plan."""
+        text = query.strip()
+        scores = {name: 0.0 for name in INTENT_FLAGS}
+        reasons = []
+
+        for rule in self.rules:
+            score, matched = rule.score(text)
+            if not matched:
+                continue
+            targets = rule.implies or [rule.name]
+            for target in targets:
+                scores[target] = max(scores[target], score)
+            reasons.append(f"{rule.name}={score:.2f}")
+
+        plan = {flag: scores[name] >= ACTIVATION_SCORE for name, flag in INTENT_FLAGS.items()}
+
+        if any(plan.values()):
+            confidence = min(abs(score - ACTIVATION_SCORE) * 2 for score in scores.values())
+        else:
+            # Nothing recognized - let the LLM decide
+            confidence = 0.0
+
+        # Plain place searches also get the tool arguments (no ReAct loop needed)
+        if plan["use_googlemap"] and not any(plan[flag] for flag in INTENT_FLAGS.values() if flag != "use_googlemap"):
+            place_search = extract_place_search(text)
+            if place_search:
+                plan["arguments"] = {"googlemap": place_search}
+
+        plan["reasoning"] = f"Rule-based intent match ({', '.join(reasons) or 'no signals'}; confidence {confidence:.2f})"
+
+        return IntentMatch(
+            plan=plan,
+            confidence=round(confidence, 4),
+            scores={name: round(score, 4) for name, score in scores.items()},
+            confident=confidence >= self.threshold
+        )
+
+    def try_fast_path(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a plan if the query is unambiguous, otherwise None.
+
+        Records planner.fast_path.hits / planner.fast_path.misses.
+        """
+        match = self.match(query)
+        if match.confident:
+            metrics.incr("planner.fast_path.hits")
+            return match.plan
+        metrics.incr("planner.fast_path.misses")
+        return None
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Fast-path hit rate for tuning the threshold and rules."""
+        hits = metrics.get("planner.fast_path.hits")
+        misses = metrics.get("planner.fast_path.misses")
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None
+        }
+
+
+metrics.register("planner_fast_path", IntentMatcher.stats)
@@ -0,0 +1,210 @@
+"""
+Background Jobs
+In-process job queue for query runs that outlive an HTTP request: callers
+submit a job, a bounded pool of workers runs it, and the job keeps its
+event log so clients can poll for the result or resume the event stream.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import itertools
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator
+
+from .metrics import metrics
+
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# Lower runs first
+DEFAULT_PRIORITY = 5
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """One submitted query run and its event log."""
+    id: str
+    query: str
+    priority: int = DEFAULT_PRIORITY
+    deadline_seconds: Optional[float] = None
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake current waiters; later waiters get a fresh event
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a new event or a status change; False on timeout."""
+        updated = self._updated
+        try:
+            await asyncio.wait_for(updated.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "query": self.query,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "event_count": len(self.events)
+        }
+        if include_result:
+            data["result"] = self.result
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    """
+    Priority queue of jobs drained by a fixed pool of worker tasks.
+
+    The runner turns a job into a stream of event dicts. A job succeeds when
+    its stream ends and fails if the stream raises or its last event has type
+    "error"; the last event is kept as the job's result.
+
+    Configuration (environment):
+        JOB_WORKERS: concurrent graph runs (default 4)
+        JOB_MAX_QUEUED: jobs waiting before submit is refused (default 1000)
+        JOB_RETENTION_SECONDS: how long finished jobs are kept (default 3600)
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], AsyncIterator[Dict[str, Any]]],
+        workers: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        retention: Optional[float] = None
+    ):
+        self.runner = runner
+        self.worker_count = workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.max_queued = max_queued or int(os.getenv("JOB_MAX_QUEUED", "1000"))
+        self.retention = retention or float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._seq = itertools.count()
+
+    async def start(self) -> None:
+        """Start the worker pool (call from the app's startup hook)."""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+        print(f"[JOBS] Started {self.worker_count} worker(s)")
+
+    async def stop(self) -> None:
+        """Cancel the workers; running jobs are marked failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, query: str, priority: int = DEFAULT_PRIORITY, deadline_seconds: Optional[float] = None) -> Job:
+        """
+        Queue a query run.
+
+        Raises:
+            QueueFull: if JOB_MAX_QUEUED jobs are already waiting
+            RuntimeError: if the worker pool has not been started
+        """
+        if self._queue is None:
+            raise RuntimeError("Job workers are not running")
+        self._prune()
+        if self._queue.qsize() >= self.max_queued:
+            metrics.incr("jobs.rejected")
+            raise QueueFull(f"Job queue is full ({self.max_queued} waiting)")
+
+        job = Job(id=uuid.uuid4().hex, query=query, priority=priority, deadline_seconds=deadline_seconds)
+        self.jobs[job.id] = job
+        self._queue.put_nowait((priority, next(self._seq), job.id))
+        metrics.incr("jobs.submitted")
+        metrics.add_gauge("jobs.queued", 1)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def position(self, job: Job) -> Optional[int]:
+        """Jobs ahead of a queued job (None once it has started)."""
+        if job.status != "queued":
+            return None
+        ahead = 0
+        for other in self.jobs.values():
+            if other.status == "queued" and (other.priority, other.created_at) < (job.priority, job.created_at):
+                ahead += 1
+        return ahead
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            metrics.add_gauge("jobs.queued", -1)
+            job = self.jobs.get(job_id)
+            if job is not None:
+                await self._run(job)
+            self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        job._notify()
+        metrics.add_gauge("jobs.running", 1)
+        try:
+            # Closed right away if the job is cancelled or fails mid-run, so
+            # the runner's in-flight LLM and HTTP calls are cancelled too
+            async with aclosing(self.runner(job)) as events:
+                async for event in events:
+                    job.add_event(event)
+            last = job.events[-1] if job.events else {}
+            job.result = last
+            if last.get("type") == "error":
+                job.status = "failed"
+                job.error = str(last.get("error") or last.get("message"))
+            else:
+                job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job cancelled during shutdown"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job._notify()
+            metrics.add_gauge("jobs.running", -1)
+            metrics.incr(f"jobs.{job.status}")
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self.jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
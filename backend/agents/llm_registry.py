@@ -0,0 +1,170 @@
+"""
+LLM Client Registry
+Shared chat model clients keyed by (model, temperature). Every agent and
+tool asking for the same settings gets the same client - and with it the
+same underlying connection pool - instead of constructing its own.
+
+Calls are limited per model with semaphores, one pool per kind of call:
+
+    requests LLM_MAX_CONCURRENCY (default 8) - regular requests; a slot is
+             held until the response arrives
+    streams  LLM_MAX_STREAMS (default 4) - streamed requests; a slot is held
+             until the consumer finishes or closes the stream, so slow SSE
+             clients cannot take the slots planner calls need
+    hedges   LLM_MAX_HEDGES (default 2) - hedge duplicates (agents.hedging),
+             streamed or not, so a hedged call holds one regular slot, not two
+
+Each can be set for one model with a _<MODEL> suffix, e.g.
+LLM_MAX_CONCURRENCY_GEMINI_2_5_FLASH.
+"""
+
+import os
+import re
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Tuple, Optional, AsyncIterator
+from dotenv import load_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from .hedging import is_hedge_attempt
+from .metrics import metrics
+
+load_dotenv()
+
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+
+class _ModelLimiter:
+    """Per-model concurrency limit, rebuilt if the event loop changes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _get(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot; released on the semaphore it was taken from, even if rebuilt since."""
+        semaphore = self._get()
+        await semaphore.acquire()
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+
+# Setting and default limit of each pool
+LIMITS = {
+    "requests": ("LLM_MAX_CONCURRENCY", "8"),
+    "streams": ("LLM_MAX_STREAMS", "4"),
+    "hedges": ("LLM_MAX_HEDGES", "2")
+}
+
+_limiters: Dict[Tuple[str, str], _ModelLimiter] = {}
+
+
+def _limiter(model: str, kind: str = "requests") -> _ModelLimiter:
+    """Pool for a model and kind of call; hedge duplicates always use "hedges"."""
+    if is_hedge_attempt():
+        kind = "hedges"
+    key = (model, kind)
+    if key not in _limiters:
+        setting, default = LIMITS[kind]
+        env_name = f"{setting}_" + re.sub(r"[^A-Z0-9]", "_", model.upper())
+        limit = int(os.getenv(env_name, os.getenv(setting, default)))
+        _limiters[key] = _ModelLimiter(max(1, limit))
+    return _limiters[key]
+
+
+class PooledChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    """Gemini chat model whose calls go through the per-model limiters."""
+
+    async def _agenerate(self, *args, **kwargs):
+        async with _limiter(self.model).slot():
+            metrics.incr(f"llm_clients.{self.model}.calls")
+            return await super()._agenerate(*args, **kwargs)
+
+    async def _astream(self, *args, **kwargs) -> AsyncIterator[Any]:
+        # The slot is held for the whole stream, from the streams pool
+        async with _limiter(self.model, "streams").slot():
+            metrics.incr(f"llm_clients.{self.model}.calls")
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+
+
+_clients: Dict[Tuple[str, float], ChatGoogleGenerativeAI] = {}
+_lock = threading.Lock()
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0.3) -> ChatGoogleGenerativeAI:
+    """
+    Shared chat model for (model, temperature), created on first use.
+
+    Raises:
+        ValueError: if GEMINI_API_KEY is not set
+    """
+    key = (model, float(temperature))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        if key not in _clients:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY not found in environment variables")
+            _clients[key] = PooledChatGoogleGenerativeAI(
+                model=model,
+                google_api_key=api_key,
+                temperature=temperature
+            )
+        return _clients[key]
+
+
+def _open_connections(llm: ChatGoogleGenerativeAI) -> Optional[int]:
+    """Open connections in the client's async HTTP pool (None if not introspectable)."""
+    try:
+        pool = llm.client._api_client._async_httpx_client._transport._pool
+        return len(pool.connections)
+    except AttributeError:
+        return None
+
+
+def stats() -> Dict[str, Any]:
+    """Clients, connection pools and per-model concurrency of each pool."""
+    with _lock:
+        clients = dict(_clients)
+    pools = {id(llm.client): llm for llm in clients.values() if getattr(llm, "client", None) is not None}
+    connections = [_open_connections(llm) for llm in pools.values()]
+    return {
+        "clients": len(clients),
+        "connection_pools": len(pools),
+        "open_connections": sum(c for c in connections if c is not None),
+        "models": {
+            model: {
+                "calls": metrics.get(f"llm_clients.{model}.calls"),
+                **{
+                    kind: {"limit": limiter.limit, "in_flight": limiter.in_flight}
+                    for (limiter_model, kind), limiter in _limiters.items()
+                    if limiter_model == model
+                }
+            }
+            for model in {model for model, _ in _limiters}
+        },
+        "keys": [f"{model}@{temperature}" for model, temperature in clients]
+    }
+
+
+metrics.register("llm_clients", stats)
@@ -0,0 +1,81 @@
+"""
+Metrics Registry
+In-process counters and gauges used to tune the agent pipeline.
+"""
+
+import threading
+from typing import Dict, Any, Callable, Optional
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and derived-stat providers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def add_gauge(self, name: str, delta: float) -> None:
+        """Move a gauge up or down (e.g. in-flight requests)."""
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def get(self, name: str) -> float:
+        """Get the current value of a counter or gauge (0 if unknown)."""
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            return self._gauges.get(name, 0)
+
+    def ratio(self, numerator: str, denominator: str) -> Optional[float]:
+        """Ratio of two counters, or None before any data."""
+        total = self.get(denominator)
+        if not total:
+            return None
+        return round(self.get(numerator) / total, 4)
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        """Register a callable that reports derived stats under `name`."""
+        with self._lock:
+            self._providers[name] = provider
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all counters, gauges and provider stats."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            providers = dict(self._providers)
+
+        stats = {}
+        for name, provider in providers.items():
+            try:
+                stats[name] = provider()
+            except Exception as e:
+                stats[name] = {"error": str(e)}
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "stats": stats
+        }
+
+    def reset(self) -> None:
+        """Clear counters and gauges (providers stay registered)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,148 @@
+"""
+Place Details Cache
+Place Details keyed by place_id, with a lifetime per field: phone number and
+website rarely change, opening hours (which carry "open now") go stale
+quickly. When only some fields have expired, just those are re-requested.
+"""
+
+import os
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from .cache import TTLCache, create_backend
+from .metrics import metrics
+
+
+# Fields requested from the Place Details API
+DETAIL_FIELDS = ("formatted_phone_number", "opening_hours", "website")
+
+# Default lifetime per field in seconds
+DEFAULT_FIELD_TTLS = {
+    "formatted_phone_number": 7 * 24 * 3600,
+    "website": 7 * 24 * 3600,
+    "opening_hours": 3600
+}
+
+
+def field_ttls() -> Dict[str, float]:
+    """Per-field lifetimes, overridable as PLACE_DETAILS_TTL_<FIELD> (e.g. PLACE_DETAILS_TTL_OPENING_HOURS)."""
+    return {
+        field: float(os.getenv(f"PLACE_DETAILS_TTL_{field.upper()}", str(ttl)))
+        for field, ttl in DEFAULT_FIELD_TTLS.items()
+    }
+
+
+class PlaceDetailsCache:
+    """
+    Cache of Place Details results.
+
+    An entry stores the fields returned by the API plus when each requested
+    field was fetched, so a field the place does not have (no website) is
+    cached as absent rather than re-requested every time.
+
+    Configuration (environment):
+        PLACE_DETAILS_CACHE_BACKEND: "sqlite" (default), "memory", or "off"
+        PLACE_DETAILS_CACHE_PATH: SQLite file (defaults to CACHE_SQLITE_PATH)
+        PLACE_DETAILS_CACHE_MAX_ENTRIES: size bound, least recently used evicted (default 5000)
+        PLACE_DETAILS_TTL_<FIELD>: lifetime of one field (see DEFAULT_FIELD_TTLS)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttls: Optional[Dict[str, float]] = None
+    ):
+        backend = (backend or os.getenv("PLACE_DETAILS_CACHE_BACKEND", "sqlite")).lower()
+        self.enabled = backend != "off"
+        self.ttls = ttls or field_ttls()
+        self.started_at = time.time()
+        self.cache: Optional[TTLCache] = None
+        if self.enabled:
+            self.cache = TTLCache(
+                "place_details",
+                backend=create_backend(backend, "place_details", path or os.getenv("PLACE_DETAILS_CACHE_PATH")),
+                max_entries=max_entries or int(os.getenv("PLACE_DETAILS_CACHE_MAX_ENTRIES", "5000")),
+                ttl=max(self.ttls.values())
+            )
+        metrics.register("place_details", self.stats)
+
+    def _stale_fields(self, entry: Dict[str, Any], now: float) -> List[str]:
+        fetched_at = entry.get("fetched_at", {})
+        return [
+            field for field in DETAIL_FIELDS
+            if field not in fetched_at or fetched_at[field] + self.ttls.get(field, 0) <= now
+        ]
+
+    async def lookup(
+        self,
+        place_id: str,
+        fetch: Callable[[List[str]], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Dict[str, Any]:
+        """
+        Details for a place, fetching only the fields missing or expired in the cache.
+
+        Args:
+            place_id: Google place ID
+            fetch: Coroutine taking the fields to request and returning the
+                API result, or None if the API did not answer OK (not cached)
+
+        Returns:
+            Details dict with the available DETAIL_FIELDS
+        """
+        metrics.incr("place_details.requests")
+        if not self.enabled:
+            metrics.incr("place_details.api_calls")
+            return await fetch(list(DETAIL_FIELDS)) or {}
+
+        now = time.time()
+        entry = await self.cache.aget(place_id) or {"fields": {}, "fetched_at": {}}
+        stale = self._stale_fields(entry, now)
+        if not stale:
+            metrics.incr("place_details.hits")
+            return dict(entry["fields"])
+
+        metrics.incr("place_details.partial_hits" if len(stale) < len(DETAIL_FIELDS) else "place_details.misses")
+        metrics.incr("place_details.api_calls")
+        metrics.incr("place_details.fields_fetched", len(stale))
+        result = await fetch(stale)
+        fresh = {field: value for field, value in entry["fields"].items() if field not in stale}
+        if result is None:
+            return fresh
+
+        fields = {**fresh, **{field: result[field] for field in stale if field in result}}
+        fetched_at = {**entry["fetched_at"], **{field: now for field in stale}}
+        await self.cache.aset(place_id, {"fields": fields, "fetched_at": fetched_at})
+        return dict(fields)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and Places API calls saved (hits need no call at all)."""
+        requests = metrics.get("place_details.requests")
+        hits = metrics.get("place_details.hits")
+        hours = max(time.time() - self.started_at, 60.0) / 3600
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.cache.backend) if self.enabled else 0,
+            "field_ttls": self.ttls,
+            "requests": requests,
+            "hits": hits,
+            "partial_hits": metrics.get("place_details.partial_hits"),
+            "misses": metrics.get("place_details.misses"),
+            "hit_ratio": round(hits / requests, 4) if requests else None,
+            "api_calls": metrics.get("place_details.api_calls"),
+            "api_calls_saved": hits,
+            "api_calls_saved_per_hour": round(hits / hours, 1),
+            "fields_fetched": metrics.get("place_details.fields_fetched")
+        }
+
+
+_shared: Optional[PlaceDetailsCache] = None
+
+
+def get_place_details_cache() -> PlaceDetailsCache:
+    """Process-wide place details cache, created on first use."""
+    global _shared
+    if _shared is None:
+        _shared = PlaceDetailsCache()
+    return _shared
@@ -0,0 +1,329 @@
+"""
+Place Index
+Local spatial index of places already returned by Text Search, so repeated
+"X near Y" searches in an area the index covers are answered without a
+Places API call.
+
+Places are bucketed by geohash cell and candidates from the cells around a
+point are filtered by haversine distance. A search is answered from the
+index only if the same query terms were searched from the same area
+recently (coverage) and enough indexed places fall within the radius;
+otherwise the caller falls back to the API and feeds its results back in.
+
+Index answers are ordered by ranking.rank_places, like API answers: each
+place keeps the rating, open-now and Google position it was ranked with.
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from typing import Dict, Any, List, Optional, Set
+
+from .metrics import metrics
+from .ranking import rank_places
+from .text_search_cache import canonical_terms
+
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_M = 6371008.8
+
+# Geohash precision of place buckets and coverage areas (about 4.9 km x 4.9 km)
+CELL_PRECISION = 5
+
+
+def geohash(lat: float, lng: float, precision: int = CELL_PRECISION) -> str:
+    """Standard geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int = CELL_PRECISION):
+    """(lat, lng) extent of a geohash cell in degrees."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def cells_within(lat: float, lng: float, radius_m: float, precision: int = CELL_PRECISION) -> Set[str]:
+    """Geohash cells overlapping the bounding box of a circle."""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlng = dlat / max(math.cos(math.radians(lat)), 0.01)
+    step_lat, step_lng = cell_size(precision)
+    # Sample the box at under one cell per step so no overlapping cell is missed
+    n_lat = int(2 * dlat / step_lat) + 2
+    n_lng = min(int(2 * dlng / step_lng) + 2, 360)
+    cells = set()
+    for i in range(n_lat + 1):
+        y = max(-90.0, min(90.0, lat - dlat + i * 2 * dlat / n_lat))
+        for j in range(n_lng + 1):
+            x = (lng - dlng + j * 2 * dlng / n_lng + 180.0) % 360.0 - 180.0
+            cells.add(geohash(y, x, precision))
+    return cells
+
+
+class PlaceIndex:
+    """
+    In-process geohash index of search results, with coverage tracking.
+
+    Each place remembers which query terms returned it, when, and the
+    ranking fields it had for them; coverage records, per (query terms,
+    center cell), when that search was last done and whether it returned
+    everything the API had.
+
+    Configuration (environment):
+        PLACE_INDEX: "true" (default) to answer searches from the index
+        PLACE_INDEX_MAX_AGE_SECONDS: how long coverage stays fresh (default 21600)
+        PLACE_INDEX_MAX_PLACES: size bound, oldest places dropped first (default 50000)
+        PLACE_INDEX_PATH: snapshot file loaded at startup and written at shutdown
+            (default place_index.json; empty to disable)
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_age: Optional[float] = None,
+        max_places: Optional[int] = None,
+        path: Optional[str] = None
+    ):
+        self.enabled = enabled if enabled is not None else os.getenv("PLACE_INDEX", "true").lower() == "true"
+        self.max_age = max_age or float(os.getenv("PLACE_INDEX_MAX_AGE_SECONDS", "21600"))
+        self.max_places = max_places or int(os.getenv("PLACE_INDEX_MAX_PLACES", "50000"))
+        self.path = path if path is not None else os.getenv("PLACE_INDEX_PATH", "place_index.json")
+        self._places: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[str, Set[str]] = {}
+        self._coverage: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.enabled and self.path and os.path.exists(self.path):
+            self.load(self.path)
+        metrics.register("place_index", self.stats)
+
+    @staticmethod
+    def _coverage_key(terms: str, lat: float, lng: float) -> str:
+        return f"{terms}|{geohash(lat, lng)}"
+
+    def add(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        results: List[Dict[str, Any]],
+        complete: bool = False,
+        ranking: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Index the results of a live search around (lat, lng).
+
+        Args:
+            query: Search query (without the location)
+            lat, lng: Search center
+            results: Shaped search results (see places.place_result)
+            complete: True if the API returned fewer results than were asked for
+            ranking: ranking.ranking_fields() of each result, so index answers
+                are ranked like API answers
+        """
+        if not self.enabled:
+            return
+        terms = canonical_terms(query)
+        now = time.time()
+        with self._lock:
+            for i, result in enumerate(results):
+                place_id = result.get("place_id")
+                location = result.get("location") or {}
+                if not place_id or location.get("lat") is None or location.get("lng") is None:
+                    continue
+                previous = self._places.get(place_id)
+                queries = dict(previous["queries"]) if previous else {}
+                queries[terms] = now
+                ranks = dict(previous.get("ranking", {})) if previous else {}
+                if ranking is not None:
+                    ranks[terms] = ranking[i]
+                self._places[place_id] = {**result, "queries": queries, "ranking": ranks}
+                self._buckets.setdefault(geohash(location["lat"], location["lng"]), set()).add(place_id)
+            self._coverage[self._coverage_key(terms, lat, lng)] = {"at": now, "complete": complete}
+            if len(self._places) > self.max_places:
+                self._prune()
+        metrics.incr("place_index.inserts", len(results))
+
+    def search(
+        self,
+        query: str,
+        lat: float,
+        lng: float,
+        radius: float,
+        max_results: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a search from the index.
+
+        Returns:
+            Up to max_results places within radius, ordered by rank_places as
+            an API answer would be, or None if the area is not covered
+            recently enough (call the API instead)
+        """
+        if not self.enabled:
+            return None
+        terms = canonical_terms(query)
+        now = time.time()
+        with self._lock:
+            coverage = self._coverage.get(self._coverage_key(terms, lat, lng))
+            if coverage is None or now - coverage["at"] > self.max_age:
+                metrics.incr("place_index.misses")
+                return None
+
+            found = []
+            for cell in cells_within(lat, lng, radius):
+                for place_id in self._buckets.get(cell, ()):
+                    place = self._places[place_id]
+                    if now - place["queries"].get(terms, 0) > self.max_age:
+                        continue
+                    distance = haversine_m(lat, lng, place["location"]["lat"], place["location"]["lng"])
+                    if distance <= radius:
+                        found.append((distance, place))
+
+        # Fewer than asked for is only a full answer if the live search had no more
+        if len(found) < max_results and not coverage["complete"]:
+            metrics.incr("place_index.misses")
+            return None
+        metrics.incr("place_index.hits")
+
+        candidates = []
+        for distance, place in found:
+            fields = place.get("ranking", {}).get(terms) or {}
+            candidates.append({
+                "geometry": {"location": place["location"]},
+                "rating": fields.get("rating"),
+                "opening_hours": {"open_now": fields.get("open_now")},
+                "relevance": fields.get("relevance"),
+                "distance": distance,
+                "result": {k: v for k, v in place.items() if k not in ("queries", "ranking")}
+            })
+        # Google's order first (nearest first where it is unknown), as the API path sees it
+        candidates.sort(key=lambda c: (-(c["relevance"] if c["relevance"] is not None else -1.0), c["distance"]))
+        ranked = rank_places(candidates, lat, lng, radius, max_results, query)
+        return [candidate["result"] for candidate in ranked]
+
+    def _prune(self) -> None:
+        """Drop the least recently returned places down to 90% of max_places (lock held)."""
+        by_age = sorted(self._places, key=lambda pid: max(self._places[pid]["queries"].values()))
+        for place_id in by_age[:len(self._places) - int(self.max_places * 0.9)]:
+            place = self._places.pop(place_id)
+            cell = geohash(place["location"]["lat"], place["location"]["lng"])
+            bucket = self._buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(place_id)
+                if not bucket:
+                    del self._buckets[cell]
+
+    def snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Write the index to a JSON file (atomically, via a temporary file).
+
+        Returns:
+            Number of places written
+        """
+        path = path or self.path
+        if not path:
+            return 0
+        with self._lock:
+            data = {
+                "saved_at": time.time(),
+                "places": list(self._places.values()),
+                "coverage": dict(self._coverage)
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return len(data["places"])
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Merge a snapshot into the index (expired coverage is skipped).
+
+        Returns:
+            Number of places loaded
+        """
+        path = path or self.path
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[PlaceIndex] Could not load snapshot {path}: {type(e).__name__} {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for place in data.get("places", []):
+                location = place.get("location") or {}
+                if not place.get("place_id") or location.get("lat") is None or location.get("lng") is None:
+                    continue
+                self._places[place["place_id"]] = place
+                self._buckets.setdefault(geohash(location["lat"], location["lng"]), set()).add(place["place_id"])
+            for key, coverage in data.get("coverage", {}).items():
+                if now - coverage.get("at", 0) <= self.max_age:
+                    self._coverage[key] = coverage
+        count = len(data.get("places", []))
+        print(f"[PlaceIndex] Loaded {count} places from {path}")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and how often searches were answered locally."""
+        hits = metrics.get("place_index.hits")
+        misses = metrics.get("place_index.misses")
+        with self._lock:
+            places, buckets, coverage = len(self._places), len(self._buckets), len(self._coverage)
+        return {
+            "enabled": self.enabled,
+            "places": places,
+            "buckets": buckets,
+            "covered_areas": coverage,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None
+        }
+
+
+_shared: Optional[PlaceIndex] = None
+
+
+def get_place_index() -> PlaceIndex:
+    """Process-wide place index, created (and loaded from its snapshot) on first use."""
+    global _shared
+    if _shared is None:
+        _shared = PlaceIndex()
+    return _shared
+
+
+async def shutdown() -> None:
+    """Snapshot the index to disk (app shutdown hook)."""
+    if _shared is not None and _shared.enabled and _shared.path:
+        try:
+            count = _shared.snapshot()
+            print(f"[PlaceIndex] Saved {count} places to {_shared.path}")
+        except OSError as e:
+            print(f"[PlaceIndex] Could not save snapshot: {e}")
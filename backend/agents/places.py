@@ -0,0 +1,180 @@
+"""
+Places Helpers
+Shared by the search_nearby_places tool and GoogleMapAgent: API base URL,
+Geocoding, Text Search and Place Details requests, result shaping, and concurrent place-details enrichment.
+"""
+
+import os
+import asyncio
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+from .http_client import http_get
+from .geocode_cache import get_geocode_cache
+from .gazetteer import get_gazetteer
+from .text_search_cache import search_key
+from .deadline import call_timeout
+from .metrics import metrics
+
+
+def maps_api_base() -> str:
+    """Google Maps API root (GOOGLE_MAPS_API_BASE_URL points it at a stand-in server)."""
+    return os.getenv("GOOGLE_MAPS_API_BASE_URL", "https://maps.googleapis.com/maps/api").rstrip("/")
+
+
+async def request_geocode(address: str, api_key: str) -> Optional[Dict[str, float]]:
+    """Call the Geocoding API; {} if the address was not found, None on errors."""
+    params = {
+        "address": address,
+        "key": api_key
+    }
+    response = await http_get(f"{maps_api_base()}/geocode/json", params=params, timeout=call_timeout(10.0))
+    response.raise_for_status()
+    data = response.json()
+
+    if data.get("status") == "OK" and data.get("results"):
+        location_data = data["results"][0]["geometry"]["location"]
+        return {
+            "lat": location_data["lat"],
+            "lng": location_data["lng"]
+        }
+    if data.get("status") == "ZERO_RESULTS":
+        return {}
+
+    print(f"Geocoding API Error: {data.get('status')} - {data.get('error_message', '')}")
+    return None
+
+
+async def geocode_location(location: str, api_key: str) -> Optional[Dict[str, float]]:
+    """
+    Coordinates of a location string, or None.
+
+    Well-known landmarks are resolved offline by the gazetteer; anything else
+    goes through the geocode cache to the Geocoding API.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        coordinates = gazetteer.lookup(location)
+        if coordinates is not None:
+            return coordinates
+    try:
+        return await get_geocode_cache().lookup(location, lambda address: request_geocode(address, api_key))
+    except Exception:
+        return None
+
+
+def text_search_request(
+    query: str,
+    location: Optional[str],
+    api_key: str,
+    coordinates: Optional[Dict[str, float]] = None,
+    radius: int = 5000
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Text Search parameters and their cache key.
+
+    Results are biased towards the geocoded location within the radius, and
+    the bias is part of the key, so the tool and the agent share one entry.
+
+    Returns:
+        (request params, search_key() for the text search cache)
+    """
+    params = {
+        "query": f"{query} near {location}" if location else query,
+        "key": api_key
+    }
+    bias = {}
+    if coordinates:
+        bias = {"location": f"{coordinates['lat']},{coordinates['lng']}", "radius": radius}
+        params.update(bias)
+    return params, search_key(query, location, bias)
+
+
+async def request_text_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Call the Text Search API and return its response (raises on transport errors)."""
+    response = await http_get(f"{maps_api_base()}/place/textsearch/json", params=params, timeout=call_timeout(10.0))
+    response.raise_for_status()
+    return response.json()
+
+
+async def request_place_details(place_id: str, api_key: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Call the Place Details API for the given fields.
+
+    Returns:
+        The result dict, or None if the API did not answer OK (raises on transport errors)
+    """
+    params = {
+        "place_id": place_id,
+        "fields": ",".join(fields),
+        "key": api_key
+    }
+    response = await http_get(f"{maps_api_base()}/place/details/json", params=params, timeout=call_timeout(10.0))
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") == "OK":
+        return data.get("result", {})
+    return None
+
+
+def place_result(place: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a Text Search result plus its details as a search result entry."""
+    return {
+        "name": place.get("name", "Unknown"),
+        "address": place.get("formatted_address", place.get("vicinity", "N/A")),
+        "rating": place.get("rating", "N/A"),
+        "phone_number": details.get("formatted_phone_number", "N/A"),
+        "location": {
+            "lat": place.get("geometry", {}).get("location", {}).get("lat"),
+            "lng": place.get("geometry", {}).get("location", {}).get("lng")
+        },
+        "types": place.get("types", []),
+        "place_id": place.get("place_id")
+    }
+
+
+async def fetch_details(
+    places: List[Dict[str, Any]],
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Look up details for every place concurrently.
+
+    At most `concurrency` lookups run at once (PLACE_DETAILS_CONCURRENCY,
+    default 5), each limited to `timeout` seconds (PLACE_DETAILS_TIMEOUT_SECONDS,
+    default 5) and to the request deadline. A failed or timed-out lookup
+    leaves that place without details instead of failing the search.
+
+    Args:
+        places: Text Search results
+        fetch: Coroutine returning the details for a place_id (may raise)
+
+    Returns:
+        (details per place in input order, number of failed lookups)
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("PLACE_DETAILS_CONCURRENCY", "5"))
+    if timeout is None:
+        timeout = float(os.getenv("PLACE_DETAILS_TIMEOUT_SECONDS", "5"))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def lookup(place: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        place_id = place.get("place_id")
+        if not place_id:
+            return {}
+        async with semaphore:
+            try:
+                # Budget first, so a spent deadline never leaves fetch() un-awaited
+                limit = call_timeout(timeout)
+                return await asyncio.wait_for(fetch(place_id), timeout=limit)
+            except Exception as e:
+                print(f"Place details lookup failed for {place_id}: {type(e).__name__} {e}")
+                return None
+
+    details = await asyncio.gather(*(lookup(place) for place in places))
+    failed = sum(1 for d in details if d is None)
+    if failed:
+        metrics.incr("places.details.failed", failed)
+    metrics.incr("places.details.lookups", len(places))
+    return [d or {} for d in details], failed
@@ -0,0 +1,194 @@
+"""
+Plan Cache
+Caches supervisor plans keyed by a normalized query signature, so queries
+that differ only in restaurant, place, time or numbers reuse one LLM plan.
+
+Tool arguments are specific to each query, so only the intent flags are
+shared. On a hit the arguments the planner had supplied are re-derived from
+the new query where that is cheap and reliable (a plain "X near Y" search,
+a stated phone number); otherwise the hit is bypassed, since one planner
+call costs less than the ReAct loop an agent without arguments falls back to.
+"""
+
+import os
+import re
+from typing import Dict, Any, Optional
+
+from .cache import TTLCache, create_backend
+from .intent import extract_place_search
+from .metrics import metrics
+
+
+# Plan keys that depend only on the query's intent (safe to share across queries)
+PLAN_FLAGS = ("use_googlemap", "use_calendar", "use_telephone", "use_research")
+
+_PHONE = re.compile(r"\+?\d[\d\s\-()]{7,}\d")
+_TIME = re.compile(
+    r"\b\d{1,2}(:\d{2})?\s*(a\.?m\.?|p\.?m\.?)(?=\W|$)|\b\d{1,2}:\d{2}\b|(?<=\bat )\d{1,2}\b|\b(noon|midnight)\b",
+    re.IGNORECASE
+)
+_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}(/\d{2,4})?\b")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+# Place after a locative preposition, up to punctuation or a time word
+_PLACE_AFTER = re.compile(
+    r"\b(near|at|in|around|close to|next to)\s+"
+    r"((?!(?:a|an|the|my|tomorrow|today|tonight)\b|<)[^,.;!?<]+?)"
+    r"(?=\s+(?:(?:tomorrow|today|tonight|at|on|for|by|and|then)\b|<)|[,.;!?]|$)",
+    re.IGNORECASE
+)
+# Capitalized name sequences in an argument position: after a preposition or
+# as the object of book/call ("near Din Tai Fung", "Call Joe's Pizza")
+_PROPER_NAME = re.compile(
+    r"\b((?i:near|in|at|around|with|for|close to|next to|book|call))\s+"
+    r"([A-Z][\w'&-]*(?:\s+[A-Z0-9][\w'&-]*)*)"
+)
+# Words that select what is done, kept even when capitalized ("... and Call them")
+INTENT_WORDS = {
+    "find", "search", "look", "locate", "show", "get", "make", "call", "phone", "ring", "dial",
+    "telephone", "book", "reserve", "schedule", "remind", "add", "put", "create", "set", "cancel",
+    "explain", "research", "tell", "what", "how", "why", "who", "when", "which", "and", "then", "also"
+}
+_PUNCTUATION = re.compile(r"[^\w<>\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _replace_names(match: "re.Match") -> str:
+    """<place> for each run of name words in a capitalized span, keeping intent words."""
+    words, in_name = [match.group(1)], False
+    for word in match.group(2).split():
+        if word.lower() in INTENT_WORDS:
+            words.append(word)
+            in_name = False
+        elif not in_name:
+            words.append("<place>")
+            in_name = True
+    return " ".join(words)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Build the cache signature for a query.
+
+    Phone numbers, times, dates, place/business names and remaining numbers
+    are replaced by placeholders, then the text is lowercased and stripped of
+    punctuation, e.g. "Book a table at Din Tai Fung tomorrow at 7pm" and
+    "book a table at Joe's Pizza tomorrow at 8:30 PM" share a signature.
+    Only capitalized words in an argument position (after near/in/at/with/for,
+    or the object of book/call) count as names; elsewhere they are just
+    lowercased, so "Find Sushi near Taipei 101" and "Find Flights near Taipei"
+    keep their different head nouns. Capitalized intent words ("... and Call
+    them") are not names either, so queries asking for different actions never
+    share a signature.
+    """
+    text = query.strip()
+    text = _PHONE.sub(" <phone> ", text)
+    text = _TIME.sub(" <time> ", text)
+    text = _DATE.sub(" <date> ", text)
+    text = _PROPER_NAME.sub(_replace_names, text)
+    text = _NUMBER.sub("<num>", text)
+    text = _PLACE_AFTER.sub(lambda m: f"{m.group(1)} <place>", text)
+    text = text.lower()
+    text = _PUNCTUATION.sub(" ", text)
+    text = re.sub(r"(<place>\s*)+", "<place> ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class PlanCache:
+    """
+    Cache of planner decisions (the use_* flags) by query signature.
+
+    Configuration (environment):
+        PLAN_CACHE_BACKEND: "memory" (default), "sqlite", or "off"
+        PLAN_CACHE_PATH: SQLite file (defaults to CACHE_SQLITE_PATH)
+        PLAN_CACHE_MAX_ENTRIES: size bound (default 1024)
+        PLAN_CACHE_TTL_SECONDS: entry lifetime (default 3600)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        backend = (backend or os.getenv("PLAN_CACHE_BACKEND", "memory")).lower()
+        self.enabled = backend != "off"
+        self.cache: Optional[TTLCache] = None
+        if self.enabled:
+            self.cache = TTLCache(
+                "plan",
+                backend=create_backend(backend, "plan", path or os.getenv("PLAN_CACHE_PATH")),
+                max_entries=max_entries or int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1024")),
+                ttl=ttl or float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+            )
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached plan for the query's signature, if any.
+
+        Plans whose tool arguments cannot be re-derived from this query are
+        not returned (counted as cache.plan.bypassed) so the planner supplies them.
+        """
+        if not self.enabled:
+            return None
+        signature = normalize_query(query)
+        return self._plan(query, signature, self.cache.get(signature))
+
+    async def aget(self, query: str) -> Optional[Dict[str, Any]]:
+        """get() without blocking the event loop (for the sqlite backend)."""
+        if not self.enabled:
+            return None
+        signature = normalize_query(query)
+        return self._plan(query, signature, await self.cache.aget(signature))
+
+    def _plan(self, query: str, signature: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Plan for the query from a cache entry, or None."""
+        if cached is None:
+            return None
+        plan = {flag: cached.get(flag, False) for flag in PLAN_FLAGS}
+        arguments = {}
+        for agent in cached.get("argument_agents", []):
+            args = self._derive_arguments(agent, query, plan)
+            if args is None:
+                metrics.incr("cache.plan.bypassed")
+                return None
+            arguments[agent] = args
+        plan["arguments"] = arguments
+        plan["reasoning"] = f"Cached plan for '{signature}'"
+        return plan
+
+    @staticmethod
+    def _derive_arguments(agent: str, query: str, plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Tool arguments for an agent taken from the query itself, or None if not possible."""
+        if agent == "googlemap":
+            # Only a plain place search parses reliably (see IntentMatcher.match)
+            if any(plan.get(flag) for flag in PLAN_FLAGS if flag != "use_googlemap"):
+                return None
+            return extract_place_search(query)
+        if agent == "telephone":
+            phone = _PHONE.search(query)
+            if phone:
+                return {"phone_number": phone.group(0).strip()}
+            # Without a stated number the node calls the top GoogleMap result
+            return {} if plan.get("use_googlemap") else None
+        # Calendar titles, dates and times need the planner
+        return None
+
+    @staticmethod
+    def _entry(plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache entry for a plan: its intent flags and which agents had arguments."""
+        entry = {flag: bool(plan.get(flag)) for flag in PLAN_FLAGS}
+        entry["argument_agents"] = sorted(agent for agent, args in (plan.get("arguments") or {}).items() if args)
+        return entry
+
+    def put(self, query: str, plan: Dict[str, Any]) -> None:
+        """Cache the intent flags of a plan produced by the LLM, and which agents had arguments."""
+        if not self.enabled:
+            return
+        self.cache.set(normalize_query(query), self._entry(plan))
+
+    async def aput(self, query: str, plan: Dict[str, Any]) -> None:
+        """put() without blocking the event loop (for the sqlite backend)."""
+        if not self.enabled:
+            return
+        await self.cache.aset(normalize_query(query), self._entry(plan))
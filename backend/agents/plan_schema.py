@@ -0,0 +1,98 @@
+"""
+Structured Plan Schema
+Schema for the planner's single structured call: which agents to use plus
+the arguments for their tools, so the supervisor can call the tools
+directly instead of running a ReAct loop per agent.
+"""
+
+import re
+from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field, field_validator
+
+
+_TIME_24H = re.compile(r"^([01]?\d|2[0-3]):[0-5]\d$")
+_DATE = re.compile(r"^(today|tomorrow|\d{4}-\d{2}-\d{2})$", re.IGNORECASE)
+
+
+class PlacesSearchArgs(BaseModel):
+    """Arguments for search_nearby_places."""
+    query: Optional[str] = Field(None, description="What to search for, e.g. 'Indian restaurant'")
+    location: Optional[str] = Field(None, description="Where to search, e.g. 'Taipei 101'")
+
+    def is_complete(self) -> bool:
+        return bool(self.query and self.query.strip())
+
+
+class CalendarEventArgs(BaseModel):
+    """Arguments for add_calendar_event."""
+    title: Optional[str] = Field(None, description="Event title, e.g. 'Dinner reservation'")
+    date: Optional[str] = Field(None, description="'today', 'tomorrow' or YYYY-MM-DD")
+    time: Optional[str] = Field(None, description="24-hour HH:MM, e.g. '19:00' for 7 PM")
+    description: Optional[str] = Field(None, description="Optional event description")
+    location: Optional[str] = Field(None, description="Optional event location")
+
+    @field_validator("time")
+    @classmethod
+    def _check_time(cls, value: Optional[str]) -> Optional[str]:
+        # Drop unusable values rather than failing the whole plan
+        if value and not _TIME_24H.match(value.strip()):
+            return None
+        return value.strip() if value else value
+
+    @field_validator("date")
+    @classmethod
+    def _check_date(cls, value: Optional[str]) -> Optional[str]:
+        if value and not _DATE.match(value.strip()):
+            return None
+        return value.strip() if value else value
+
+    def is_complete(self) -> bool:
+        return bool(self.title and self.date and self.time)
+
+
+class PhoneCallArgs(BaseModel):
+    """Arguments for make_phone_call."""
+    phone_number: Optional[str] = Field(None, description="Number to call if stated in the query")
+    message: Optional[str] = Field(None, description="What the call is about, e.g. reservation details")
+
+    def is_complete(self) -> bool:
+        return bool(self.phone_number and re.search(r"\d{6,}", re.sub(r"[\s\-()]", "", self.phone_number)))
+
+
+class SupervisorPlan(BaseModel):
+    """Planner output: agent selection plus per-tool arguments."""
+    use_googlemap: bool = Field(False, description="Search for places, restaurants, businesses")
+    use_calendar: bool = Field(False, description="Create a calendar event (reservations, appointments)")
+    use_telephone: bool = Field(False, description="Make a phone call (reservations by phone)")
+    use_research: bool = Field(False, description="Answer general questions / research")
+    reasoning: str = Field("", description="Brief explanation")
+    googlemap: Optional[PlacesSearchArgs] = Field(None, description="Arguments if use_googlemap")
+    calendar: Optional[CalendarEventArgs] = Field(None, description="Arguments if use_calendar")
+    telephone: Optional[PhoneCallArgs] = Field(None, description="Arguments if use_telephone")
+
+    def to_plan(self) -> Dict[str, Any]:
+        """Convert to the plan dict stored in graph state."""
+        arguments = {}
+        for agent in ("googlemap", "calendar", "telephone"):
+            args = getattr(self, agent)
+            if args is not None and getattr(self, f"use_{agent}"):
+                arguments[agent] = args.model_dump(exclude_none=True)
+        return {
+            "use_googlemap": self.use_googlemap,
+            "use_calendar": self.use_calendar,
+            "use_telephone": self.use_telephone,
+            "use_research": self.use_research,
+            "reasoning": self.reasoning,
+            "arguments": arguments
+        }
+
+
+def plan_arguments(plan: Dict[str, Any], agent: str, schema: type) -> Optional[BaseModel]:
+    """Return validated tool arguments for an agent from a plan, if present."""
+    raw = (plan.get("arguments") or {}).get(agent)
+    if not raw:
+        return None
+    try:
+        return schema(**raw)
+    except Exception:
+        return None
@@ -0,0 +1,168 @@
+"""
+Place Ranking
+Re-ranks Text Search candidates around the search origin. Distances for all
+candidates are computed at once with NumPy and combined with rating,
+open-now and Google's own order into one score; the top results are kept.
+
+Text Search returns up to 20 candidates per call, so ranking all of them
+and looking up details only for the winners costs no extra API calls.
+"""
+
+import os
+import re
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6371008.8
+
+# Queries asking for the closest places are ranked by distance only
+_NEAREST = re.compile(r"\b(nearest|closest)\b", re.IGNORECASE)
+
+
+def ranking_weights() -> Dict[str, float]:
+    """Score weights (RANKING_WEIGHT_<NAME>); they need not sum to 1."""
+    return {
+        "distance": float(os.getenv("RANKING_WEIGHT_DISTANCE", "0.4")),
+        "rating": float(os.getenv("RANKING_WEIGHT_RATING", "0.3")),
+        "open_now": float(os.getenv("RANKING_WEIGHT_OPEN_NOW", "0.1")),
+        "relevance": float(os.getenv("RANKING_WEIGHT_RELEVANCE", "0.2"))
+    }
+
+
+def haversine_np(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances in meters from one point to arrays of points."""
+    p1, p2 = np.radians(lat), np.radians(lats)
+    dp, dl = p2 - p1, np.radians(lngs - lng)
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def candidate_arrays(places: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Columns of the values ranking uses, one entry per place.
+
+    Missing coordinates are NaN, missing ratings RANKING_DEFAULT_RATING
+    (default 3), and unknown open-now 0.5 (1 open, 0 closed). Relevance is
+    NaN (taken from the list order) unless the place carries a "relevance"
+    saved by ranking_fields.
+    """
+    n = len(places)
+    default_rating = float(os.getenv("RANKING_DEFAULT_RATING", "3"))
+    arrays = {
+        "lat": np.full(n, np.nan),
+        "lng": np.full(n, np.nan),
+        "rating": np.full(n, default_rating),
+        "open_now": np.full(n, 0.5),
+        "relevance": np.full(n, np.nan)
+    }
+    for i, place in enumerate(places):
+        location = place.get("geometry", {}).get("location", {})
+        if location.get("lat") is not None and location.get("lng") is not None:
+            arrays["lat"][i], arrays["lng"][i] = location["lat"], location["lng"]
+        if isinstance(place.get("rating"), (int, float)):
+            arrays["rating"][i] = place["rating"]
+        is_open = (place.get("opening_hours") or {}).get("open_now")
+        if is_open is not None:
+            arrays["open_now"][i] = 1.0 if is_open else 0.0
+        if isinstance(place.get("relevance"), (int, float)):
+            arrays["relevance"][i] = place["relevance"]
+    return arrays
+
+
+def score_arrays(
+    arrays: Dict[str, np.ndarray],
+    lat: float,
+    lng: float,
+    radius: float,
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    Score candidates (higher is better) from candidate_arrays(); each component is in [0, 1].
+
+    distance: 1 at the origin, 0 at or beyond the radius (missing coordinates score 0)
+    rating: rating / 5
+    open_now: 1 open, 0 closed, 0.5 unknown
+    relevance: 1 for Google's first result down to 0 for its last
+    """
+    weights = weights or ranking_weights()
+    n = len(arrays["lat"])
+    distances = haversine_np(lat, lng, arrays["lat"], arrays["lng"])
+    distance_score = np.nan_to_num(1.0 - np.minimum(distances / max(radius, 1.0), 1.0), nan=0.0)
+    relevance = 1.0 - np.arange(n) / max(n - 1, 1)
+    saved = arrays.get("relevance")
+    if saved is not None:
+        relevance = np.where(np.isnan(saved), relevance, saved)
+
+    return (
+        weights.get("distance", 0.0) * distance_score
+        + weights.get("rating", 0.0) * np.clip(arrays["rating"] / 5.0, 0.0, 1.0)
+        + weights.get("open_now", 0.0) * arrays["open_now"]
+        + weights.get("relevance", 0.0) * relevance
+    )
+
+
+def score_places(
+    places: List[Dict[str, Any]],
+    lat: float,
+    lng: float,
+    radius: float,
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Scores of Text Search results around (lat, lng), see score_arrays."""
+    return score_arrays(candidate_arrays(places), lat, lng, radius, weights)
+
+
+def ranking_fields(places: List[Dict[str, Any]], candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Values needed to rank places again later without the other candidates
+    (see PlaceIndex): rating, open-now and relevance from Google's position
+    among all candidates.
+
+    Args:
+        places: Places kept (e.g. the output of rank_places)
+        candidates: Full Text Search result list they were taken from
+    """
+    positions = {id(candidate): i for i, candidate in enumerate(candidates)}
+    last = max(len(candidates) - 1, 1)
+    fields = []
+    for place in places:
+        rating = place.get("rating")
+        fields.append({
+            "rating": rating if isinstance(rating, (int, float)) else None,
+            "open_now": (place.get("opening_hours") or {}).get("open_now"),
+            "relevance": 1.0 - positions[id(place)] / last if id(place) in positions else None
+        })
+    return fields
+
+
+def rank_places(
+    places: List[Dict[str, Any]],
+    lat: float,
+    lng: float,
+    radius: float,
+    max_results: int,
+    query: str = ""
+) -> List[Dict[str, Any]]:
+    """
+    Top max_results Text Search results by score, best first.
+
+    RANKING=google keeps Google's order. A query asking for the "nearest" or
+    "closest" place is ranked by distance alone.
+
+    Args:
+        places: Text Search results (all candidates, not yet truncated)
+        lat, lng: Search origin
+        radius: Distance at which the distance score reaches 0
+        max_results: Number of results to keep
+        query: User query, checked for "nearest"/"closest"
+    """
+    if not places or os.getenv("RANKING", "score").lower() != "score":
+        return places[:max_results]
+
+    weights = {"distance": 1.0} if _NEAREST.search(query) else None
+    scores = score_places(places, lat, lng, radius, weights)
+    # Stable sort keeps Google's order between equal scores
+    order = np.argsort(-scores, kind="stable")[:max_results]
+    return [places[i] for i in order]
@@ -6,25 +6,37 @@ Performs research tasks using Gemini LLM.
 import os
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from .hedging import HedgedLLM
+from .deadline import within_deadline
+from .llm_registry import get_llm
 from langchain_core.prompts import ChatPromptTemplate
 
 load_dotenv()
 
 
+_research_llm: Optional[HedgedLLM] = None
+
+
+def research_llm() -> HedgedLLM:
+    """
+    Hedged research chain, built once per process so its hedge delay keeps
+    tracking research latency (like the supervisor's planner and summary LLMs).
+    """
+    global _research_llm
+    if _research_llm is None:
+        prompt_template = ChatPromptTemplate.from_messages([
+            ("system", "You are a helpful research assistant. Provide accurate, concise, and well-structured information."),
+            ("human", "{query}")
+        ])
+        _research_llm = HedgedLLM(prompt_template | get_llm(temperature=0.7), "research")
+    return _research_llm
+
+
 class ResearchAgent:
     """Agent for performing research tasks using Gemini LLM."""
     
     def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=0.7
-        )
+        self.llm = get_llm(temperature=0.7)
     
     async def research(self, query: str, context: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -38,20 +50,13 @@ class ResearchAgent:
             Dictionary with research results
         """
         try:
-            prompt_template = ChatPromptTemplate.from_messages([
-                ("system", "You are a helpful research assistant. Provide accurate, concise, and well-structured information."),
-                ("human", "{query}")
-            ])
-            
             if context:
                 full_query = f"{query}\n\nContext: {context}"
             else:
                 full_query = query
             
-            chain = prompt_template | self.llm
-            
             # Run the chain
-            response = await chain.ainvoke({"query": full_query})
+            response = await within_deadline(research_llm().ainvoke({"query": full_query}))
             
             return {
                 "success": True,
@@ -81,7 +86,8 @@ class ResearchAgent:
         query = f"Please provide a concise summary of the following text in approximately {max_length} words:\n\n{text}"
         return await self.research(query)
     
-    def format_result(self, result: Dict[str, Any]) -> str:
+    @staticmethod
+    def format_result(result: Dict[str, Any]) -> str:
         """Format research result as a readable string."""
         if not result.get("success"):
             return f"❌ Research Error: {result.get('error', 'Unknown error')}"
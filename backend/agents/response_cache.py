@@ -0,0 +1,147 @@
+"""
+Response Cache
+Whole-run cache for read-only queries (places and research answers). A run
+is stored as the sequence of state chunks the supervisor streamed, so a
+streaming hit can be replayed through the normal SSE path and a
+non-streaming hit is the last chunk.
+
+Runs whose plan includes calendar or telephone actions are never stored,
+nor are runs with a failed or deadline-skipped agent.
+"""
+
+import os
+import json
+from typing import Dict, Any, List, Optional, AsyncIterator
+
+from .cache import TTLCache, create_backend
+from .coalescing import coalesce_key, has_side_effects
+
+
+# State keys worth replaying (messages, run_id and deadline are per-run)
+CACHED_KEYS = ("plan", "agent_outputs", "execution_order", "query", "summary", "response")
+
+
+def _cacheable_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe copy of the replayable part of a chunk."""
+    if "summary_delta" in chunk:
+        return {k: chunk[k] for k in ("summary_delta", "replace") if k in chunk}
+    return json.loads(json.dumps({k: chunk[k] for k in CACHED_KEYS if k in chunk}, default=str))
+
+
+def last_state(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Final state chunk of a stored run."""
+    for chunk in reversed(chunks):
+        if "summary_delta" not in chunk:
+            return chunk
+    return {}
+
+
+class ResponseCache:
+    """
+    Cache of finished read-only runs by normalized query.
+
+    Configuration (environment):
+        RESPONSE_CACHE_BACKEND: "memory" (default), "sqlite", or "off"
+        RESPONSE_CACHE_PATH: SQLite file (defaults to CACHE_SQLITE_PATH)
+        RESPONSE_CACHE_MAX_ENTRIES: size bound (default 256)
+        RESPONSE_CACHE_TTL_SECONDS: entry lifetime (default 300)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        backend = (backend or os.getenv("RESPONSE_CACHE_BACKEND", "memory")).lower()
+        self.enabled = backend != "off"
+        self.cache: Optional[TTLCache] = None
+        if self.enabled:
+            self.cache = TTLCache(
+                "response",
+                backend=create_backend(backend, "response", path or os.getenv("RESPONSE_CACHE_PATH")),
+                max_entries=max_entries or int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+                ttl=ttl or float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+            )
+
+    def get(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Stored chunk sequence for the query, if any."""
+        if not self.enabled:
+            return None
+        return self.cache.get(coalesce_key(query))
+
+    async def aget(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """get() without blocking the event loop (for the sqlite backend)."""
+        if not self.enabled:
+            return None
+        return await self.cache.aget(coalesce_key(query))
+
+    def _storable(self, chunks: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """The chunks to store if the run is read-only and fully successful, else None."""
+        if not self.enabled or not chunks:
+            return None
+        final = chunks[-1]
+        if not final.get("summary") or has_side_effects(final.get("plan") or {}):
+            return None
+        outputs = final.get("agent_outputs") or {}
+        if any(isinstance(output, dict) and not output.get("success", True) for output in outputs.values()):
+            return None
+        # Agents skipped to meet a deadline leave the answer incomplete
+        if any(entry.endswith("(skipped)") for entry in final.get("execution_order") or []):
+            return None
+        return [_cacheable_chunk(chunk) for chunk in chunks]
+
+    def put(self, query: str, chunks: List[Dict[str, Any]]) -> bool:
+        """
+        Store a finished run if it is read-only and fully successful.
+
+        Returns:
+            True if the run was cached
+        """
+        stored = self._storable(chunks)
+        if stored is None:
+            return False
+        self.cache.set(coalesce_key(query), stored)
+        return True
+
+    async def aput(self, query: str, chunks: List[Dict[str, Any]]) -> bool:
+        """put() without blocking the event loop (for the sqlite backend)."""
+        stored = self._storable(chunks)
+        if stored is None:
+            return False
+        await self.cache.aset(coalesce_key(query), stored)
+        return True
+
+    def put_result(self, query: str, final_state: Dict[str, Any]) -> bool:
+        """Store a non-streaming run; it replays as a single chunk."""
+        return self.put(query, [final_state])
+
+    async def aput_result(self, query: str, final_state: Dict[str, Any]) -> bool:
+        """put_result() without blocking the event loop."""
+        return await self.aput(query, [final_state])
+
+    async def record(self, query: str, source: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Pass chunks through from a live stream and cache the run once its
+        summary has gone by (consumers usually stop right after it).
+        """
+        chunks = []
+        stored = False
+        try:
+            async for chunk in source:
+                if self.enabled and not stored:
+                    chunks.append(chunk)
+                    if chunk.get("summary"):
+                        stored = True
+                        await self.aput(query, chunks)
+                yield chunk
+        finally:
+            if hasattr(source, "aclose"):
+                await source.aclose()
+
+    @staticmethod
+    async def replay(chunks: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield stored chunks as a stream."""
+        for chunk in chunks:
+            yield chunk
@@ -0,0 +1,151 @@
+"""
+Speculative Execution
+Starts side-effect-free agents while the planner LLM is still running and
+adopts or discards their results once the plan is known.
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .metrics import metrics
+
+
+# Agents that may run before the plan confirms them (no external side effects)
+SPECULATIVE_NODES = {
+    "googlemap": "use_googlemap",
+    "research": "use_research",
+}
+
+
+class SpeculativeExecutor:
+    """
+    Tracks speculative agent runs per graph run.
+
+    Metrics:
+        speculative.started / adopted / discarded / cancelled: run counts
+        speculative.wasted_seconds: agent time spent on discarded runs
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, threshold: Optional[float] = None):
+        """
+        Args:
+            enabled: Defaults to SUPERVISOR_SPECULATIVE ("true")
+            threshold: Minimum predicted probability (intent score) to start an
+                agent early. Defaults to SPECULATIVE_THRESHOLD or 0.75.
+        """
+        if enabled is None:
+            enabled = os.getenv("SUPERVISOR_SPECULATIVE", "true").lower() == "true"
+        if threshold is None:
+            threshold = float(os.getenv("SPECULATIVE_THRESHOLD", "0.75"))
+        self.enabled = enabled
+        self.threshold = threshold
+        # run_id -> node -> {"task", "started_at", "finished_at"}
+        self._runs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def start(
+        self,
+        run_id: str,
+        scores: Dict[str, float],
+        runners: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]],
+        arguments: Optional[Dict[str, Any]] = None
+    ) -> list:
+        """
+        Start every speculative agent whose predicted probability is high enough.
+
+        Args:
+            run_id: Graph run identifier
+            scores: Predicted probability per agent node (intent scores)
+            runners: Node name -> coroutine factory running that agent
+            arguments: Node name -> tool arguments its runner uses (None when
+                the agent works them out itself)
+
+        Returns:
+            Names of the nodes started
+        """
+        if not self.enabled or not run_id:
+            return []
+
+        started = []
+        for node in SPECULATIVE_NODES:
+            if node not in runners or scores.get(node, 0.0) < self.threshold:
+                continue
+            entry = {
+                "task": asyncio.create_task(runners[node]()),
+                "arguments": (arguments or {}).get(node),
+                "started_at": time.monotonic(),
+                "finished_at": None
+            }
+            entry["task"].add_done_callback(lambda _, e=entry: e.update(finished_at=time.monotonic()))
+            self._runs.setdefault(run_id, {})[node] = entry
+            metrics.incr("speculative.started")
+            started.append(node)
+        return started
+
+    def resolve(self, run_id: str, plan: Dict[str, Any], arguments: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Keep runs the plan confirms; cancel and account for the rest.
+
+        Args:
+            run_id: Graph run identifier
+            plan: The final plan
+            arguments: Node name -> tool arguments the plan calls for, in the
+                same form as passed to start(). A run started with other
+                arguments is discarded, so the node runs again with the plan's.
+        """
+        runs = self._runs.get(run_id)
+        if not runs:
+            return
+        for node in list(runs):
+            if not plan.get(SPECULATIVE_NODES[node]) or runs[node]["arguments"] != (arguments or {}).get(node):
+                self._cancel(runs.pop(node), "speculative.discarded")
+        if not runs:
+            self._runs.pop(run_id, None)
+
+    async def adopt(self, run_id: str, node: str) -> Optional[Dict[str, Any]]:
+        """Return the result of a confirmed speculative run, or None if there is none."""
+        runs = self._runs.get(run_id)
+        if not runs or node not in runs:
+            return None
+        task = runs.pop(node)["task"]
+        if not runs:
+            self._runs.pop(run_id, None)
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        metrics.incr("speculative.adopted")
+        return result
+
+    def discard(self, run_id: str) -> None:
+        """Cancel whatever is left of a run (it finished, failed or was cancelled)."""
+        runs = self._runs.pop(run_id, None) or {}
+        for entry in runs.values():
+            self._cancel(entry, "speculative.cancelled")
+
+    def _cancel(self, entry: Dict[str, Any], counter: str) -> None:
+        finished_at = entry["finished_at"] or time.monotonic()
+        if not entry["task"].done():
+            entry["task"].cancel()
+        metrics.incr(counter)
+        metrics.incr("speculative.wasted_seconds", round(finished_at - entry["started_at"], 4))
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Latency saved vs. work wasted, for tuning the threshold."""
+        started = metrics.get("speculative.started")
+        adopted = metrics.get("speculative.adopted")
+        return {
+            "started": started,
+            "adopted": adopted,
+            "discarded": metrics.get("speculative.discarded"),
+            "cancelled": metrics.get("speculative.cancelled"),
+            "wasted_seconds": round(metrics.get("speculative.wasted_seconds"), 4),
+            "adoption_rate": round(adopted / started, 4) if started else None
+        }
+
+
+metrics.register("speculative", SpeculativeExecutor.stats)
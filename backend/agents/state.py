@@ -0,0 +1,86 @@
+"""
+Supervisor Graph State
+State schema and reducers shared by the LangGraph supervisor nodes.
+
+Nodes return only the keys they change (their delta). LangGraph combines
+each delta with the current state using the reducer declared for that key,
+so concurrent branches can write agent_outputs and execution_order safely.
+"""
+
+import uuid
+import operator
+from typing import Dict, Any, List, TypedDict, Annotated, Optional, Callable
+from langchain_core.messages import HumanMessage
+from langgraph.graph.message import add_messages
+
+
+def merge_agent_outputs(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Dict-merge reducer: later writes for the same agent win."""
+    if not right:
+        return left or {}
+    merged = dict(left or {})
+    merged.update(right)
+    return merged
+
+
+def append_execution_order(left: List[str], right: List[str]) -> List[str]:
+    """Append reducer for the order in which agents finished."""
+    if not right:
+        return left or []
+    return operator.add(left or [], right)
+
+
+class AgentState(TypedDict):
+    """State schema for the supervisor agent."""
+    messages: Annotated[List, add_messages]
+    agent_outputs: Annotated[Dict[str, Any], merge_agent_outputs]
+    execution_order: Annotated[List[str], append_execution_order]
+    query: str
+    run_id: str
+    plan: Dict[str, Any]
+    # Absolute time.time() deadline for the request (None for no deadline)
+    deadline: Optional[float]
+    summary: Optional[str]
+    response: Optional[str]
+
+
+# Reducers by key; keys not listed are overwritten by the latest write
+STATE_REDUCERS: Dict[str, Callable[[Any, Any], Any]] = {
+    "messages": add_messages,
+    "agent_outputs": merge_agent_outputs,
+    "execution_order": append_execution_order,
+}
+
+
+def initial_state(query: str, deadline: Optional[float] = None) -> AgentState:
+    """Build the initial graph state for a query, with an optional absolute deadline."""
+    return {
+        "messages": [HumanMessage(content=query)],
+        "agent_outputs": {},
+        "execution_order": [],
+        "query": query,
+        "run_id": uuid.uuid4().hex,
+        "plan": {},
+        "deadline": deadline
+    }
+
+
+def apply_update(state: Dict[str, Any], update: Optional[Dict[str, Any]]) -> bool:
+    """
+    Fold a node delta into a locally tracked state, in place.
+
+    Mirrors how the graph applies the delta so stream consumers can follow
+    the state from "updates" chunks without receiving a full copy per step.
+
+    Returns:
+        True if the update changed anything
+    """
+    if not update:
+        return False
+    for key, value in update.items():
+        reducer = STATE_REDUCERS.get(key)
+        if reducer and key in state:
+            state[key] = reducer(state[key], value)
+        else:
+            state[key] = value
+    return True
@@ -0,0 +1,166 @@
+"""
+Summary Policy
+Decides whether the final answer needs an LLM summary or can be rendered
+from the agents' structured outputs with a deterministic template.
+"""
+
+import os
+from typing import Dict, Any, List, Optional
+
+from .metrics import metrics
+
+
+SUMMARY_MODES = ("auto", "llm", "template")
+
+# Agents whose structured results the templates know how to render
+TEMPLATE_AGENTS = ("googleMap", "calendar", "telephone")
+
+
+def active_agents(agent_outputs: Dict[str, Any]) -> List[str]:
+    """Agents that actually ran (skipped placeholders excluded)."""
+    return [
+        name for name, output in agent_outputs.items()
+        if not (isinstance(output, dict) and output.get("skipped"))
+    ]
+
+
+class SummaryPolicy:
+    """
+    Chooses the summarization path for a finished run.
+
+    Modes (SUMMARY_POLICY):
+        auto: templates for single-agent outcomes and standard reservations
+              (GoogleMap / Calendar / Telephone with structured results);
+              the LLM for research answers and other multi-agent prose
+        llm: always call the LLM
+        template: use a template whenever no research answer is involved
+
+    Path counts are recorded as summary.template / summary.llm.
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = (mode or os.getenv("SUMMARY_POLICY", "auto")).lower()
+        if self.mode not in SUMMARY_MODES:
+            raise ValueError(f"Invalid summary policy: {self.mode}. Use one of {SUMMARY_MODES}")
+
+    def choose(self, agent_outputs: Dict[str, Any], force_template: bool = False) -> str:
+        """
+        Return "template" or "llm" and record the decision.
+
+        Args:
+            agent_outputs: Outputs of the finished run
+            force_template: Skip the LLM regardless of mode (e.g. no time left)
+        """
+        path = "template" if force_template else self._choose(agent_outputs)
+        metrics.incr(f"summary.{path}")
+        return path
+
+    def _choose(self, agent_outputs: Dict[str, Any]) -> str:
+        if self.mode == "llm":
+            return "llm"
+
+        active = active_agents(agent_outputs)
+        if not active:
+            return "template"
+
+        # Research answers need synthesis
+        if "research" in active:
+            return "llm"
+
+        if self.mode == "template":
+            return "template"
+
+        if len(active) == 1:
+            return "template"
+
+        # Standard reservation: every agent produced a structured result
+        structured = all(
+            name in TEMPLATE_AGENTS and isinstance(agent_outputs[name], dict) and agent_outputs[name].get("data")
+            for name in active
+        )
+        return "template" if structured else "llm"
+
+    def render(self, query: str, agent_outputs: Dict[str, Any]) -> str:
+        """Render a deterministic summary from the agent outputs."""
+        active = active_agents(agent_outputs)
+        if not active:
+            return "I couldn't find anything to do for this request. Could you rephrase it?"
+
+        parts = []
+        for name in ("googleMap", "calendar", "telephone", "research"):
+            if name in active:
+                parts.append(self._render_agent(name, agent_outputs[name]))
+
+        if len(parts) == 1:
+            return parts[0]
+        return "I've processed your request. Here's what was done:\n\n" + "\n\n".join(parts)
+
+    def _render_agent(self, name: str, output: Any) -> str:
+        if not isinstance(output, dict):
+            return str(output)
+
+        data = output.get("data")
+        if not output.get("success", True) or not data:
+            return str(output.get("formatted") or output.get("result") or output.get("error", ""))
+
+        if name == "googleMap":
+            return self._render_places(data)
+        if name == "calendar":
+            return self._render_calendar(data)
+        if name == "telephone":
+            return self._render_call(data)
+        return str(output.get("formatted", ""))
+
+    @staticmethod
+    def _render_places(data: Dict[str, Any]) -> str:
+        if not data.get("success"):
+            return f"🗺️ I couldn't search for places: {data.get('error', 'Unknown error')}"
+        results = data.get("results", [])
+        where = f" near {data['location']}" if data.get("location") else ""
+        if not results:
+            return f"🗺️ I couldn't find any results for '{data.get('query', '')}'{where}."
+
+        lines = [f"🗺️ I found {len(results)} place(s) for '{data.get('query', '')}'{where}:"]
+        for i, place in enumerate(results, 1):
+            details = []
+            if place.get("rating") not in (None, "N/A"):
+                details.append(f"⭐ {place['rating']}")
+            if place.get("phone_number") not in (None, "N/A"):
+                details.append(f"☎️ {place['phone_number']}")
+            suffix = f" ({', '.join(details)})" if details else ""
+            lines.append(f"{i}. **{place.get('name', 'Unknown')}** - {place.get('address', 'N/A')}{suffix}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _render_calendar(data: Dict[str, Any]) -> str:
+        if not data.get("success"):
+            return f"📅 I couldn't create the calendar event: {data.get('error', 'Unknown error')}"
+        if "events" in data:
+            return f"📅 You have {data.get('count', 0)} calendar event(s)."
+        event = data.get("event", {})
+        text = f"📅 {data.get('message', 'Event added to calendar')}."
+        if event.get("location"):
+            text += f" Location: {event['location']}."
+        return text
+
+    @staticmethod
+    def _render_call(data: Dict[str, Any]) -> str:
+        phone = data.get("phone_number", "N/A")
+        if not data.get("success"):
+            return f"☎️ I couldn't place the call to {phone}: {data.get('error', 'Unknown error')}"
+        return f"☎️ Call to {phone} {data.get('status', 'initiated')}."
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """How often each summarization path is taken."""
+        template = metrics.get("summary.template")
+        llm = metrics.get("summary.llm")
+        total = template + llm
+        return {
+            "template": template,
+            "llm": llm,
+            "template_rate": round(template / total, 4) if total else None
+        }
+
+
+metrics.register("summary_policy", SummaryPolicy.stats)
@@ -5,12 +5,14 @@ Uses LangGraph to create a proper DAG-based multi-agent system.
 
 import os
 import json
-from typing import Dict, Any, List, Literal, TypedDict, Annotated, Optional
+import time
+import asyncio
+from datetime import date
+from typing import Dict, Any, List, Literal, Optional, Tuple, Callable, Awaitable
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langgraph.graph import StateGraph, END
-from langgraph.graph.message import add_messages
+from langgraph.config import get_stream_writer
 
 from .agent_factory import (
     create_googlemap_agent,
@@ -18,35 +20,94 @@ from .agent_factory import (
     create_telephone_agent,
     create_research_agent
 )
+from .state import AgentState, initial_state, apply_update
+from .intent import IntentMatcher
+from .plan_cache import PlanCache
+from .speculation import SpeculativeExecutor
+from .summary_policy import SummaryPolicy
+from .hedging import HedgedLLM
+from .llm_registry import get_llm
+from .metrics import metrics
+from .deadline import (
+    DeadlineExceeded,
+    use_deadline,
+    remaining,
+    within_deadline,
+    deadline_after,
+    request_budget,
+    GRACE_SECONDS
+)
+from .plan_schema import (
+    SupervisorPlan,
+    PlacesSearchArgs,
+    CalendarEventArgs,
+    PhoneCallArgs,
+    plan_arguments
+)
+from .tools import search_nearby_places, add_calendar_event, make_phone_call
+from .googlemap_agent import GoogleMapAgent
+from .calendar_agent import CalendarAgent
+from .telephone_agent import TelephoneAgent
+from .research_agent import ResearchAgent
 
 load_dotenv()
 
 
-class AgentState(TypedDict):
-    """State schema for the supervisor agent."""
-    messages: Annotated[List, add_messages]
-    agent_outputs: Dict[str, Any]
-    execution_order: List[str]
-    query: str
-    plan: Dict[str, Any]
-    summary: Optional[str]
-    response: Optional[str]
+# Agent nodes and the nodes they route to
+AGENT_NODES = ["googlemap", "research", "calendar", "telephone"]
+
+# Node name -> (agent_outputs key, display name)
+AGENT_LABELS = {
+    "googlemap": ("googleMap", "GoogleMap"),
+    "research": ("research", "Research"),
+    "calendar": ("calendar", "Calendar"),
+    "telephone": ("telephone", "Telephone"),
+}
+
+# Agents that may be skipped when the time budget runs low
+OPTIONAL_AGENTS = ("research",)
+
+EXECUTION_MODES = ("parallel", "sequential")
 
 
 class SupervisorAgentLangGraph:
     """Supervisor Agent using LangGraph for proper multi-agent coordination."""
     
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
+    def __init__(self, execution_mode: Optional[str] = None):
+        """
+        Args:
+            execution_mode: "parallel" fans out every agent whose dependencies
+                are met at once; "sequential" runs one agent at a time.
+                Defaults to SUPERVISOR_EXECUTION_MODE or "parallel".
+        """
+        self.execution_mode = (execution_mode or os.getenv("SUPERVISOR_EXECUTION_MODE", "parallel")).lower()
+        if self.execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Invalid execution mode: {self.execution_mode}. Use one of {EXECUTION_MODES}")
         
-        # Supervisor LLM for planning and routing
-        self.supervisor_llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=0.3
-        )
+        # Supervisor LLM for planning and routing (shared client from the registry)
+        self.supervisor_llm = get_llm(temperature=0.3)
+        
+        # Planner: one structured call returns the plan and the tool arguments.
+        # Planning and summarizing are idempotent, so both are hedged.
+        self.planner_llm = HedgedLLM(self.supervisor_llm.with_structured_output(SupervisorPlan), "planner")
+        self.summary_llm = HedgedLLM(self.supervisor_llm, "summary")
+        
+        # Rule-based planner fast path (skips the planner LLM for clear-cut queries)
+        self.intent_matcher = IntentMatcher()
+        
+        # Plans keyed by normalized query signature (in front of the planner LLM)
+        self.plan_cache = PlanCache()
+        
+        # Starts likely, side-effect-free agents while the planner LLM runs
+        self.speculation = SpeculativeExecutor()
+        
+        # Chooses between templated and LLM summaries
+        self.summary_policy = SummaryPolicy()
+        
+        # Deadline thresholds: below these many seconds left, optional agents
+        # are skipped and the summary is templated instead of LLM-written
+        self.optional_agent_min_seconds = float(os.getenv("DEADLINE_OPTIONAL_AGENT_MIN_SECONDS", "10"))
+        self.summary_llm_min_seconds = float(os.getenv("DEADLINE_SUMMARY_LLM_MIN_SECONDS", "5"))
         
         # Create sub-agents
         self.googlemap_agent = create_googlemap_agent()
@@ -62,16 +123,32 @@ class SupervisorAgentLangGraph:
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("plan", self._plan_node)
-        workflow.add_node("googlemap", self._googlemap_node)
-        workflow.add_node("calendar", self._calendar_node)
-        workflow.add_node("telephone", self._telephone_node)
-        workflow.add_node("research", self._research_node)
-        workflow.add_node("summarize", self._summarize_node)
+        workflow.add_node("plan", self._deadline_node("plan", self._plan_node))
+        workflow.add_node("googlemap", self._deadline_node("googlemap", self._speculative_node("googlemap", self._googlemap_node)))
+        workflow.add_node("calendar", self._deadline_node("calendar", self._calendar_node))
+        workflow.add_node("telephone", self._deadline_node("telephone", self._telephone_node))
+        workflow.add_node("research", self._deadline_node("research", self._speculative_node("research", self._research_node)))
+        workflow.add_node("summarize", self._deadline_node("summarize", self._summarize_node))
         
         # Set entry point
         workflow.set_entry_point("plan")
         
+        if self.execution_mode == "parallel":
+            # Plan and every agent join at "dispatch", which sees the merged
+            # state of the finished superstep and fans out to all ready agents.
+            # Agents dispatched together run concurrently in one superstep.
+            workflow.add_node("dispatch", self._dispatch_node)
+            workflow.add_edge("plan", "dispatch")
+            for node in AGENT_NODES:
+                workflow.add_edge(node, "dispatch")
+            workflow.add_conditional_edges(
+                "dispatch",
+                self._route_parallel,
+                AGENT_NODES + ["summarize"]
+            )
+            workflow.add_edge("summarize", END)
+            return workflow.compile()
+        
         # Add conditional edges from plan - routes to first needed agent
         workflow.add_conditional_edges(
             "plan",
@@ -136,14 +213,117 @@ class SupervisorAgentLangGraph:
         
         return workflow.compile()
     
-    async def _plan_node(self, state: AgentState) -> AgentState:
+    async def _plan_node(self, state: AgentState) -> Dict[str, Any]:
         """Plan which agents to use based on the query."""
         query = state.get("query", "")
-        messages = state.get("messages", [])
         
-        if not messages:
-            messages = [HumanMessage(content=query)]
+        plan = self.intent_matcher.try_fast_path(query)
+        if plan is None:
+            plan = await self.plan_cache.aget(query)
+        if plan is None:
+            self._start_speculation(state)
+            plan = await self._llm_plan(query)
+            self.speculation.resolve(state.get("run_id"), plan, self._speculation_arguments(plan))
+        
+        update = {"plan": plan}
+        
+        # Initialize Research Agent with status if not needed
+        if not plan.get("use_research"):
+            update["agent_outputs"] = {
+                "research": {
+                    "agent": "Research",
+                    "success": True,
+                    "formatted": "ℹ️ Research Agent: Not needed for this query. This agent is used for general information and research questions.",
+                    "skipped": True
+                }
+            }
+        
+        return update
+    
+    def _start_speculation(self, state: AgentState) -> None:
+        """Start agents the intent matcher considers likely before the LLM plan arrives."""
+        match = self.intent_matcher.match(state.get("query", ""))
+        # Speculative runs see the matcher's plan, so they can use any tool
+        # arguments it extracted
+        speculative_state = {**state, "plan": match.plan}
+        started = self.speculation.start(
+            state.get("run_id"),
+            match.scores,
+            {
+                "googlemap": lambda: self._googlemap_node(speculative_state),
+                "research": lambda: self._research_node(speculative_state)
+            },
+            self._speculation_arguments(match.plan)
+        )
+        if started:
+            print(f"[SUPERVISOR] Speculatively started: {', '.join(started)}")
+    
+    @staticmethod
+    def _speculation_arguments(plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Tool arguments each speculative node runs with under a plan, for
+        comparing a speculative run against the final plan.
+        
+        Returns:
+            Node name -> case-folded arguments (None when the agent works them out)
+        """
+        args = plan_arguments(plan, "googlemap", PlacesSearchArgs)
+        if not args or not args.is_complete():
+            return {"googlemap": None}
+        return {"googlemap": {name: value.strip().casefold() for name, value in args.model_dump(exclude_none=True).items()}}
+    
+    def _deadline_node(self, node: str, run: Callable[[AgentState], Awaitable[Dict[str, Any]]]):
+        """
+        Wrap a node so it runs under the request deadline carried in the state.
         
+        Agents are not started once the budget is used up, and optional agents
+        are skipped when too little of it is left.
+        """
+        async def node_fn(state: AgentState) -> Dict[str, Any]:
+            use_deadline(state.get("deadline"))
+            budget = remaining()
+            if node in AGENT_LABELS and budget is not None:
+                key, label = AGENT_LABELS[node]
+                if node in OPTIONAL_AGENTS and budget < self.optional_agent_min_seconds:
+                    print(f"[SUPERVISOR] Skipping {label} Agent: {budget:.1f}s left in time budget")
+                    return {
+                        "agent_outputs": {
+                            key: {
+                                "agent": label,
+                                "success": False,
+                                "error": "Skipped to stay within the request time budget",
+                                "formatted": f"⏱️ {label} Agent: Skipped to stay within the request time budget.",
+                                "skipped": True
+                            }
+                        },
+                        "execution_order": [f"{key} (skipped)"]
+                    }
+                if budget <= 0:
+                    return {
+                        "agent_outputs": {
+                            key: {
+                                "agent": label,
+                                "success": False,
+                                "error": "Request deadline exceeded",
+                                "formatted": f"⏱️ {label} Agent: Not run - request deadline exceeded."
+                            }
+                        },
+                        "execution_order": [f"{key} (failed)"]
+                    }
+            return await run(state)
+        return node_fn
+    
+    def _speculative_node(self, node: str, run: Callable[[AgentState], Awaitable[Dict[str, Any]]]):
+        """Wrap an agent node so it adopts a confirmed speculative result instead of re-running."""
+        async def node_fn(state: AgentState) -> Dict[str, Any]:
+            result = await self.speculation.adopt(state.get("run_id"), node)
+            if result is not None:
+                return result
+            return await run(state)
+        return node_fn
+    
+    async def _llm_plan(self, query: str) -> Dict[str, Any]:
+        """Ask the supervisor LLM for a plan (used when the intent matcher is unsure)."""
         plan_prompt = f"""You are a supervisor agent coordinating multiple specialized agents.
 
 Available agents:
@@ -163,69 +343,46 @@ IMPORTANT RULES:
 - If the query asks to "find" or "search" for places, set use_googlemap: true
 - If the query asks general questions or needs research, set use_research: true
 
-Analyze the query and determine which agents should be used. Return a JSON object with:
-{{
-    "use_googlemap": true/false,
-    "use_calendar": true/false,
-    "use_telephone": true/false,
-    "use_research": true/false,
-    "reasoning": "brief explanation"
-}}
+Analyze the query and determine which agents should be used, and fill in the
+arguments for each selected agent's tool from the query:
+- googlemap: query (what to search for, e.g. "Indian restaurant") and location (e.g. "Taipei 101")
+- calendar: title, date ("today", "tomorrow" or YYYY-MM-DD; today is {date.today().isoformat()}),
+  time in 24-hour HH:MM (e.g. "7 PM" -> "19:00"), optional description and location
+- telephone: phone_number only if it appears in the query, and a short message for the call
 
+Leave an argument empty if the query does not state it; never invent values.
 Only set agents to true if they are clearly needed for the query."""
         
-        response = await self.supervisor_llm.ainvoke([HumanMessage(content=plan_prompt)])
-        
         try:
-            # Extract JSON from response
-            content = response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            plan = json.loads(content)
-        except:
+            # Schema-constrained output: flags plus validated tool arguments
+            structured = await within_deadline(self.planner_llm.ainvoke([HumanMessage(content=plan_prompt)]))
+            plan = structured.to_plan()
+            await self.plan_cache.aput(query, plan)
+            return plan
+        except Exception as e:
+            print(f"Planner error: {str(e)}")
             # Fallback plan based on keywords
-            plan = self._fallback_plan(query)
-        
-        state["plan"] = plan
-        state["agent_outputs"] = {}
-        state["execution_order"] = []
-        
-        # Initialize Research Agent with status if not needed
-        if not plan.get("use_research"):
-            state["agent_outputs"]["research"] = {
-                "agent": "Research",
-                "success": True,
-                "formatted": "ℹ️ Research Agent: Not needed for this query. This agent is used for general information and research questions.",
-                "skipped": True
-            }
-        
-        return state
+            return self._fallback_plan(query)
     
     def _fallback_plan(self, query: str) -> Dict[str, Any]:
-        """Fallback plan based on keyword matching."""
-        query_lower = query.lower()
-        return {
-            "use_googlemap": any(kw in query_lower for kw in ["find", "search", "near", "restaurant", "place", "location", "nearby"]),
-            "use_calendar": any(kw in query_lower for kw in ["calendar", "schedule", "event", "booking", "reservation", "appointment", "meeting"]),
-            "use_telephone": any(kw in query_lower for kw in ["call", "phone", "telephone", "ring"]),
-            "use_research": any(kw in query_lower for kw in ["what", "how", "why", "explain", "research", "information", "tell me about"]),
-            "reasoning": "Fallback keyword-based plan"
-        }
+        """Fallback plan based on keyword matching (best guess of the intent matcher)."""
+        plan = dict(self.intent_matcher.match(query).plan)
+        plan["reasoning"] = "Fallback keyword-based plan"
+        return plan
     
-    def _route_after_plan(self, state: AgentState) -> str:
+    @staticmethod
+    def _has_run(execution_order: List[str], key: str) -> bool:
+        """Whether an agent finished, failed or was skipped for the deadline."""
+        return any(entry in execution_order for entry in (key, f"{key} (failed)", f"{key} (skipped)"))
+    
+    def _ready_agents(self, state: AgentState) -> List[Tuple[str, int]]:
         """
-        Supervisor-driven routing: Evaluates state and decides next agent.
+        Return (node, priority) for every planned agent that has not run yet
+        and whose dependencies are satisfied.
         
-        This implements Supervisor-driven task assignment where the Supervisor
-        evaluates the complete state after each agent completes and makes
-        intelligent routing decisions based on:
-        - Original plan requirements
-        - Current execution status
-        - Agent dependencies
-        - Workflow context (e.g., reservation vs. general query)
+        Dependencies:
+        - GoogleMap and Research are independent
+        - Calendar and Telephone need GoogleMap data when GoogleMap is planned
         """
         plan = state.get("plan", {})
         execution_order = state.get("execution_order", [])
@@ -237,12 +394,12 @@ Only set agents to true if they are clearly needed for the query."""
         
         # Check GoogleMap: Needed if in plan and not executed
         if plan.get("use_googlemap"):
-            if "googleMap" not in execution_order and "googleMap (failed)" not in execution_order:
+            if not self._has_run(execution_order, "googleMap"):
                 needed_agents.append(("googlemap", 1))  # Priority 1 (highest - provides data for others)
         
         # Check Research: Independent, can run anytime
         if plan.get("use_research"):
-            if "research" not in execution_order and "research (failed)" not in execution_order:
+            if not self._has_run(execution_order, "research"):
                 needed_agents.append(("research", 2))  # Priority 2
         
         # Check Calendar and Telephone: Dependencies matter
@@ -252,33 +409,180 @@ Only set agents to true if they are clearly needed for the query."""
         # For reservations: Calendar should come before Telephone
         # For other cases: Check dependencies
         if plan.get("use_calendar"):
-            if "calendar" not in execution_order and "calendar (failed)" not in execution_order:
+            if not self._has_run(execution_order, "calendar"):
                 # Calendar can run if we have location data (from GoogleMap) or if it's independent
                 if has_googlemap_data or not plan.get("use_googlemap"):
                     priority = 3 if is_reservation else 4
                     needed_agents.append(("calendar", priority))
         
         if plan.get("use_telephone"):
-            if "telephone" not in execution_order and "telephone (failed)" not in execution_order:
+            if not self._has_run(execution_order, "telephone"):
                 # Telephone needs phone number from GoogleMap (if GoogleMap was used)
                 if has_googlemap_data or not plan.get("use_googlemap"):
                     priority = 4 if is_reservation else 3
                     needed_agents.append(("telephone", priority))
         
+        # Sort by priority (lower number = higher priority)
+        needed_agents.sort(key=lambda x: x[1])
+        return needed_agents
+    
+    def _route_after_plan(self, state: AgentState) -> str:
+        """
+        Supervisor-driven routing: Evaluates state and decides next agent.
+        
+        This implements Supervisor-driven task assignment where the Supervisor
+        evaluates the complete state after each agent completes and makes
+        intelligent routing decisions based on:
+        - Original plan requirements
+        - Current execution status
+        - Agent dependencies
+        - Workflow context (e.g., reservation vs. general query)
+        """
+        needed_agents = self._ready_agents(state)
+        
         # Supervisor decision: Route to highest priority needed agent
         if needed_agents:
-            # Sort by priority (lower number = higher priority)
-            needed_agents.sort(key=lambda x: x[1])
-            next_agent = needed_agents[0][0]
-            return next_agent
+            return needed_agents[0][0]
         
         # All agents executed - Supervisor routes to summarization
         return "summarize"
     
-    async def _googlemap_node(self, state: AgentState) -> AgentState:
+    async def _dispatch_node(self, state: AgentState) -> Dict[str, Any]:
+        """Join point for parallel branches; routing happens on its edges."""
+        return {}
+    
+    def _route_parallel(self, state: AgentState) -> List[str]:
+        """Parallel routing: fan out to every agent whose dependencies are met."""
+        needed_agents = self._ready_agents(state)
+        if needed_agents:
+            return [agent for agent, _ in needed_agents]
+        return ["summarize"]
+    
+    async def _call_tool(
+        self,
+        key: str,
+        label: str,
+        tool,
+        args: Dict[str, Any],
+        formatter: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, Any]:
+        """
+        Call an agent's tool directly with planner-supplied arguments,
+        skipping that agent's ReAct loop.
+        """
+        raw = await within_deadline(tool.ainvoke(args))
+        data = json.loads(raw) if isinstance(raw, str) else raw
+        return self._tool_output(key, label, data, args, formatter)
+    
+    def _direct_tool_output(
+        self,
+        key: str,
+        label: str,
+        result: Any,
+        formatter: Callable[[Dict[str, Any]], str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the agent output from a ReAct run that ended on a return_direct
+        tool, formatting the tool's JSON locally instead of with another LLM turn.
+        
+        Returns None if the run ended with a model message.
+        """
+        messages = result.get("messages") if isinstance(result, dict) else None
+        if not messages or not isinstance(messages[-1], ToolMessage):
+            return None
+        tool_message = messages[-1]
+        try:
+            data = json.loads(tool_message.content)
+        except (TypeError, ValueError):
+            return None
+        
+        # Arguments the model chose for this tool call
+        args = {}
+        for msg in reversed(messages[:-1]):
+            for call in getattr(msg, "tool_calls", None) or []:
+                if call.get("id") == tool_message.tool_call_id:
+                    args = call.get("args", {})
+                    break
+            if args:
+                break
+        
+        return self._tool_output(key, label, data, args, formatter)
+    
+    def _tool_output(
+        self,
+        key: str,
+        label: str,
+        data: Dict[str, Any],
+        args: Dict[str, Any],
+        formatter: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, Any]:
+        """State update for an agent whose output is a structured tool result."""
+        formatted = formatter(data)
+        success = bool(data.get("success", True))
+        
+        agent_output = {
+            "agent": label,
+            "success": success,
+            "result": formatted,
+            "formatted": formatted,
+            "data": data,
+            "tool_args": args
+        }
+        if data.get("error"):
+            agent_output["error"] = data["error"]
+        return {
+            "agent_outputs": {key: agent_output},
+            "execution_order": [key if success else f"{key} (failed)"]
+        }
+    
+    @staticmethod
+    def _tool_status(result: Any) -> Tuple[bool, Optional[str]]:
+        """
+        (success, error) of the last tool call in a ReAct run, read from the
+        tool's JSON result; a run without a structured tool result counts as
+        successful.
+        """
+        messages = result.get("messages") if isinstance(result, dict) else None
+        for msg in reversed(messages or []):
+            if isinstance(msg, ToolMessage):
+                try:
+                    data = json.loads(msg.content)
+                except (TypeError, ValueError):
+                    return True, None
+                if isinstance(data, dict):
+                    return bool(data.get("success", True)), data.get("error")
+                return True, None
+        return True, None
+    
+    def _top_place(self, state: AgentState) -> Optional[Dict[str, Any]]:
+        """First structured GoogleMap result, if GoogleMap returned structured data."""
+        data = state.get("agent_outputs", {}).get("googleMap", {}).get("data") or {}
+        results = data.get("results") or []
+        return results[0] if results else None
+    
+    def _call_message(self, state: AgentState, place: Optional[Dict[str, Any]]) -> str:
+        """Default call script when the planner did not provide one."""
+        event = plan_arguments(state.get("plan", {}), "calendar", CalendarEventArgs)
+        message = "Calling to make a reservation"
+        if place:
+            message += f" at {place.get('name')}"
+        if event and event.date and event.time:
+            message += f" for {event.date} at {event.time}"
+        return message
+    
+    async def _googlemap_node(self, state: AgentState) -> Dict[str, Any]:
         """Execute GoogleMap agent."""
         try:
             query = state.get("query", "")
+            
+            # Planner supplied complete arguments - call the tool directly
+            args = plan_arguments(state.get("plan", {}), "googlemap", PlacesSearchArgs)
+            if args and args.is_complete():
+                return await self._call_tool(
+                    "googleMap", "GoogleMap", search_nearby_places,
+                    args.model_dump(exclude_none=True), GoogleMapAgent.format_results
+                )
+            
             # Create a prompt that encourages tool use
             enhanced_query = f"""You need to search for places using the search_nearby_places tool.
 
@@ -295,7 +599,12 @@ Then call search_nearby_places with these parameters."""
             messages = [HumanMessage(content=enhanced_query)]
             
             # Invoke agent with messages
-            result = await self.googlemap_agent.ainvoke({"messages": messages})
+            result = await within_deadline(self.googlemap_agent.ainvoke({"messages": messages}))
+            
+            # Direct-return mode: the agent stopped at the tool's structured result
+            direct = self._direct_tool_output("googleMap", "GoogleMap", result, GoogleMapAgent.format_results)
+            if direct:
+                return direct
             
             # Extract agent output - handle different response formats
             if isinstance(result, dict):
@@ -313,32 +622,39 @@ Then call search_nearby_places with these parameters."""
             else:
                 content = str(result)
             
+            success, error = self._tool_status(result)
             agent_output = {
                 "agent": "GoogleMap",
-                "success": True,
+                "success": success,
                 "result": content,
                 "formatted": content
             }
+            if error:
+                agent_output["error"] = error
             
-            state["agent_outputs"]["googleMap"] = agent_output
-            state["execution_order"].append("googleMap")
+            return {
+                "agent_outputs": {"googleMap": agent_output},
+                "execution_order": ["googleMap" if success else "googleMap (failed)"]
+            }
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             print(f"GoogleMap Agent Error: {str(e)}")
             print(f"Traceback: {error_trace}")
-            state["agent_outputs"]["googleMap"] = {
-                "agent": "GoogleMap",
-                "success": False,
-                "error": str(e),
-                "formatted": f"❌ GoogleMap Agent Error: {str(e)}"
+            return {
+                "agent_outputs": {
+                    "googleMap": {
+                        "agent": "GoogleMap",
+                        "success": False,
+                        "error": str(e),
+                        "formatted": f"❌ GoogleMap Agent Error: {str(e)}"
+                    }
+                },
+                "execution_order": ["googleMap (failed)"]
             }
-            state["execution_order"].append("googleMap (failed)")
-        
-        return state
     
-    async def _calendar_node(self, state: AgentState) -> AgentState:
+    async def _calendar_node(self, state: AgentState) -> Dict[str, Any]:
         """Execute Calendar agent."""
         try:
             query = state.get("query", "")
@@ -347,6 +663,17 @@ Then call search_nearby_places with these parameters."""
             # Include context from GoogleMap results if available
             googlemap_results = state.get("agent_outputs", {}).get("googleMap", {})
             
+            # Planner supplied complete arguments - call the tool directly
+            args = plan_arguments(plan, "calendar", CalendarEventArgs)
+            if args and args.is_complete():
+                place = self._top_place(state)
+                if place and not args.location:
+                    args.location = f"{place.get('name')}, {place.get('address')}"
+                return await self._call_tool(
+                    "calendar", "Calendar", add_calendar_event,
+                    args.model_dump(exclude_none=True), CalendarAgent.format_added_event
+                )
+            
             # Auto-trigger telephone if making reservation and we have restaurant results
             # But don't update plan here - let the routing handle it
             # The plan should already have use_telephone set if needed
@@ -387,7 +714,12 @@ Then call add_calendar_event with these parameters."""
             
             messages = [HumanMessage(content=enhanced_query)]
             
-            result = await self.calendar_agent.ainvoke({"messages": messages})
+            result = await within_deadline(self.calendar_agent.ainvoke({"messages": messages}))
+            
+            # Direct-return mode: the agent stopped at the tool's structured result
+            direct = self._direct_tool_output("calendar", "Calendar", result, CalendarAgent.format_result)
+            if direct:
+                return direct
             
             # Extract agent output - handle different response formats
             if isinstance(result, dict):
@@ -404,38 +736,59 @@ Then call add_calendar_event with these parameters."""
             else:
                 content = str(result)
             
+            success, error = self._tool_status(result)
             agent_output = {
                 "agent": "Calendar",
-                "success": True,
+                "success": success,
                 "result": content,
                 "formatted": content
             }
+            if error:
+                agent_output["error"] = error
             
-            state["agent_outputs"]["calendar"] = agent_output
-            state["execution_order"].append("calendar")
+            return {
+                "agent_outputs": {"calendar": agent_output},
+                "execution_order": ["calendar" if success else "calendar (failed)"]
+            }
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             print(f"Calendar Agent Error: {str(e)}")
             print(f"Traceback: {error_trace}")
-            state["agent_outputs"]["calendar"] = {
-                "agent": "Calendar",
-                "success": False,
-                "error": str(e),
-                "formatted": f"❌ Calendar Agent Error: {str(e)}"
+            return {
+                "agent_outputs": {
+                    "calendar": {
+                        "agent": "Calendar",
+                        "success": False,
+                        "error": str(e),
+                        "formatted": f"❌ Calendar Agent Error: {str(e)}"
+                    }
+                },
+                "execution_order": ["calendar (failed)"]
             }
-            state["execution_order"].append("calendar (failed)")
-        
-        return state
     
-    async def _telephone_node(self, state: AgentState) -> AgentState:
+    async def _telephone_node(self, state: AgentState) -> Dict[str, Any]:
         """Execute Telephone agent."""
         try:
             query = state.get("query", "")
             # Include phone number from GoogleMap results if available
             googlemap_results = state.get("agent_outputs", {}).get("googleMap", {})
             
+            # Call the tool directly when the number is known (from the plan or
+            # the top GoogleMap result)
+            args = plan_arguments(state.get("plan", {}), "telephone", PhoneCallArgs) or PhoneCallArgs()
+            place = self._top_place(state)
+            if not args.is_complete() and place and place.get("phone_number") not in (None, "", "N/A"):
+                args.phone_number = place["phone_number"]
+            if args.is_complete():
+                if not args.message:
+                    args.message = self._call_message(state, place)
+                return await self._call_tool(
+                    "telephone", "Telephone", make_phone_call,
+                    args.model_dump(exclude_none=True), TelephoneAgent.format_result
+                )
+            
             # Build enhanced query that encourages tool use
             if googlemap_results.get("success"):
                 context = f"Context from GoogleMap search: {googlemap_results.get('result', '')}"
@@ -466,7 +819,12 @@ Then call make_phone_call with these parameters."""
             
             messages = [HumanMessage(content=enhanced_query)]
             
-            result = await self.telephone_agent.ainvoke({"messages": messages})
+            result = await within_deadline(self.telephone_agent.ainvoke({"messages": messages}))
+            
+            # Direct-return mode: the agent stopped at the tool's structured result
+            direct = self._direct_tool_output("telephone", "Telephone", result, TelephoneAgent.format_result)
+            if direct:
+                return direct
             
             # Extract agent output - handle different response formats
             if isinstance(result, dict):
@@ -483,38 +841,50 @@ Then call make_phone_call with these parameters."""
             else:
                 content = str(result)
             
+            success, error = self._tool_status(result)
             agent_output = {
                 "agent": "Telephone",
-                "success": True,
+                "success": success,
                 "result": content,
                 "formatted": content
             }
+            if error:
+                agent_output["error"] = error
             
-            state["agent_outputs"]["telephone"] = agent_output
-            state["execution_order"].append("telephone")
+            return {
+                "agent_outputs": {"telephone": agent_output},
+                "execution_order": ["telephone" if success else "telephone (failed)"]
+            }
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             print(f"Telephone Agent Error: {str(e)}")
             print(f"Traceback: {error_trace}")
-            state["agent_outputs"]["telephone"] = {
-                "agent": "Telephone",
-                "success": False,
-                "error": str(e),
-                "formatted": f"❌ Telephone Agent Error: {str(e)}"
+            return {
+                "agent_outputs": {
+                    "telephone": {
+                        "agent": "Telephone",
+                        "success": False,
+                        "error": str(e),
+                        "formatted": f"❌ Telephone Agent Error: {str(e)}"
+                    }
+                },
+                "execution_order": ["telephone (failed)"]
             }
-            state["execution_order"].append("telephone (failed)")
-        
-        return state
     
-    async def _research_node(self, state: AgentState) -> AgentState:
+    async def _research_node(self, state: AgentState) -> Dict[str, Any]:
         """Execute Research agent."""
         try:
             query = state.get("query", "")
             messages = [HumanMessage(content=query)]
             
-            result = await self.research_agent.ainvoke({"messages": messages})
+            result = await within_deadline(self.research_agent.ainvoke({"messages": messages}))
+            
+            # Direct-return mode: the agent stopped at the tool's structured result
+            direct = self._direct_tool_output("research", "Research", result, ResearchAgent.format_result)
+            if direct:
+                return direct
             
             # Extract agent output - handle different response formats
             if isinstance(result, dict):
@@ -527,37 +897,56 @@ Then call make_phone_call with these parameters."""
             else:
                 content = str(result)
             
+            success, error = self._tool_status(result)
             agent_output = {
                 "agent": "Research",
-                "success": True,
+                "success": success,
                 "result": content,
                 "formatted": content
             }
+            if error:
+                agent_output["error"] = error
             
-            state["agent_outputs"]["research"] = agent_output
-            state["execution_order"].append("research")
+            return {
+                "agent_outputs": {"research": agent_output},
+                "execution_order": ["research" if success else "research (failed)"]
+            }
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             print(f"Research Agent Error: {str(e)}")
             print(f"Traceback: {error_trace}")
-            state["agent_outputs"]["research"] = {
-                "agent": "Research",
-                "success": False,
-                "error": str(e),
-                "formatted": f"❌ Research Agent Error: {str(e)}"
+            return {
+                "agent_outputs": {
+                    "research": {
+                        "agent": "Research",
+                        "success": False,
+                        "error": str(e),
+                        "formatted": f"❌ Research Agent Error: {str(e)}"
+                    }
+                },
+                "execution_order": ["research (failed)"]
             }
-            state["execution_order"].append("research (failed)")
-        
-        return state
     
-    async def _summarize_node(self, state: AgentState) -> AgentState:
+    async def _summarize_node(self, state: AgentState) -> Dict[str, Any]:
         """Generate final summary."""
         try:
             query = state.get("query", "")
             agent_outputs = state.get("agent_outputs", {})
             
+            # Single-agent and standard reservation outcomes don't need the LLM,
+            # and neither does a run that is about to miss its deadline
+            budget = remaining()
+            low_budget = budget is not None and budget < self.summary_llm_min_seconds
+            if self.summary_policy.choose(agent_outputs, force_template=low_budget) == "template":
+                summary = self.summary_policy.render(query, agent_outputs)
+                get_stream_writer()({"summary_delta": summary})
+                return {
+                    "summary": summary,
+                    "response": summary
+                }
+            
             # Extract clean text from agent outputs
             def extract_clean_text(value):
                 """Extract clean text from various data structures."""
@@ -665,8 +1054,7 @@ IMPORTANT: Make sure to mention ALL agents that were used. If an agent wasn't ne
 
 Write the summary now:"""
             
-            response = await self.supervisor_llm.ainvoke([HumanMessage(content=summary_prompt)])
-            summary = response.content.strip()
+            summary = await within_deadline(self._stream_summary(summary_prompt))
             
             # Ensure summary is not empty
             if not summary:
@@ -676,12 +1064,15 @@ Write the summary now:"""
             print(f"\n[SUPERVISOR] Summary generated: {summary[:100]}...")
             print(f"[SUPERVISOR] Summary length: {len(summary)}")
             
-            state["summary"] = summary
-            state["response"] = summary
-            
-            # Debug: verify state is updated
-            print(f"[SUPERVISOR] State summary set: {state.get('summary')[:50] if state.get('summary') else 'None'}...")
+            # Debug: verify summary is set
+            print(f"[SUPERVISOR] State summary set: {summary[:50] if summary else 'None'}...")
             
+        except DeadlineExceeded:
+            # Out of time mid-summary: answer from the structured outputs. Part
+            # of the LLM summary may already be out, so the template replaces it
+            print("[SUPERVISOR] Summary LLM hit the request deadline, using template")
+            summary = self.summary_policy.render(query, agent_outputs)
+            get_stream_writer()({"summary_delta": summary, "replace": True})
         except Exception as e:
             import traceback
             print(f"Summary generation error: {str(e)}")
@@ -689,10 +1080,29 @@ Write the summary now:"""
             # Create a fallback summary
             agent_count = len(agent_outputs)
             summary = f"I've successfully processed your request. {agent_count} agent(s) completed their tasks."
-            state["summary"] = summary
-            state["response"] = summary
         
-        return state
+        return {
+            "summary": summary,
+            "response": summary
+        }
+    
+    async def _stream_summary(self, summary_prompt: str) -> str:
+        """
+        Generate the summary token by token.
+        
+        Each piece is emitted on the graph's custom stream as
+        {"summary_delta": text} so streaming clients see the answer as it is
+        written; outside a streaming run the writer is a no-op.
+        """
+        writer = get_stream_writer()
+        parts = []
+        async for piece in self.summary_llm.astream([HumanMessage(content=summary_prompt)]):
+            text = piece.text if hasattr(piece, "text") else str(piece.content)
+            if not text:
+                continue
+            parts.append(text)
+            writer({"summary_delta": text})
+        return "".join(parts).strip()
     
     def _format_googlemap_result(self, result: Dict[str, Any]) -> str:
         """Format GoogleMap agent result."""
@@ -722,27 +1132,39 @@ Write the summary now:"""
             return messages[-1].content
         return str(result)
     
-    async def process_query(self, query: str) -> Dict[str, Any]:
+    async def process_query(self, query: str, deadline_seconds: Optional[float] = None) -> Dict[str, Any]:
         """
         Process a user query through the LangGraph supervisor.
         
         Args:
             query: User's query string
+            deadline_seconds: Time budget for the whole request
+                (capped by REQUEST_DEADLINE_SECONDS, its default)
         
         Returns:
             Dictionary with processing results
         """
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=query)],
-            "agent_outputs": {},
-            "execution_order": [],
-            "query": query,
-            "plan": {}
-        }
+        state = initial_state(query, deadline_after(request_budget(deadline_seconds)))
         
-        # Run the graph
-        final_state = await self.graph.ainvoke(initial_state)
+        # Run the graph; nodes stop at the deadline, the outer guard catches
+        # anything that does not
+        guard = state["deadline"] + GRACE_SECONDS if state["deadline"] else None
+        started = time.monotonic()
+        metrics.add_gauge("queries.in_flight", 1)
+        try:
+            final_state = await within_deadline(self.graph.ainvoke(state), at=guard)
+        except asyncio.CancelledError:
+            self._record_cancelled(started)
+            raise
+        finally:
+            metrics.add_gauge("queries.in_flight", -1)
+            self.speculation.discard(state["run_id"])
         
+        return self.build_result(query, final_state)
+    
+    @staticmethod
+    def build_result(query: str, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a finished graph state as a process_query result."""
         return {
             "supervisor": f"Processing query: {query}",
             "plan": final_state.get("plan", {}),
@@ -752,48 +1174,78 @@ Write the summary now:"""
             "response": final_state.get("response", final_state.get("summary", ""))
         }
     
-    async def stream_query(self, query: str):
+    async def stream_query(self, query: str, deadline_seconds: Optional[float] = None):
         """
         Stream query processing results.
         
+        The graph streams per-node deltas ("updates"); they are folded into a
+        locally tracked state so each yielded chunk is the current state
+        without the graph serializing a full copy after every step.
+        Summary tokens arrive on the "custom" stream and are yielded as
+        {"summary_delta": text} chunks before the final state; a chunk with
+        "replace": True replaces the text streamed so far.
+        
         Args:
             query: User's query string
+            deadline_seconds: Time budget for the whole request
+                (capped by REQUEST_DEADLINE_SECONDS, its default)
         
         Yields:
             Dictionary chunks with processing updates
+        
+        Raises:
+            DeadlineExceeded: if the graph is still running GRACE_SECONDS after the deadline
         """
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=query)],
-            "agent_outputs": {},
-            "execution_order": [],
-            "query": query,
-            "plan": {}
-        }
+        state = initial_state(query, deadline_after(request_budget(deadline_seconds)))
+        stream = self.graph.astream(state, stream_mode=["updates", "custom"])
         
-        # Track previous state to detect changes
-        previous_outputs = {}
-        previous_order = []
-        
-        async for chunk in self.graph.astream(initial_state, stream_mode="values"):
-            # Check for new agent outputs
-            current_outputs = chunk.get("agent_outputs", {})
-            current_order = chunk.get("execution_order", [])
-            
-            # Ensure summary and response are included in chunk
-            # The summarize node should have set these, but ensure they're strings
-            if "summary" in chunk:
-                summary = chunk.get("summary")
-                if summary and not isinstance(summary, str):
-                    chunk["summary"] = str(summary)
-            if "response" in chunk:
-                response = chunk.get("response")
-                if response and not isinstance(response, str):
-                    chunk["response"] = str(response)
-            
-            # Yield state updates
-            yield chunk
-            
-            # Update tracking
-            previous_outputs = current_outputs.copy()
-            previous_order = current_order.copy()
-
+        # Nodes stop at the deadline; the outer guard (as in process_query)
+        # ends the stream if one does not
+        guard = state["deadline"] + GRACE_SECONDS if state["deadline"] else None
+        started = time.monotonic()
+        metrics.add_gauge("queries.in_flight", 1)
+        
+        try:
+            while True:
+                try:
+                    mode, update = await within_deadline(stream.__anext__(), at=guard)
+                except StopAsyncIteration:
+                    break
+                if mode == "custom":
+                    if isinstance(update, dict) and update.get("summary_delta"):
+                        delta = {"summary_delta": update["summary_delta"]}
+                        if update.get("replace"):
+                            delta["replace"] = True
+                        yield delta
+                    continue
+                
+                changed = False
+                for node_update in update.values():
+                    changed = apply_update(state, node_update) or changed
+                
+                # Join steps (dispatch) carry no delta - nothing new to report
+                if not changed:
+                    continue
+                
+                # Yield a snapshot; reducers replace containers rather than mutate them
+                yield dict(state)
+        except (asyncio.CancelledError, GeneratorExit):
+            # Consumer went away (e.g. SSE client disconnected); stopping after
+            # the summary is a normal early exit, not wasted work
+            if not state.get("summary"):
+                self._record_cancelled(started)
+            raise
+        finally:
+            # Closing the graph stream cancels its in-flight node tasks, and
+            # with them their LLM and HTTP calls
+            await stream.aclose()
+            metrics.add_gauge("queries.in_flight", -1)
+            self.speculation.discard(state["run_id"])
+    
+    @staticmethod
+    def _record_cancelled(started: float) -> None:
+        """Count a run abandoned before it finished and the time spent on it."""
+        elapsed = time.monotonic() - started
+        print(f"[SUPERVISOR] Query cancelled after {elapsed:.2f}s")
+        metrics.incr("queries.cancelled")
+        metrics.incr("queries.cancelled_seconds", round(elapsed, 3))
@@ -7,6 +7,8 @@ import os
 import httpx
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from .http_client import http_post
+from .deadline import call_timeout
 
 load_dotenv()
 
@@ -42,10 +44,9 @@ class TelephoneAgent:
                 "message": message or "Call initiated by Telephone Agent"
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                result = response.json()
+            response = await http_post(url, json=payload, timeout=call_timeout(30.0))
+            response.raise_for_status()
+            result = response.json()
             
             return {
                 "success": True,
@@ -71,7 +72,8 @@ class TelephoneAgent:
                 "phone_number": phone_number
             }
     
-    def format_result(self, result: Dict[str, Any]) -> str:
+    @staticmethod
+    def format_result(result: Dict[str, Any]) -> str:
         """Format call result as a readable string."""
         if not result.get("success"):
             error_msg = result.get('error', 'Unknown error')
@@ -0,0 +1,172 @@
+"""
+Text Search Cache
+Places Text Search responses keyed by a canonical (query terms, location)
+pair, so "sushi restaurants near Taipei 101" and "Taipei 101 restaurant
+sushi" share one entry.
+
+Entries are served stale-while-revalidate: within the fresh lifetime a hit
+is returned as is; after it, the cached response is still returned
+immediately while a background request refreshes the entry.
+"""
+
+import os
+import re
+import time
+import asyncio
+import unicodedata
+from typing import Dict, Any, Optional, Callable, Awaitable, Set
+
+from .cache import TTLCache, create_backend
+from .deadline import use_deadline
+from .geocode_cache import normalize_address
+from .metrics import metrics
+
+
+# Words that do not change what is searched for
+STOPWORDS = {"a", "an", "the", "near", "nearby", "around", "in", "at", "by", "of", "for", "some", "me"}
+
+# Text Search statuses that are answers (others are errors and never cached)
+CACHEABLE_STATUSES = ("OK", "ZERO_RESULTS")
+
+_WORD = re.compile(r"\w+")
+
+
+def singular(word: str) -> str:
+    """
+    Stem shared by the singular and plural of an English noun, e.g.
+    "sandwiches" -> "sandwich", "cafes" -> "cafe". Words in -y and -ies both
+    become -ie ("bakery", "bakeries" -> "bakerie"; "cookies" -> "cookie"), so
+    the stem is not always a real word.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies"):
+        return word[:-1]
+    if word.endswith("y") and word[-2] not in "aeiou":
+        return word[:-1] + "ie"
+    if word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def canonical_terms(query: str) -> str:
+    """Case-folded, singular, de-duplicated and sorted query terms without stopwords."""
+    words = _WORD.findall(unicodedata.normalize("NFKC", query).casefold())
+    return " ".join(sorted({singular(w) for w in words if w not in STOPWORDS}))
+
+
+def search_key(query: str, location: Optional[str] = None, bias: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Cache key for a Text Search.
+
+    Args:
+        query: What is searched for (without the location)
+        location: Location string, normalized like geocode keys
+        bias: Extra request parameters that change results (location bias, radius)
+    """
+    bias = bias or {}
+    parts = [canonical_terms(query), normalize_address(location or "")]
+    parts += [f"{name}={bias[name]}" for name in sorted(bias) if bias[name] is not None]
+    return "|".join(parts)
+
+
+class TextSearchCache:
+    """
+    Stale-while-revalidate cache of Text Search responses.
+
+    Configuration (environment):
+        TEXT_SEARCH_CACHE_BACKEND: "sqlite" (default), "memory", or "off"
+        TEXT_SEARCH_CACHE_PATH: SQLite file (defaults to CACHE_SQLITE_PATH)
+        TEXT_SEARCH_CACHE_MAX_ENTRIES: size bound (default 2000)
+        TEXT_SEARCH_CACHE_TTL_SECONDS: fresh lifetime (default 900)
+        TEXT_SEARCH_CACHE_STALE_SECONDS: how long after that a stale entry is
+            still served while it is refreshed (default 86400)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        stale: Optional[float] = None
+    ):
+        backend = (backend or os.getenv("TEXT_SEARCH_CACHE_BACKEND", "sqlite")).lower()
+        self.enabled = backend != "off"
+        self.ttl = ttl or float(os.getenv("TEXT_SEARCH_CACHE_TTL_SECONDS", "900"))
+        self.stale = stale if stale is not None else float(os.getenv("TEXT_SEARCH_CACHE_STALE_SECONDS", "86400"))
+        self.cache: Optional[TTLCache] = None
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        if self.enabled:
+            self.cache = TTLCache(
+                "text_search",
+                backend=create_backend(backend, "text_search", path or os.getenv("TEXT_SEARCH_CACHE_PATH")),
+                max_entries=max_entries or int(os.getenv("TEXT_SEARCH_CACHE_MAX_ENTRIES", "2000")),
+                ttl=self.ttl + self.stale
+            )
+
+    async def lookup(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Text Search response for a key, from the cache or by calling `fetch`.
+
+        Args:
+            key: search_key() of the request
+            fetch: Coroutine returning the Text Search response (may raise)
+
+        Returns:
+            The response dict (check its status as for an uncached call)
+        """
+        if not self.enabled:
+            return await fetch()
+
+        entry = await self.cache.aget(key)
+        if entry is not None:
+            if time.time() - entry["fetched_at"] < self.ttl:
+                metrics.incr("text_search.fresh_hits")
+            else:
+                metrics.incr("text_search.stale_hits")
+                self._revalidate(key, fetch)
+            return entry["data"]
+
+        data = await fetch()
+        await self._store(key, data)
+        return data
+
+    async def _store(self, key: str, data: Dict[str, Any]) -> None:
+        if data.get("status") in CACHEABLE_STATUSES:
+            await self.cache.aset(key, {"data": data, "fetched_at": time.time()})
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        """Refresh an entry in the background (once per key at a time)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        # The task inherited the request's context; the refresh must outlive its deadline
+        use_deadline(None)
+        try:
+            await self._store(key, await fetch())
+            metrics.incr("text_search.refreshes")
+        except Exception as e:
+            metrics.incr("text_search.refresh_failures")
+            print(f"[TextSearchCache] Refresh failed for '{key}': {type(e).__name__} {e}")
+        finally:
+            self._refreshing.discard(key)
+
+
+_shared: Optional[TextSearchCache] = None
+
+
+def get_text_search_cache() -> TextSearchCache:
+    """Process-wide text search cache, created on first use."""
+    global _shared
+    if _shared is None:
+        _shared = TextSearchCache()
+    return _shared
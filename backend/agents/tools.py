@@ -8,6 +8,16 @@ import httpx
 from typing import Optional, Dict, Any
 from langchain.tools import tool
 from dotenv import load_dotenv
+from .research_agent import research_llm
+from .http_client import http_post
+from .places import (
+    place_result, fetch_details, geocode_location, request_text_search, request_place_details, text_search_request
+)
+from .text_search_cache import get_text_search_cache
+from .place_details_cache import get_place_details_cache
+from .place_index import get_place_index
+from .ranking import rank_places, ranking_fields
+from .deadline import call_timeout, within_deadline
 
 load_dotenv()
 
@@ -37,25 +47,25 @@ async def search_nearby_places(
         if not api_key:
             return '{"success": false, "error": "GOOGLE_MAPS_API_KEY not found"}'
         
-        base_url = "https://maps.googleapis.com/maps/api/place"
+        # Answer from the local index if this area was searched recently
+        coordinates = await geocode_location(location, api_key) if location else None
+        if coordinates:
+            indexed = get_place_index().search(query, coordinates["lat"], coordinates["lng"], radius, max_results)
+            if indexed is not None:
+                import json
+                return json.dumps({
+                    "success": True,
+                    "query": query,
+                    "location": location,
+                    "results": indexed,
+                    "count": len(indexed),
+                    "partial": False,
+                    "source": "index"
+                })
         
-        # Build search query
-        if location:
-            search_query = f"{query} near {location}"
-        else:
-            search_query = query
-        
-        # Use Text Search API
-        url = f"{base_url}/textsearch/json"
-        params = {
-            "query": search_query,
-            "key": api_key
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
+        # Use Text Search API, biased towards the location (repeated searches are served from the cache)
+        params, key = text_search_request(query, location, api_key, coordinates, radius)
+        data = await get_text_search_cache().lookup(key, lambda: request_text_search(params))
         
         if data.get("status") != "OK":
             error_msg = data.get("error_message", "")
@@ -63,27 +73,19 @@ async def search_nearby_places(
             import json
             return json.dumps({"success": False, "error": f"API Error: {status} - {error_msg}"})
         
-        # Process results
+        # Process results; details are looked up concurrently
         places = data.get("results", [])[:max_results]
-        results = []
-        
-        for place in places:
-            place_id = place.get("place_id")
-            place_details = await _get_place_details(place_id, api_key) if place_id else {}
-            
-            result = {
-                "name": place.get("name", "Unknown"),
-                "address": place.get("formatted_address", place.get("vicinity", "N/A")),
-                "rating": place.get("rating", "N/A"),
-                "phone_number": place_details.get("formatted_phone_number", "N/A"),
-                "location": {
-                    "lat": place.get("geometry", {}).get("location", {}).get("lat"),
-                    "lng": place.get("geometry", {}).get("location", {}).get("lng")
-                },
-                "types": place.get("types", []),
-                "place_id": place_id
-            }
-            results.append(result)
+        if coordinates:
+            # Rank every candidate around the origin, then look up details for the top ones
+            places = rank_places(data.get("results", []), coordinates["lat"], coordinates["lng"], radius, max_results, query)
+        details, failed = await fetch_details(places, lambda place_id: _get_place_details(place_id, api_key))
+        results = [place_result(place, place_details) for place, place_details in zip(places, details)]
+        if coordinates and not failed:
+            get_place_index().add(
+                query, coordinates["lat"], coordinates["lng"], results,
+                complete=len(data.get("results", [])) < max_results,
+                ranking=ranking_fields(places, data.get("results", []))
+            )
         
         import json
         return json.dumps({
@@ -91,7 +93,8 @@ async def search_nearby_places(
             "query": query,
             "location": location,
             "results": results,
-            "count": len(results)
+            "count": len(results),
+            "partial": failed > 0
         })
         
     except Exception as e:
@@ -100,26 +103,14 @@ async def search_nearby_places(
 
 
 async def _get_place_details(place_id: str, api_key: str) -> Dict[str, Any]:
-    """Get detailed information about a place."""
-    try:
-        base_url = "https://maps.googleapis.com/maps/api/place"
-        url = f"{base_url}/details/json"
-        params = {
-            "place_id": place_id,
-            "fields": "formatted_phone_number,opening_hours,website",
-            "key": api_key
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-        
-        if data.get("status") == "OK":
-            return data.get("result", {})
-        return {}
-    except Exception:
-        return {}
+    """
+    Get detailed information about a place (cached per field, see place_details_cache).
+    
+    Raises on transport errors; fetch_details turns those into partial results.
+    """
+    return await get_place_details_cache().lookup(
+        place_id, lambda fields: request_place_details(place_id, api_key, fields)
+    )
 
 
 # Calendar Agent Tools
@@ -248,10 +239,9 @@ async def make_phone_call(
             "message": message or "Call initiated by Telephone Agent"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            result = response.json()
+        response = await http_post(url, json=payload, timeout=call_timeout(30.0))
+        response.raise_for_status()
+        result = response.json()
         
         import json
         return json.dumps({
@@ -295,32 +285,17 @@ async def research_query(query: str, context: Optional[str] = None) -> str:
         JSON string with research results
     """
     try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        from langchain_core.prompts import ChatPromptTemplate
-        
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if not os.getenv("GEMINI_API_KEY"):
             import json
             return json.dumps({"success": False, "error": "GEMINI_API_KEY not found"})
         
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=0.7
-        )
-        
-        prompt_template = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful research assistant. Provide accurate, concise, and well-structured information."),
-            ("human", "{query}")
-        ])
-        
         if context:
             full_query = f"{query}\n\nContext: {context}"
         else:
             full_query = query
         
-        chain = prompt_template | llm
-        response = await chain.ainvoke({"query": full_query})
+        # Shared hedged chain; no per-call construction
+        response = await within_deadline(research_llm().ainvoke({"query": full_query}))
         
         import json
         return json.dumps({
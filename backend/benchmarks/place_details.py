@@ -0,0 +1,114 @@
+"""
+Place-details enrichment benchmark.
+
+Runs search_nearby_places against a local stand-in Places server with a
+fixed per-request latency, once with serial detail lookups
+(PLACE_DETAILS_CONCURRENCY=1) and once concurrent, for growing max_results.
+
+Usage (from backend/):
+    python benchmarks/place_details.py [--latency-ms 80] [--rounds 3]
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quart import Quart, request  # noqa: E402
+from hypercorn.asyncio import serve  # noqa: E402
+from hypercorn.config import Config  # noqa: E402
+
+
+def stand_in_places_app(latency: float) -> Quart:
+    """Minimal Text Search / Place Details API with injected latency."""
+    app = Quart(__name__)
+
+    @app.route("/maps/api/place/textsearch/json")
+    async def text_search():
+        await asyncio.sleep(latency)
+        return {
+            "status": "OK",
+            "results": [
+                {
+                    "name": f"Place {i}",
+                    "formatted_address": f"{i} Benchmark Road",
+                    "rating": 4.0,
+                    "place_id": f"place-{i}",
+                    "geometry": {"location": {"lat": 25.03 + i / 1000, "lng": 121.56 + i / 1000}},
+                    "types": ["restaurant"]
+                }
+                for i in range(20)
+            ]
+        }
+
+    @app.route("/maps/api/place/details/json")
+    async def details():
+        await asyncio.sleep(latency)
+        place_id = request.args.get("place_id", "")
+        return {"status": "OK", "result": {"formatted_phone_number": f"02 0000 {place_id[-2:]}"}}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run(latency_ms: float, rounds: int, sizes):
+    port = free_port()
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.accesslog = None
+    config.errorlog = None
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(serve(stand_in_places_app(latency_ms / 1000.0), config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    os.environ["GOOGLE_MAPS_API_BASE_URL"] = f"http://127.0.0.1:{port}/maps/api"
+    os.environ.setdefault("GOOGLE_MAPS_API_KEY", "benchmark")
+    from agents.tools import search_nearby_places
+    from agents import http_client
+
+    print(f"Stand-in latency {latency_ms:.0f} ms per request, best of {rounds}")
+    print(f"{'max_results':>11} {'serial (ms)':>12} {'concurrent (ms)':>16} {'speedup':>8}")
+    try:
+        for size in sizes:
+            timings = {}
+            for label, concurrency in (("serial", "1"), ("concurrent", os.getenv("PLACE_DETAILS_CONCURRENCY", "5"))):
+                previous = os.environ.get("PLACE_DETAILS_CONCURRENCY")
+                os.environ["PLACE_DETAILS_CONCURRENCY"] = concurrency
+                samples = []
+                for _ in range(rounds):
+                    started = time.perf_counter()
+                    await search_nearby_places.ainvoke({"query": "sushi", "location": "Taipei 101", "max_results": size})
+                    samples.append((time.perf_counter() - started) * 1000)
+                timings[label] = min(samples)
+                if previous is None:
+                    del os.environ["PLACE_DETAILS_CONCURRENCY"]
+                else:
+                    os.environ["PLACE_DETAILS_CONCURRENCY"] = previous
+            speedup = timings["serial"] / timings["concurrent"] if timings["concurrent"] else float("nan")
+            print(f"{size:>11} {timings['serial']:>12.0f} {timings['concurrent']:>16.0f} {speedup:>7.1f}x")
+    finally:
+        await http_client.shutdown()
+        shutdown.set()
+        await server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="stand-in latency per request")
+    parser.add_argument("--rounds", type=int, default=3, help="runs per configuration (best is reported)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 3, 5, 10, 20], help="max_results values")
+    args = parser.parse_args()
+    asyncio.run(run(args.latency_ms, args.rounds, args.sizes))
+
+
+if __name__ == "__main__":
+    main()
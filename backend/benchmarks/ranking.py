@@ -0,0 +1,106 @@
+"""
+Place ranking microbenchmark.
+
+Scores and sorts synthetic Text Search candidates scattered around an
+origin, comparing agents.ranking (NumPy, all candidates at once) with the
+same score computed one candidate at a time in plain Python. The "arrays"
+column times scoring and selection alone, without reading the fields out
+of the result dicts.
+
+Usage (from backend/):
+    python benchmarks/ranking.py [--sizes 20 1000 5000 20000] [--repeat 20]
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.ranking import candidate_arrays, score_arrays, score_places, rank_places, ranking_weights  # noqa: E402
+from agents.place_index import haversine_m  # noqa: E402
+
+ORIGIN = (25.0339, 121.5645)
+RADIUS = 5000.0
+
+
+def candidates(n: int, seed: int = 7):
+    """n places within about 10 km of the origin, some without rating or open-now."""
+    rng = random.Random(seed)
+    places = []
+    for i in range(n):
+        place = {
+            "place_id": f"place-{i}",
+            "geometry": {"location": {
+                "lat": ORIGIN[0] + rng.uniform(-0.09, 0.09),
+                "lng": ORIGIN[1] + rng.uniform(-0.1, 0.1)
+            }}
+        }
+        if rng.random() < 0.9:
+            place["rating"] = round(rng.uniform(2.5, 5.0), 1)
+        if rng.random() < 0.8:
+            place["opening_hours"] = {"open_now": rng.random() < 0.7}
+        places.append(place)
+    return places
+
+
+def rank_python(places, max_results: int):
+    """Reference implementation: the same score, one candidate at a time."""
+    weights = ranking_weights()
+    n = len(places)
+    scored = []
+    for i, place in enumerate(places):
+        location = place["geometry"]["location"]
+        distance = haversine_m(ORIGIN[0], ORIGIN[1], location["lat"], location["lng"])
+        is_open = place.get("opening_hours", {}).get("open_now")
+        score = (
+            weights["distance"] * (1.0 - min(distance / RADIUS, 1.0))
+            + weights["rating"] * min(max(place.get("rating", 3.0) / 5.0, 0.0), 1.0)
+            + weights["open_now"] * (0.5 if is_open is None else float(is_open))
+            + weights["relevance"] * (1.0 - i / max(n - 1, 1))
+        )
+        scored.append((-score, i))
+    scored.sort()
+    return [places[i] for _, i in scored[:max_results]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1000, 5000, 20000], help="candidate counts")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per size (best is reported)")
+    parser.add_argument("--max-results", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'candidates':>10} {'numpy (ms)':>11} {'arrays (ms)':>12} {'python (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        places = candidates(size)
+        # Both must agree before timing means anything
+        scores = score_places(places, ORIGIN[0], ORIGIN[1], RADIUS)
+        expected = rank_python(places, args.max_results)
+        ranked = rank_places(places, ORIGIN[0], ORIGIN[1], RADIUS, args.max_results)
+        assert [p["place_id"] for p in ranked] == [p["place_id"] for p in expected], "rankings differ"
+        assert not math.isnan(float(scores.sum()))
+
+        numpy_ms = min(timeit.repeat(
+            lambda: rank_places(places, ORIGIN[0], ORIGIN[1], RADIUS, args.max_results),
+            number=1, repeat=args.repeat
+        )) * 1000
+        arrays = candidate_arrays(places)
+        arrays_ms = min(timeit.repeat(
+            lambda: np.argsort(-score_arrays(arrays, ORIGIN[0], ORIGIN[1], RADIUS), kind="stable")[:args.max_results],
+            number=1, repeat=args.repeat
+        )) * 1000
+        python_ms = min(timeit.repeat(
+            lambda: rank_python(places, args.max_results),
+            number=1, repeat=args.repeat
+        )) * 1000
+        print(f"{size:>10} {numpy_ms:>11.3f} {arrays_ms:>12.3f} {python_ms:>12.3f} {python_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Blueprints for organizing API routes.
 
 from .query import query_bp
 from .health import health_bp
+from .jobs import jobs_bp
 
-__all__ = ["query_bp", "health_bp"]
+__all__ = ["query_bp", "health_bp", "jobs_bp"]
 
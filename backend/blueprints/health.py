@@ -3,6 +3,7 @@ Health check blueprint.
 """
 
 from quart import Blueprint
+from agents.metrics import metrics
 
 health_bp = Blueprint("health", __name__)
 
@@ -22,3 +23,8 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+@health_bp.route("/metrics", methods=["GET"])
+async def metrics_snapshot():
+    """Pipeline metrics (counters, gauges and derived stats such as hit rates)."""
+    return metrics.snapshot()
@@ -0,0 +1,113 @@
+"""
+Asynchronous job blueprint.
+Submit a query, then poll for its result or follow its event stream.
+"""
+
+import json
+from quart import Blueprint, request, Response
+from pydantic import BaseModel, ValidationError
+from typing import Optional
+from agents.jobs import JobManager, Job, QueueFull, DEFAULT_PRIORITY
+from blueprints.query import query_events
+
+jobs_bp = Blueprint("jobs", __name__)
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_SECONDS = 15.0
+
+
+def run_job(job: Job):
+    """Event source for a job: the same events as a streaming /query."""
+    return query_events(job.query, job.deadline_seconds)
+
+
+# Worker pool; started and stopped with the app (see main.py)
+job_manager = JobManager(run_job)
+
+
+class JobRequest(BaseModel):
+    query: str
+    # Lower runs first
+    priority: Optional[int] = DEFAULT_PRIORITY
+    # Time budget for the run in milliseconds
+    deadline_ms: Optional[int] = None
+
+
+@jobs_bp.route("/jobs", methods=["POST"])
+async def submit_job():
+    """Queue a query and return its job ID immediately."""
+    data = await request.get_json()
+    if not data:
+        return {"error": "No JSON data provided"}, 400
+
+    try:
+        job_request = JobRequest(**data)
+    except ValidationError as e:
+        return {"error": "Invalid request", "details": str(e)}, 400
+
+    deadline_seconds = job_request.deadline_ms / 1000.0 if job_request.deadline_ms and job_request.deadline_ms > 0 else None
+    try:
+        job = job_manager.submit(job_request.query, job_request.priority, deadline_seconds)
+    except QueueFull as e:
+        return {"error": str(e)}, 503
+    except RuntimeError as e:
+        return {"error": str(e)}, 503
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "links": {
+            "status": f"/jobs/{job.id}",
+            "events": f"/jobs/{job.id}/events"
+        }
+    }, 202, {"Location": f"/jobs/{job.id}"}
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["GET"])
+async def get_job(job_id: str):
+    """Job status, queue position while waiting, and the result once finished."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return {"error": "Job not found"}, 404
+
+    data = job.to_dict()
+    data["position"] = job_manager.position(job)
+    return data
+
+
+@jobs_bp.route("/jobs/<job_id>/events", methods=["GET"])
+async def job_events(job_id: str):
+    """
+    Server-sent events for a job, replayed from the start and then live.
+
+    Each event carries its index as the SSE id; reconnecting clients resume
+    with the Last-Event-ID header (or ?after=<id>) and only get newer events.
+    The stream ends after the job's final event.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return {"error": "Job not found"}, 404
+
+    last_id = request.headers.get("Last-Event-ID", request.args.get("after", ""))
+    start = int(last_id) + 1 if last_id.strip().lstrip("-").isdigit() else 0
+
+    async def stream():
+        index = max(start, 0)
+        while True:
+            while index < len(job.events):
+                yield f"id: {index}\ndata: {json.dumps(job.events[index])}\n\n"
+                index += 1
+            if job.finished:
+                return
+            if not await job.wait(KEEPALIVE_SECONDS):
+                yield ": keep-alive\n\n"
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
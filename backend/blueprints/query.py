@@ -2,34 +2,160 @@
 Query processing blueprint.
 """
 
+import os
 import json
+import asyncio
+from contextlib import aclosing
 from quart import Blueprint, request, Response
 from pydantic import BaseModel, ValidationError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from agents.supervisor_langgraph import SupervisorAgentLangGraph
+from agents.deadline import DeadlineExceeded
+from agents.coalescing import QueryCoalescer, has_side_effects
+from agents.response_cache import ResponseCache, last_state
 
 query_bp = Blueprint("query", __name__)
 
 # Initialize supervisor (will be set by app)
 supervisor: Optional[SupervisorAgentLangGraph] = None
 
+# Shares runs between concurrent identical queries
+coalescer: Optional[QueryCoalescer] = None
+
+# Finished read-only runs, replayed on repeat queries
+response_cache: Optional[ResponseCache] = None
+
 
 def set_supervisor(sup: SupervisorAgentLangGraph):
     """Set the supervisor instance."""
-    global supervisor
+    global supervisor, coalescer, response_cache
     supervisor = sup
+    coalescer = QueryCoalescer(sup)
+    response_cache = ResponseCache()
+
+
+def cache_status(hit: bool, plan: Optional[Dict[str, Any]]) -> str:
+    """Response cache outcome reported to clients: hit, miss, or bypass."""
+    if hit:
+        return "hit"
+    if not response_cache.enabled or has_side_effects(plan or {}):
+        return "bypass"
+    return "miss"
+
+
+class BatchQueryRequest(BaseModel):
+    queries: List[str]
+    # Queries run at once (capped by BATCH_MAX_CONCURRENCY)
+    concurrency: Optional[int] = None
+    # Time budget per query in milliseconds
+    deadline_ms: Optional[int] = None
 
 
 class QueryRequest(BaseModel):
     query: str
     stream: Optional[bool] = False
+    # Client time budget in milliseconds (capped by REQUEST_DEADLINE_SECONDS)
+    deadline_ms: Optional[int] = None
+
+
+def request_deadline_seconds(query_request: QueryRequest) -> Optional[float]:
+    """
+    Time budget asked for by the client, from the body or X-Request-Deadline-Ms.
+    
+    Returns:
+        Seconds, or None to use the server default
+    """
+    deadline_ms = query_request.deadline_ms
+    if deadline_ms is None:
+        header = request.headers.get("X-Request-Deadline-Ms")
+        if header and header.strip().isdigit():
+            deadline_ms = int(header.strip())
+    if not deadline_ms or deadline_ms <= 0:
+        return None
+    return deadline_ms / 1000.0
 
 
-async def stream_query_processing(query: str):
-    """Stream query processing results from LangGraph supervisor with detailed task execution."""
+def format_query_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a process_query result for the frontend."""
+    # Format response
+    response_text = result.get("response", result.get("summary", "Processing complete"))
+    
+    # Format agent outputs for frontend
+    agent_outputs = {}
+    for agent_name, agent_result in result.get("agent_outputs", {}).items():
+        if isinstance(agent_result, dict):
+            agent_outputs[agent_name] = agent_result.get("formatted", str(agent_result))
+        else:
+            agent_outputs[agent_name] = str(agent_result)
+    
+    # Add supervisor message
+    agent_outputs["supervisor"] = result.get("supervisor", "Query processed")
+    
+    return {
+        "response": response_text,
+        "agent_outputs": agent_outputs,
+        "message": "Query processed successfully"
+    }
+
+
+async def stream_query_batch(queries: List[str], concurrency: int, deadline_ms: Optional[int] = None):
+    """
+    Run queries with bounded concurrency and yield NDJSON lines as they finish.
+    
+    Identical queries (after trimming whitespace) share one execution; every
+    index still gets its own line. Unfinished queries are cancelled if the
+    client disconnects.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    deadline_seconds = deadline_ms / 1000.0 if deadline_ms and deadline_ms > 0 else None
+    
+    # Unique query -> indexes that asked for it
+    indexes: Dict[str, List[int]] = {}
+    for index, query in enumerate(queries):
+        indexes.setdefault(query.strip(), []).append(index)
+    
+    async def run_one(query: str) -> Tuple[str, Dict[str, Any]]:
+        async with semaphore:
+            try:
+                result = await supervisor.process_query(query, deadline_seconds=deadline_seconds)
+                return query, format_query_result(result)
+            except DeadlineExceeded:
+                return query, {"error": "Request deadline exceeded"}
+            except Exception as e:
+                return query, {"error": f"Error processing query: {str(e)}"}
+    
+    tasks = [asyncio.ensure_future(run_one(query)) for query in indexes if query]
+    try:
+        # Blank queries fail immediately
+        for index in indexes.get("", []):
+            yield json.dumps({"index": index, "query": queries[index], "error": "Empty query"}) + "\n"
+        
+        for next_done in asyncio.as_completed(tasks):
+            query, outcome = await next_done
+            for index in indexes[query]:
+                yield json.dumps({"index": index, "query": queries[index], **outcome}) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def query_events(query: str, deadline_seconds: Optional[float] = None):
+    """
+    Run a query and yield the task / agent_output / summary_delta / complete
+    (or error) events shown by the frontend, as dicts.
+    
+    Closing this generator closes the supervisor stream, which cancels the
+    graph run.
+    """
+    cached = await response_cache.aget(query)
+    if cached is not None:
+        # Replay the stored run; the events are the same as a live one
+        stream = response_cache.replay(cached)
+    else:
+        stream = response_cache.record(query, coalescer.stream(query, deadline_seconds=deadline_seconds))
     try:
         # Send initial status
-        yield f"data: {json.dumps({'type': 'task', 'status': 'started', 'message': 'Initializing Supervisor Agent...', 'agent': 'supervisor'})}\n\n"
+        yield {'type': 'task', 'status': 'started', 'message': 'Initializing Supervisor Agent...', 'agent': 'supervisor'}
         
         # Track which agents have been processed
         processed_agents = set()
@@ -38,142 +164,183 @@ async def stream_query_processing(query: str):
         # Track if we've seen the summarize node
         summary_sent = False
         
+        # Whether summary tokens have started streaming
+        summary_started = False
+        
+        # The plan stays in every state chunk (including parallel dispatch steps); announce it once
+        plan_sent = False
+        
+        # Agent outputs of the latest chunk (kept for the fallback summary)
+        agent_outputs = {}
+        deadline_hit = False
+        
         # Stream from LangGraph
-        async for chunk in supervisor.stream_query(query):
-            agent_outputs = chunk.get("agent_outputs", {})
-            execution_order = chunk.get("execution_order", [])
-            
-            # Handle plan node - Show detailed planning steps
-            if "plan" in chunk and chunk.get("plan"):
-                plan = chunk.get("plan", {})
-                yield f"data: {json.dumps({'type': 'task', 'status': 'executing', 'message': 'Analyzing user query and creating execution plan...', 'agent': 'supervisor'})}\n\n"
+        try:
+            async for chunk in stream:
+                # Summary tokens as they are generated; the full summary still
+                # arrives in the final "complete" event
+                if "summary_delta" in chunk:
+                    if not summary_started:
+                        summary_started = True
+                        yield {'type': 'task', 'status': 'executing', 'message': 'Generating final summary from all agent results...', 'agent': 'supervisor'}
+                    # "replace" drops the text streamed so far (the template after a deadline)
+                    yield {'type': 'summary_delta', 'delta': chunk['summary_delta'], 'replace': bool(chunk.get('replace')), 'agent': 'supervisor'}
+                    continue
                 
-                # Show detailed planning steps
-                tasks_to_execute = []
-                if plan.get("use_googlemap"):
-                    tasks_to_execute.append("🗺️ Search for locations using GoogleMap Agent")
-                    yield f"data: {json.dumps({'type': 'task', 'status': 'planned', 'message': 'Task planned: Search for locations using GoogleMap Agent', 'agent': 'googleMap'})}\n\n"
-                if plan.get("use_research"):
-                    tasks_to_execute.append("🔍 Perform research using Research Agent")
-                    yield f"data: {json.dumps({'type': 'task', 'status': 'planned', 'message': 'Task planned: Perform research using Research Agent', 'agent': 'research'})}\n\n"
-                if plan.get("use_calendar"):
-                    tasks_to_execute.append("📅 Manage calendar events using Calendar Agent")
-                    yield f"data: {json.dumps({'type': 'task', 'status': 'planned', 'message': 'Task planned: Manage calendar events using Calendar Agent', 'agent': 'calendar'})}\n\n"
-                if plan.get("use_telephone"):
-                    tasks_to_execute.append("☎️ Make phone call using Telephone Agent")
-                    yield f"data: {json.dumps({'type': 'task', 'status': 'planned', 'message': 'Task planned: Make phone call using Telephone Agent', 'agent': 'telephone'})}\n\n"
+                agent_outputs = chunk.get("agent_outputs", {})
+                execution_order = chunk.get("execution_order", [])
                 
-                yield f"data: {json.dumps({'type': 'task', 'status': 'completed', 'message': f'Execution plan created. {len(tasks_to_execute)} task(s) scheduled.', 'agent': 'supervisor'})}\n\n"
-            
-            # Check for new agent outputs - Show detailed execution steps
-            for agent_name in ["googleMap", "research", "telephone", "calendar"]:
-                if agent_name in agent_outputs and agent_name not in processed_agents:
-                    output = agent_outputs[agent_name]
-                    processed_agents.add(agent_name)
+                # Handle plan node - Show detailed planning steps
+                if "plan" in chunk and chunk.get("plan") and not plan_sent:
+                    plan_sent = True
+                    plan = chunk.get("plan", {})
+                    yield {'type': 'task', 'status': 'executing', 'message': 'Analyzing user query and creating execution plan...', 'agent': 'supervisor'}
                     
-                    # Send detailed task execution steps
-                    agent_tasks = {
-                        "googleMap": [
-                            "Executing GoogleMap Agent...",
-                            "Calling search_nearby_places tool...",
-                            "Processing location data...",
-                            "Formatting results..."
-                        ],
-                        "research": [
-                            "Executing Research Agent...",
-                            "Analyzing query...",
-                            "Generating research response..."
-                        ],
-                        "calendar": [
-                            "Executing Calendar Agent...",
-                            "Extracting event information...",
-                            "Calling add_calendar_event tool...",
-                            "Creating calendar event..."
-                        ],
-                        "telephone": [
-                            "Executing Telephone Agent...",
-                            "Extracting phone number...",
-                            "Calling make_phone_call tool...",
-                            "Initiating call via Fonoster..."
-                        ]
-                    }
+                    # Show detailed planning steps
+                    tasks_to_execute = []
+                    if plan.get("use_googlemap"):
+                        tasks_to_execute.append("🗺️ Search for locations using GoogleMap Agent")
+                        yield {'type': 'task', 'status': 'planned', 'message': 'Task planned: Search for locations using GoogleMap Agent', 'agent': 'googleMap'}
+                    if plan.get("use_research"):
+                        tasks_to_execute.append("🔍 Perform research using Research Agent")
+                        yield {'type': 'task', 'status': 'planned', 'message': 'Task planned: Perform research using Research Agent', 'agent': 'research'}
+                    if plan.get("use_calendar"):
+                        tasks_to_execute.append("📅 Manage calendar events using Calendar Agent")
+                        yield {'type': 'task', 'status': 'planned', 'message': 'Task planned: Manage calendar events using Calendar Agent', 'agent': 'calendar'}
+                    if plan.get("use_telephone"):
+                        tasks_to_execute.append("☎️ Make phone call using Telephone Agent")
+                        yield {'type': 'task', 'status': 'planned', 'message': 'Task planned: Make phone call using Telephone Agent', 'agent': 'telephone'}
                     
-                    # Send status message (skip for research if it was skipped)
-                    if isinstance(output, dict) and output.get("skipped"):
-                        # Research agent was skipped - just send the output
-                        formatted = output.get("formatted", str(output))
-                        yield f"data: {json.dumps({'type': 'task', 'status': 'skipped', 'message': f'{agent_name} Agent: Not needed for this query', 'agent': agent_name})}\n\n"
-                        yield f"data: {json.dumps({'type': 'agent_output', 'agent': agent_name, 'output': formatted})}\n\n"
-                    else:
-                        # Active agent - send detailed task steps
-                        tasks = agent_tasks.get(agent_name, ["Processing..."])
-                        for i, task_msg in enumerate(tasks):
-                            if i < len(tasks) - 1:
-                                yield f"data: {json.dumps({'type': 'task', 'status': 'executing', 'message': task_msg, 'agent': agent_name})}\n\n"
-                            else:
-                                yield f"data: {json.dumps({'type': 'task', 'status': 'completed', 'message': task_msg, 'agent': agent_name})}\n\n"
+                    yield {'type': 'task', 'status': 'completed', 'message': f'Execution plan created. {len(tasks_to_execute)} task(s) scheduled.', 'agent': 'supervisor'}
+                
+                # Check for new agent outputs - Show detailed execution steps
+                for agent_name in ["googleMap", "research", "telephone", "calendar"]:
+                    if agent_name in agent_outputs and agent_name not in processed_agents:
+                        output = agent_outputs[agent_name]
+                        processed_agents.add(agent_name)
+                        
+                        # Send detailed task execution steps
+                        agent_tasks = {
+                            "googleMap": [
+                                "Executing GoogleMap Agent...",
+                                "Calling search_nearby_places tool...",
+                                "Processing location data...",
+                                "Formatting results..."
+                            ],
+                            "research": [
+                                "Executing Research Agent...",
+                                "Analyzing query...",
+                                "Generating research response..."
+                            ],
+                            "calendar": [
+                                "Executing Calendar Agent...",
+                                "Extracting event information...",
+                                "Calling add_calendar_event tool...",
+                                "Creating calendar event..."
+                            ],
+                            "telephone": [
+                                "Executing Telephone Agent...",
+                                "Extracting phone number...",
+                                "Calling make_phone_call tool...",
+                                "Initiating call via Fonoster..."
+                            ]
+                        }
                         
-                        # Send agent output
-                        if isinstance(output, dict):
+                        # Send status message (skip for research if it was skipped)
+                        if isinstance(output, dict) and output.get("skipped"):
+                            # Research agent was skipped - just send the output
                             formatted = output.get("formatted", str(output))
+                            yield {'type': 'task', 'status': 'skipped', 'message': f'{agent_name} Agent: Not needed for this query', 'agent': agent_name}
+                            yield {'type': 'agent_output', 'agent': agent_name, 'output': formatted}
                         else:
-                            formatted = str(output)
-                        yield f"data: {json.dumps({'type': 'agent_output', 'agent': agent_name, 'output': formatted})}\n\n"
-            
-            # Check for summary - improved detection (check multiple fields and ensure it's a string)
-            summary_text = None
-            if "summary" in chunk:
-                summary_text = chunk.get("summary")
-                if summary_text and not isinstance(summary_text, str):
-                    summary_text = str(summary_text)
-                # Debug logging
-                if summary_text:
-                    print(f"\n[STREAM] Found summary in chunk: {summary_text[:100]}...")
-            elif "response" in chunk:
-                summary_text = chunk.get("response")
-                if summary_text and not isinstance(summary_text, str):
-                    summary_text = str(summary_text)
-                # Debug logging
-                if summary_text:
-                    print(f"\n[STREAM] Found response in chunk: {summary_text[:100]}...")
-            
-            # Debug: log chunk keys
-            if not summary_sent:
-                chunk_keys = list(chunk.keys())
-                print(f"[STREAM] Chunk keys: {chunk_keys}")
-                if "summary" in chunk or "response" in chunk:
-                    print(f"[STREAM] Summary value: {chunk.get('summary', chunk.get('response', 'None'))[:100]}")
-            
-            # Check if summary exists and is not empty
-            if summary_text and summary_text.strip() and not summary_sent:
-                summary_sent = True
-                summary_text = summary_text.strip()
-                
-                yield f"data: {json.dumps({'type': 'task', 'status': 'executing', 'message': 'Generating final summary from all agent results...', 'agent': 'supervisor'})}\n\n"
+                            # Active agent - send detailed task steps
+                            tasks = agent_tasks.get(agent_name, ["Processing..."])
+                            for i, task_msg in enumerate(tasks):
+                                if i < len(tasks) - 1:
+                                    yield {'type': 'task', 'status': 'executing', 'message': task_msg, 'agent': agent_name}
+                                else:
+                                    yield {'type': 'task', 'status': 'completed', 'message': task_msg, 'agent': agent_name}
+                            
+                            # Send agent output
+                            if isinstance(output, dict):
+                                formatted = output.get("formatted", str(output))
+                            else:
+                                formatted = str(output)
+                            yield {'type': 'agent_output', 'agent': agent_name, 'output': formatted}
                 
-                # Format agent outputs for final response
-                final_agent_outputs = {}
-                for agent_name, agent_result in agent_outputs.items():
-                    if isinstance(agent_result, dict):
-                        final_agent_outputs[agent_name] = agent_result.get("formatted", str(agent_result))
-                    else:
-                        final_agent_outputs[agent_name] = str(agent_result)
+                # Check for summary - improved detection (check multiple fields and ensure it's a string)
+                summary_text = None
+                if "summary" in chunk:
+                    summary_text = chunk.get("summary")
+                    if summary_text and not isinstance(summary_text, str):
+                        summary_text = str(summary_text)
+                    # Debug logging
+                    if summary_text:
+                        print(f"\n[STREAM] Found summary in chunk: {summary_text[:100]}...")
+                elif "response" in chunk:
+                    summary_text = chunk.get("response")
+                    if summary_text and not isinstance(summary_text, str):
+                        summary_text = str(summary_text)
+                    # Debug logging
+                    if summary_text:
+                        print(f"\n[STREAM] Found response in chunk: {summary_text[:100]}...")
                 
-                # Ensure supervisor is set with the summary
-                final_agent_outputs["supervisor"] = summary_text
+                # Debug: log chunk keys
+                if not summary_sent:
+                    chunk_keys = list(chunk.keys())
+                    print(f"[STREAM] Chunk keys: {chunk_keys}")
+                    if "summary" in chunk or "response" in chunk:
+                        print(f"[STREAM] Summary value: {chunk.get('summary', chunk.get('response', 'None'))[:100]}")
                 
-                final_response = {
-                    "type": "complete",
-                    "response": summary_text,
-                    "agent_outputs": final_agent_outputs,
-                    "message": "Query processed successfully"
-                }
-                yield f"data: {json.dumps(final_response)}\n\n"
-                break  # Exit loop after summary
+                # Check if summary exists and is not empty
+                if summary_text and summary_text.strip() and not summary_sent:
+                    summary_sent = True
+                    summary_text = summary_text.strip()
+                    
+                    if not summary_started:
+                        yield {'type': 'task', 'status': 'executing', 'message': 'Generating final summary from all agent results...', 'agent': 'supervisor'}
+                    
+                    # Format agent outputs for final response
+                    final_agent_outputs = {}
+                    for agent_name, agent_result in agent_outputs.items():
+                        if isinstance(agent_result, dict):
+                            final_agent_outputs[agent_name] = agent_result.get("formatted", str(agent_result))
+                        else:
+                            final_agent_outputs[agent_name] = str(agent_result)
+                    
+                    # Ensure supervisor is set with the summary
+                    final_agent_outputs["supervisor"] = summary_text
+                    
+                    final_response = {
+                        "type": "complete",
+                        "response": summary_text,
+                        "agent_outputs": final_agent_outputs,
+                        "message": "Query processed successfully",
+                        "cache": cache_status(cached is not None, chunk.get("plan"))
+                    }
+                    yield final_response
+                    break  # Exit loop after summary
+        except DeadlineExceeded:
+            # The run overran its deadline plus grace; answer from the agents that finished
+            deadline_hit = True
+            print(f"[STREAM] Deadline exceeded, summarizing partial results: {query[:50]}")
+        
+        # Agents that ran, as opposed to skipped placeholders
+        finished_agents = [
+            name for name in processed_agents
+            if not (isinstance(agent_outputs.get(name), dict) and agent_outputs[name].get("skipped"))
+        ]
+        
+        if deadline_hit and not summary_sent and not finished_agents:
+            yield {
+                "type": "error",
+                "error": "Request deadline exceeded",
+                "message": "Request deadline exceeded before any agent finished"
+            }
         
         # If no summary was found but we have agent outputs, generate a comprehensive fallback
-        if not summary_sent and processed_agents:
-            yield f"data: {json.dumps({'type': 'task', 'status': 'executing', 'message': 'Generating final summary from all agent results...', 'agent': 'supervisor'})}\n\n"
+        elif not summary_sent and processed_agents:
+            yield {'type': 'task', 'status': 'executing', 'message': 'Generating final summary from all agent results...', 'agent': 'supervisor'}
             
             # Helper function to extract clean text
             def extract_clean_text(value):
@@ -249,9 +416,10 @@ async def stream_query_processing(query: str):
                 "type": "complete",
                 "response": summary_text,
                 "agent_outputs": final_agent_outputs,
-                "message": "Query processed successfully"
+                "message": "Request deadline exceeded; partial results" if deadline_hit else "Query processed successfully",
+                "cache": "bypass"
             }
-            yield f"data: {json.dumps(final_response)}\n\n"
+            yield final_response
         
     except Exception as e:
         import traceback
@@ -262,7 +430,24 @@ async def stream_query_processing(query: str):
             "message": f"Error processing query: {str(e)}",
             "trace": error_trace
         }
-        yield f"data: {json.dumps(error_response)}\n\n"
+        yield error_response
+    except (asyncio.CancelledError, GeneratorExit):
+        print(f"[STREAM] Consumer gone, cancelling query: {query[:50]}")
+        raise
+    finally:
+        await stream.aclose()
+
+
+async def stream_query_processing(query: str, deadline_seconds: Optional[float] = None):
+    """
+    Stream query processing results from LangGraph supervisor with detailed task execution.
+    
+    When the client disconnects, Quart cancels the response and closes this
+    generator; closing the event source in turn cancels the graph run.
+    """
+    async with aclosing(query_events(query, deadline_seconds)) as events:
+        async for event in events:
+            yield f"data: {json.dumps(event)}\n\n"
 
 
 @query_bp.route("/query", methods=["POST"])
@@ -286,7 +471,7 @@ async def process_query():
         if query_request.stream:
             # Return streaming response
             return Response(
-                stream_query_processing(query_request.query),
+                stream_query_processing(query_request.query, request_deadline_seconds(query_request)),
                 mimetype="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
@@ -295,28 +480,64 @@ async def process_query():
                 }
             )
         else:
-            # Process query through Supervisor Agent (non-streaming)
-            result = await supervisor.process_query(query_request.query)
-            
-            # Format response
-            response_text = result.get("response", result.get("summary", "Processing complete"))
-            
-            # Format agent outputs for frontend
-            agent_outputs = {}
-            for agent_name, agent_result in result.get("agent_outputs", {}).items():
-                if isinstance(agent_result, dict):
-                    agent_outputs[agent_name] = agent_result.get("formatted", str(agent_result))
-                else:
-                    agent_outputs[agent_name] = str(agent_result)
-            
-            # Add supervisor message
-            agent_outputs["supervisor"] = result.get("supervisor", "Query processed")
+            # Serve repeat read-only queries from the response cache
+            cached = await response_cache.aget(query_request.query)
+            if cached is not None:
+                result = supervisor.build_result(query_request.query, last_state(cached))
+            else:
+                # Process query through Supervisor Agent (non-streaming)
+                try:
+                    result = await coalescer.run(
+                        query_request.query,
+                        deadline_seconds=request_deadline_seconds(query_request)
+                    )
+                except DeadlineExceeded:
+                    return {"error": "Request deadline exceeded"}, 504
+                await response_cache.aput_result(query_request.query, result)
             
-            return {
-                "response": response_text,
-                "agent_outputs": agent_outputs,
-                "message": "Query processed successfully"
-            }
+            status = cache_status(cached is not None, result.get("plan"))
+            return format_query_result(result), 200, {"X-Cache": status.upper()}
     except Exception as e:
         return {"error": f"Error processing query: {str(e)}"}, 500
 
+
+@query_bp.route("/query/batch", methods=["POST"])
+async def process_query_batch():
+    """
+    Run a batch of queries through the Supervisor Agent.
+    
+    At most `concurrency` queries run at once and identical queries are
+    computed once. Results are streamed as NDJSON, one line per query in
+    completion order, each carrying the query's original index.
+    """
+    try:
+        data = await request.get_json()
+        if not data:
+            return {"error": "No JSON data provided"}, 400
+        
+        try:
+            batch_request = BatchQueryRequest(**data)
+        except ValidationError as e:
+            return {"error": "Invalid request", "details": str(e)}, 400
+        
+        max_queries = int(os.getenv("BATCH_MAX_QUERIES", "500"))
+        if not batch_request.queries:
+            return {"error": "No queries provided"}, 400
+        if len(batch_request.queries) > max_queries:
+            return {"error": f"Too many queries (max {max_queries})"}, 400
+        
+        max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+        concurrency = batch_request.concurrency or int(os.getenv("BATCH_QUERY_CONCURRENCY", "4"))
+        concurrency = max(1, min(concurrency, max_concurrency))
+        
+        return Response(
+            stream_query_batch(batch_request.queries, concurrency, batch_request.deadline_ms),
+            mimetype="application/x-ndjson",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"
+            }
+        )
+    except Exception as e:
+        return {"error": f"Error processing batch: {str(e)}"}, 500
+
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 from agents.supervisor_langgraph import SupervisorAgentLangGraph
 from blueprints.query import query_bp, set_supervisor
 from blueprints.health import health_bp
+from blueprints.jobs import jobs_bp, job_manager
+from agents import http_client, place_index
 
 load_dotenv()
 
@@ -34,6 +36,22 @@ set_supervisor(supervisor)
 # Register blueprints
 app.register_blueprint(health_bp)
 app.register_blueprint(query_bp)
+app.register_blueprint(jobs_bp)
+
+
+@app.before_serving
+async def startup():
+    """Open the shared HTTP client and start the background job worker pool."""
+    await http_client.startup()
+    await job_manager.start()
+
+
+@app.after_serving
+async def shutdown():
+    """Stop the job workers, close the shared HTTP client and snapshot the place index."""
+    await job_manager.stop()
+    await http_client.shutdown()
+    await place_index.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""Tests for the TTL/LRU cache and its SQLite backend."""
+
+import asyncio
+import threading
+
+from agents.cache import SQLiteCacheBackend, TTLCache
+
+
+def _accessed_at(backend: SQLiteCacheBackend, key: str) -> float:
+    return backend._conn.execute(
+        f"SELECT accessed_at FROM {backend.table} WHERE key = ?", (key,)
+    ).fetchone()[0]
+
+
+def test_sqlite_hit_only_touches_stale_access_time(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), "touch", touch_interval=60)
+    backend.set("key", {"a": 1}, expires_at=1e12)
+    written = _accessed_at(backend, "key")
+
+    assert backend.get("key") == ({"a": 1}, 1e12)
+    assert _accessed_at(backend, "key") == written
+
+    backend.touch_interval = 0
+    backend.get("key")
+    assert _accessed_at(backend, "key") > written
+
+
+def test_sqlite_uses_normal_synchronous_mode(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), "pragma")
+    # 1 = NORMAL
+    assert backend._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_async_access_runs_sqlite_off_the_event_loop(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), "async")
+    cache = TTLCache("test_async_sqlite", backend=backend)
+    threads = []
+    original_get = backend.get
+
+    def get(key):
+        threads.append(threading.current_thread())
+        return original_get(key)
+
+    backend.get = get
+
+    async def run():
+        await cache.aset("key", [1, 2])
+        return await cache.aget("key"), await cache.aget("missing")
+
+    assert asyncio.run(run()) == ([1, 2], None)
+    assert threads and all(thread is not threading.main_thread() for thread in threads)
@@ -0,0 +1,51 @@
+"""Tests for sharing supervisor runs between identical queries."""
+
+import asyncio
+from types import SimpleNamespace
+
+from agents.coalescing import QueryCoalescer
+
+
+class FakeSupervisor:
+    """Streams a plan and a summary; records the budget of every run it starts."""
+
+    def __init__(self):
+        self.runs = []
+        self.intent_matcher = SimpleNamespace(match=lambda query: SimpleNamespace(plan={"use_googlemap": True}))
+
+    async def stream_query(self, query, deadline_seconds=None):
+        self.runs.append(deadline_seconds)
+        run = len(self.runs)
+        yield {"plan": {"use_googlemap": True}}
+        await asyncio.sleep(0.05)
+        yield {"plan": {"use_googlemap": True}, "summary": f"run {run}"}
+
+
+async def _collect(coalescer, deadline_seconds, delay=0.0):
+    await asyncio.sleep(delay)
+    return [chunk async for chunk in coalescer.stream("sushi near Taipei 101", deadline_seconds=deadline_seconds)]
+
+
+def _run_all(*callers):
+    supervisor = FakeSupervisor()
+    coalescer = QueryCoalescer(supervisor, enabled=True)
+    coalescer.deadline_slack = 10
+
+    async def run():
+        return await asyncio.gather(*(_collect(coalescer, *caller) for caller in callers))
+
+    return supervisor, asyncio.run(run())
+
+
+def test_follower_with_similar_deadline_joins():
+    supervisor, results = _run_all((20,), (25, 0.01))
+    assert supervisor.runs == [20]
+    assert results[0] == results[1]
+
+
+def test_follower_with_much_later_deadline_runs_on_its_own():
+    supervisor, results = _run_all((5,), (50, 0.01), (50, 0.02))
+    # The third caller joins the second run, which has the later deadline
+    assert supervisor.runs == [5, 50]
+    assert results[0][-1]["summary"] == "run 1"
+    assert results[1][-1]["summary"] == results[2][-1]["summary"] == "run 2"
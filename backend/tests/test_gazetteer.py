@@ -0,0 +1,36 @@
+"""Tests for offline landmark lookups."""
+
+import numpy as np
+
+from agents.gazetteer import Gazetteer
+
+
+def _gazetteer() -> Gazetteer:
+    entries = {
+        "daan": (25.0264, 121.5434),
+        "shilin night market": (25.0881, 121.524),
+        "taipei 101": (25.0339, 121.5645),
+        "ximending": (25.0421, 121.5081),
+    }
+    names = sorted(entries)
+    coords = np.array([entries[name] for name in names], dtype=np.float32)
+    return Gazetteer(np.array(names, dtype=str), coords, fuzzy_cutoff=0.85, min_key_length=6)
+
+
+def test_exact_region_suffix_prefix_and_typo_match():
+    gazetteer = _gazetteer()
+    assert gazetteer.find("Daan")[0] == "daan"
+    assert gazetteer.find("Taipei 101, Taipei, Taiwan")[0] == "taipei 101"
+    assert gazetteer.find("Shilin Night")[0] == "shilin night market"
+    assert gazetteer.find("Ximenting")[0] == "ximending"
+
+
+def test_partial_and_short_keys_fall_through_to_the_geocoder():
+    gazetteer = _gazetteer()
+    # Prefix ends inside a word
+    assert gazetteer.find("Taipei 1") is None
+    assert gazetteer.find("Shilin Nig") is None
+    # Too short for a fuzzy match
+    assert gazetteer.find("Dan") is None
+    # Different number
+    assert gazetteer.find("Taipei 103") is None
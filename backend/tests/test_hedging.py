@@ -0,0 +1,134 @@
+"""Tests for hedged LLM requests, against a fake client with injected latency."""
+
+import asyncio
+import itertools
+
+from agents.hedging import HedgedLLM, is_hedge_attempt
+from agents.metrics import metrics
+
+
+_names = itertools.count()
+
+
+class FakeLLM:
+    """Answers with its attempt number after that attempt's delay."""
+
+    def __init__(self, *delays: float):
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = []
+        self.closed = []
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        attempt = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[attempt])
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        return f"answer {attempt}"
+
+    async def astream(self, input, config=None, **kwargs):
+        attempt = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[attempt])
+            for i in range(3):
+                yield f"chunk {attempt}.{i}"
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        finally:
+            self.closed.append(attempt)
+
+
+def _hedged(llm: FakeLLM, delay: float = 0.05) -> HedgedLLM:
+    hedged = HedgedLLM(llm, f"test-{next(_names)}", enabled=True)
+    hedged.initial_delay = delay
+    return hedged
+
+
+def test_primary_wins_under_hedge_delay():
+    llm = FakeLLM(0.01, 0.01)
+    hedged = _hedged(llm, delay=0.2)
+
+    assert asyncio.run(hedged.ainvoke("hi")) == "answer 0"
+    assert llm.calls == 1
+    assert metrics.get(f"llm.{hedged.name}.hedged") == 0
+
+
+def test_hedge_wins_when_primary_stalls():
+    llm = FakeLLM(5.0, 0.01)
+    hedged = _hedged(llm)
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        result = await hedged.ainvoke("hi")
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == "answer 1"
+    assert elapsed < 1.0
+    assert metrics.get(f"llm.{hedged.name}.hedged") == 1
+    assert metrics.get(f"llm.{hedged.name}.hedge_wins") == 1
+
+
+def test_loser_is_cancelled():
+    llm = FakeLLM(5.0, 0.01)
+    hedged = _hedged(llm)
+
+    asyncio.run(hedged.ainvoke("hi"))
+    assert llm.cancelled == [0]
+
+
+def test_stream_hedge_closes_losing_stream():
+    llm = FakeLLM(5.0, 0.01)
+    hedged = _hedged(llm)
+
+    async def run():
+        chunks = [chunk async for chunk in hedged.astream("hi")]
+        return chunks, sorted(llm.closed)
+
+    chunks, closed = asyncio.run(run())
+    assert chunks == ["chunk 1.0", "chunk 1.1", "chunk 1.2"]
+    assert llm.cancelled == [0]
+    assert closed == [0, 1]
+
+
+def test_stream_closed_when_consumer_stops_early():
+    llm = FakeLLM(0.01)
+    hedged = _hedged(llm, delay=0.2)
+
+    async def run():
+        stream = hedged.astream("hi")
+        first = await stream.__anext__()
+        await stream.aclose()
+        # Closed right away, not when the event loop shuts down
+        return first, list(llm.closed)
+
+    assert asyncio.run(run()) == ("chunk 0.0", [0])
+
+
+def test_hedge_attempt_is_marked_only_in_the_duplicate():
+    seen = []
+
+    class MarkingLLM(FakeLLM):
+        async def ainvoke(self, input, config=None, **kwargs):
+            seen.append(is_hedge_attempt())
+            return await super().ainvoke(input, config=config, **kwargs)
+
+    hedged = _hedged(MarkingLLM(5.0, 0.01))
+    asyncio.run(hedged.ainvoke("hi"))
+    assert seen == [False, True]
+    assert not is_hedge_attempt()
+
+
+def test_research_chain_is_built_once(monkeypatch):
+    from agents import research_agent
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(research_agent, "_research_llm", None)
+    first = research_agent.research_llm()
+    assert research_agent.research_llm() is first
+    assert first.name == "research"
@@ -0,0 +1,87 @@
+"""Tests for the shared HTTP client across event loops."""
+
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from agents import http_client
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def finish(self):
+        super().finish()
+        self.server.disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.disconnected = threading.Event()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}/"
+    srv.shutdown()
+    srv.server_close()
+
+
+async def _get(url):
+    return (await http_client.http_get(url)).text
+
+
+async def _shutdown():
+    await http_client.shutdown()
+
+
+def test_client_from_a_finished_loop_drops_its_connections(server):
+    srv, url = server
+    assert asyncio.run(_get(url)) == "ok"
+    old = http_client._client
+    assert not srv.disconnected.is_set()
+
+    async def next_loop():
+        return http_client.get_client()
+
+    try:
+        assert asyncio.run(next_loop()) is not old
+        assert srv.disconnected.wait(2)
+    finally:
+        asyncio.run(_shutdown())
+
+
+def test_client_from_a_running_loop_is_closed_there(server):
+    srv, url = server
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        assert asyncio.run_coroutine_threadsafe(_get(url), loop).result(5) == "ok"
+        old = http_client._client
+
+        async def next_loop():
+            http_client.get_client()
+            # Closed by the other loop's thread
+            for _ in range(100):
+                if old.is_closed:
+                    break
+                await asyncio.sleep(0.02)
+
+        asyncio.run(next_loop())
+        assert old.is_closed
+        assert srv.disconnected.wait(2)
+    finally:
+        asyncio.run(_shutdown())
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(2)
+        loop.close()
@@ -0,0 +1,115 @@
+"""Tests for the rule-based intent matcher that decides when the planner LLM is skipped."""
+
+import re
+
+import pytest
+
+from agents.intent import IntentMatcher, IntentRule, extract_place_search
+from agents.metrics import metrics
+
+
+FLAGS = ("use_googlemap", "use_calendar", "use_telephone", "use_research")
+
+
+def _selected(plan):
+    return {flag for flag in FLAGS if plan[flag]}
+
+
+def test_noisy_or_combines_matched_weights():
+    rule = IntentRule("test", [
+        (re.compile(p), w) for p, w in [("a", 0.5), ("b", 0.5), ("c", 0.9)]
+    ])
+    score, matched = rule.score("a b")
+    assert score == pytest.approx(0.75)
+    assert matched == ["a", "b"]
+    assert rule.score("x") == (0.0, [])
+
+
+@pytest.mark.parametrize("query, flags", [
+    ("Find sushi near Taipei 101", {"use_googlemap"}),
+    ("Add it to my calendar tomorrow at 3pm", {"use_calendar"}),
+    ("What is the history of Taipei 101?", {"use_research"}),
+])
+def test_confident_single_intent(query, flags):
+    match = IntentMatcher(threshold=0.8).match(query)
+    assert match.confident
+    assert _selected(match.plan) == flags
+
+
+@pytest.mark.parametrize("query", [
+    "Find a pizza place",
+    "Schedule a meeting",
+    "Call Bob",
+    "Explain the history of Taipei 101?",
+])
+def test_unsure_single_intent(query):
+    match = IntentMatcher(threshold=0.8).match(query)
+    assert _selected(match.plan)
+    assert not match.confident
+
+
+def test_telephone_alone_stays_below_the_default_threshold():
+    # Both telephone signals together score 0.85, i.e. confidence 0.7
+    match = IntentMatcher(threshold=0.8).match("Call +886 2 2345 6789")
+    assert _selected(match.plan) == {"use_telephone"}
+    assert match.confidence == pytest.approx(0.7)
+    assert not match.confident
+    assert IntentMatcher(threshold=0.7).match("Call +886 2 2345 6789").confident
+
+
+def test_reservation_implies_map_calendar_and_telephone():
+    match = IntentMatcher(threshold=0.8).match("Book a table at Din Tai Fung")
+    assert _selected(match.plan) == {"use_googlemap", "use_calendar", "use_telephone"}
+    assert match.scores["calendar"] == match.scores["telephone"] == pytest.approx(0.95)
+    assert match.confident
+    assert "arguments" not in match.plan
+
+
+def test_mixed_signals_are_not_confident():
+    # research is clearly on, googlemap sits right at the activation score
+    match = IntentMatcher(threshold=0.8).match("What is the difference between ramen and udon?")
+    assert match.confidence == 0.0
+    assert not match.confident
+
+
+def test_no_signals_defers_to_the_llm():
+    matcher = IntentMatcher(threshold=0.8)
+    match = matcher.match("hello there")
+    assert not _selected(match.plan)
+    assert match.confidence == 0.0
+    assert matcher.try_fast_path("hello there") is None
+
+
+def test_fast_path_respects_threshold(monkeypatch):
+    query = "Find sushi near Taipei 101"
+    hits = metrics.get("planner.fast_path.hits")
+    misses = metrics.get("planner.fast_path.misses")
+
+    assert IntentMatcher(threshold=0.8).try_fast_path(query)["use_googlemap"]
+    assert IntentMatcher(threshold=0.9).try_fast_path(query) is None
+    monkeypatch.setenv("PLANNER_FAST_PATH_THRESHOLD", "1.01")
+    assert IntentMatcher().try_fast_path(query) is None
+
+    assert metrics.get("planner.fast_path.hits") == hits + 1
+    assert metrics.get("planner.fast_path.misses") == misses + 2
+
+
+def test_plain_place_search_carries_tool_arguments():
+    plan = IntentMatcher(threshold=0.8).match("Find sushi restaurants near Taipei 101").plan
+    assert plan["arguments"] == {"googlemap": {"query": "sushi restaurants", "location": "Taipei 101"}}
+
+    plan = IntentMatcher(threshold=0.0).match("Find a restaurant near Taipei 101 and call them").plan
+    assert "arguments" not in plan
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Find sushi near Taipei 101", {"query": "sushi", "location": "Taipei 101"}),
+    ("please search for a coffee shop close to Shilin Night Market?",
+     {"query": "coffee shop", "location": "Shilin Night Market"}),
+    ("show me some ramen around Ximending.", {"query": "ramen", "location": "Ximending"}),
+    ("bakeries in Da'an", {"query": "bakeries", "location": "Da'an"}),
+    ("Find sushi", None),
+    ("What is the history of Taipei 101?", None),
+])
+def test_extract_place_search(query, expected):
+    assert extract_place_search(query) == expected
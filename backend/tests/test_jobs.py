@@ -0,0 +1,42 @@
+"""Tests for the background job runner."""
+
+import asyncio
+
+from agents.jobs import Job, JobManager
+
+
+def _runner(closed):
+    async def runner(job):
+        try:
+            yield {"type": "status"}
+            yield {"type": "complete"}
+        finally:
+            closed.append(job.id)
+    return runner
+
+
+def test_job_records_events_and_result():
+    closed = []
+    job = Job(id="ok", query="q")
+    asyncio.run(JobManager(_runner(closed), workers=1)._run(job))
+    assert job.status == "succeeded"
+    assert job.result == {"type": "complete"}
+    assert closed == ["ok"]
+
+
+def test_runner_is_closed_when_the_job_fails_mid_run():
+    closed = []
+    job = Job(id="broken", query="q")
+
+    def add_event(event):
+        raise RuntimeError("event log unavailable")
+
+    job.add_event = add_event
+
+    async def run():
+        await JobManager(_runner(closed), workers=1)._run(job)
+        # Closed before _run returned, not later by the garbage collector
+        return list(closed)
+
+    assert asyncio.run(run()) == ["broken"]
+    assert job.status == "failed"
@@ -0,0 +1,23 @@
+"""Tests for the per-model LLM call limiters."""
+
+import asyncio
+
+from agents.llm_registry import _ModelLimiter
+
+
+def test_slot_is_released_on_the_semaphore_it_took():
+    limiter = _ModelLimiter(1)
+
+    async def run():
+        async with limiter.slot():
+            first = limiter._semaphore
+            # The next call rebuilds the semaphore, as from a new event loop
+            limiter._loop = None
+            async with limiter.slot():
+                second = limiter._semaphore
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+    assert first._value == second._value == 1
+    assert limiter.in_flight == 0
@@ -0,0 +1,60 @@
+"""Tests for answering searches from the local place index."""
+
+import random
+
+import pytest
+
+from agents.place_index import PlaceIndex
+from agents.places import place_result
+from agents.ranking import rank_places, ranking_fields
+
+
+ORIGIN = (25.0339, 121.5645)
+RADIUS = 5000.0
+
+
+def _candidates(n: int = 20, seed: int = 3):
+    rng = random.Random(seed)
+    return [
+        {
+            "place_id": f"place-{i}",
+            "name": f"Place {i}",
+            "geometry": {"location": {
+                "lat": ORIGIN[0] + rng.uniform(-0.03, 0.03),
+                "lng": ORIGIN[1] + rng.uniform(-0.03, 0.03)
+            }},
+            "rating": round(rng.uniform(2.5, 5.0), 1),
+            "opening_hours": {"open_now": rng.random() < 0.6}
+        }
+        for i in range(n)
+    ]
+
+
+def _api_then_index(query: str):
+    """Place IDs of a live (API) answer and of the same search answered by the index."""
+    candidates = _candidates()
+    places = rank_places(candidates, ORIGIN[0], ORIGIN[1], RADIUS, 5, query)
+    index = PlaceIndex(enabled=True, path="")
+    index.add(
+        query, ORIGIN[0], ORIGIN[1], [place_result(place, {}) for place in places],
+        ranking=ranking_fields(places, candidates)
+    )
+    indexed = index.search(query, ORIGIN[0], ORIGIN[1], RADIUS, 5)
+    return [p["place_id"] for p in places], [p["place_id"] for p in indexed]
+
+
+@pytest.mark.parametrize("ranking", ["score", "google"])
+@pytest.mark.parametrize("query", ["ramen", "nearest ramen"])
+def test_index_answer_has_the_api_order(monkeypatch, ranking, query):
+    monkeypatch.setenv("RANKING", ranking)
+    api, indexed = _api_then_index(query)
+    assert indexed == api
+
+
+def test_index_answer_has_no_ranking_fields():
+    index = PlaceIndex(enabled=True, path="")
+    candidates = _candidates(3)
+    index.add("ramen", ORIGIN[0], ORIGIN[1], [place_result(p, {}) for p in candidates],
+              complete=True, ranking=ranking_fields(candidates, candidates))
+    for place in index.search("ramen", ORIGIN[0], ORIGIN[1], RADIUS, 5):
+        assert "queries" not in place and "ranking" not in place and "relevance" not in place
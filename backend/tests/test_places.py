@@ -0,0 +1,43 @@
+"""Tests for concurrent place details lookups."""
+
+import asyncio
+import time
+
+from agents.deadline import use_deadline
+from agents.places import fetch_details, text_search_request
+
+
+def test_spent_deadline_skips_lookups_without_creating_them():
+    created = []
+
+    async def lookup(place_id):
+        return {"name": place_id}
+
+    def fetch(place_id):
+        created.append(place_id)
+        return lookup(place_id)
+
+    async def run():
+        use_deadline(time.time() - 1)
+        return await fetch_details([{"place_id": "a"}, {"place_id": "b"}], fetch)
+
+    assert asyncio.run(run()) == ([{}, {}], 2)
+    # No coroutine was built, so none is left un-awaited
+    assert created == []
+
+
+def test_slow_lookup_is_limited_by_its_timeout():
+    async def fetch(place_id):
+        if place_id == "slow":
+            await asyncio.sleep(5)
+        return {"name": place_id}
+
+    details = asyncio.run(fetch_details([{"place_id": "slow"}, {"place_id": "fast"}], fetch, timeout=0.05))
+    assert details == ([{}, {"name": "fast"}], 1)
+
+
+def test_text_search_request_biases_towards_the_location():
+    params, key = text_search_request("sushi", "Taipei 101", "k", {"lat": 25.03, "lng": 121.56}, 1000)
+    assert params == {"query": "sushi near Taipei 101", "key": "k", "location": "25.03,121.56", "radius": 1000}
+    assert key.endswith("|location=25.03,121.56|radius=1000")
+    assert text_search_request("sushi", "Taipei 101", "k")[1] != key
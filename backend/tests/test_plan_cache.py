@@ -0,0 +1,79 @@
+"""Tests for plan cache query signatures."""
+
+import asyncio
+
+from agents.plan_cache import PlanCache, normalize_query
+
+
+def test_names_times_and_numbers_share_a_signature():
+    assert normalize_query("Book a table at Din Tai Fung tomorrow at 7pm") == normalize_query(
+        "book a table at Joe's Pizza tomorrow at 8:30 PM"
+    )
+
+
+def test_capitalized_intent_verbs_do_not_collide():
+    call = normalize_query("Find a restaurant near Taipei 101 and Call them")
+    book = normalize_query("Find a restaurant near Taipei 101 and Book it")
+    assert call != book
+    assert call == normalize_query("find a restaurant near Taipei 101 and call them")
+
+
+def test_capitalized_head_nouns_do_not_collide():
+    sushi = normalize_query("Find Sushi near Taipei 101")
+    flights = normalize_query("Find Flights near Taipei")
+    reviews = normalize_query("Find Reviews near Taipei")
+    assert len({sushi, flights, reviews}) == 3
+    assert sushi == normalize_query("find sushi near Shilin Night Market")
+
+
+def test_only_argument_positions_are_templated():
+    assert normalize_query("Schedule a Meeting with Bob") == "schedule a meeting with <place>"
+    assert normalize_query("Call Din Tai Fung") == normalize_query("call Joe's Pizza")
+
+
+def test_cached_plan_is_not_reused_for_another_intent():
+    cache = PlanCache(backend="memory")
+    cache.put(
+        "Find a restaurant near Taipei 101 and Call them",
+        {"use_googlemap": True, "use_telephone": True, "use_calendar": False, "use_research": False}
+    )
+    assert cache.get("Find a restaurant near Din Tai Fung and Call them")["use_telephone"]
+    assert cache.get("Find a restaurant near Taipei 101 and Book it") is None
+
+
+def test_cached_search_plan_is_not_reused_for_research():
+    cache = PlanCache(backend="memory")
+    cache.put("Find Sushi near Taipei 101", {
+        "use_googlemap": True, "use_calendar": False, "use_telephone": False, "use_research": False
+    })
+    assert cache.get("Find Reviews near Taipei") is None
+
+
+def test_hit_rederives_place_search_arguments():
+    cache = PlanCache(backend="memory")
+    cache.put("Find sushi near Taipei 101", {
+        "use_googlemap": True, "use_calendar": False, "use_telephone": False, "use_research": False,
+        "arguments": {"googlemap": {"query": "sushi", "location": "Taipei 101"}}
+    })
+    plan = cache.get("Find sushi near Shilin Night Market")
+    assert plan["arguments"] == {"googlemap": {"query": "sushi", "location": "Shilin Night Market"}}
+
+
+def test_hit_bypassed_when_arguments_need_the_planner():
+    cache = PlanCache(backend="memory")
+    cache.put("Add dinner at Din Tai Fung tomorrow at 7pm to my calendar", {
+        "use_googlemap": False, "use_calendar": True, "use_telephone": False, "use_research": False,
+        "arguments": {"calendar": {"title": "Dinner at Din Tai Fung", "date": "tomorrow", "time": "19:00"}}
+    })
+    assert cache.get("Add lunch at Joe's Pizza tomorrow at 1pm to my calendar") is None
+
+
+def test_async_access_with_sqlite_backend(tmp_path):
+    cache = PlanCache(backend="sqlite", path=str(tmp_path / "plans.sqlite3"))
+    plan = {"use_googlemap": False, "use_calendar": False, "use_telephone": False, "use_research": True}
+
+    async def run():
+        await cache.aput("What is the history of Taipei 101?", plan)
+        return await cache.aget("What is the history of Taipei 101?")
+
+    assert asyncio.run(run())["use_research"]
@@ -0,0 +1,66 @@
+"""Tests for the /query event stream when a run overruns its deadline."""
+
+import asyncio
+from types import SimpleNamespace
+
+import agents.supervisor_langgraph as supervisor_module
+import blueprints.query as query_module
+from agents.intent import IntentMatcher
+from agents.supervisor_langgraph import SupervisorAgentLangGraph
+
+
+PLAN = {"use_googlemap": True, "use_research": False, "use_calendar": False, "use_telephone": False}
+
+
+class StuckGraph:
+    """Emits the given node updates, then hangs like a node that ignores the deadline."""
+
+    def __init__(self, updates):
+        self.updates = updates
+
+    async def astream(self, state, stream_mode=None):
+        for update in self.updates:
+            yield "updates", update
+        await asyncio.sleep(60)
+
+
+def _events(monkeypatch, updates):
+    monkeypatch.setattr(supervisor_module, "GRACE_SECONDS", 0.1)
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "off")
+    supervisor = SupervisorAgentLangGraph.__new__(SupervisorAgentLangGraph)
+    supervisor.graph = StuckGraph(updates)
+    supervisor.speculation = SimpleNamespace(discard=lambda run_id: None)
+    supervisor.intent_matcher = IntentMatcher()
+    query_module.set_supervisor(supervisor)
+
+    async def run():
+        return [event async for event in query_module.query_events("sushi near Taipei 101", deadline_seconds=0.2)]
+
+    return asyncio.run(run())
+
+
+def test_deadline_falls_back_to_summary_of_finished_agents(monkeypatch):
+    events = _events(monkeypatch, [
+        {"plan": {"plan": PLAN, "agent_outputs": {
+            "research": {"agent": "Research", "success": True, "formatted": "Not needed", "skipped": True}
+        }}},
+        {"googlemap": {"agent_outputs": {
+            "googleMap": {"agent": "GoogleMap", "success": True, "formatted": "1. Sushi Bar"}
+        }, "execution_order": ["googleMap"]}}
+    ])
+    assert not any(event["type"] == "error" for event in events)
+    complete = events[-1]
+    assert complete["type"] == "complete"
+    assert "Sushi Bar" in complete["response"]
+    assert complete["agent_outputs"]["googleMap"] == "1. Sushi Bar"
+
+
+def test_deadline_before_any_agent_finished_is_an_error(monkeypatch):
+    events = _events(monkeypatch, [
+        {"plan": {"plan": PLAN, "agent_outputs": {
+            "research": {"agent": "Research", "success": True, "formatted": "Not needed", "skipped": True}
+        }}}
+    ])
+    assert events[-1]["type"] == "error"
+    assert events[-1]["error"] == "Request deadline exceeded"
+    assert "trace" not in events[-1]
@@ -0,0 +1,55 @@
+"""Tests for the whole-run response cache."""
+
+import asyncio
+
+from agents.response_cache import ResponseCache
+from agents.supervisor_langgraph import SupervisorAgentLangGraph
+
+
+QUERY = "Find sushi near Taipei 101"
+PLAN = {"use_googlemap": True, "use_research": False, "use_calendar": False, "use_telephone": False}
+
+
+def _googlemap_output(data):
+    # Agent output exactly as the supervisor records a structured tool result
+    supervisor = SupervisorAgentLangGraph.__new__(SupervisorAgentLangGraph)
+    update = supervisor._tool_output("googleMap", "GoogleMap", data, {"query": "sushi"}, lambda d: "formatted")
+    return update["agent_outputs"], update["execution_order"]
+
+
+def _run(data):
+    agent_outputs, execution_order = _googlemap_output(data)
+    return [{
+        "query": QUERY,
+        "plan": PLAN,
+        "agent_outputs": agent_outputs,
+        "execution_order": execution_order,
+        "summary": "Here is what I found."
+    }]
+
+
+def test_successful_run_is_cached():
+    cache = ResponseCache(backend="memory")
+    assert cache.put(QUERY, _run({"success": True, "results": [{"name": "Sushi Bar"}]}))
+    assert cache.get(QUERY) is not None
+
+
+def test_run_with_failed_tool_result_is_not_cached():
+    cache = ResponseCache(backend="memory")
+    chunks = _run({"success": False, "error": "Places API request timed out", "results": []})
+    assert chunks[-1]["agent_outputs"]["googleMap"]["success"] is False
+    assert not cache.put(QUERY, chunks)
+    assert cache.get(QUERY) is None
+
+
+def test_sqlite_cache_is_read_and_written_off_the_event_loop(tmp_path):
+    cache = ResponseCache(backend="sqlite", path=str(tmp_path / "cache.sqlite3"))
+    chunks = _run({"success": True, "results": [{"name": "Sushi Bar"}]})
+
+    async def run():
+        stored = await cache.aput(QUERY, chunks)
+        return stored, await cache.aget(QUERY)
+
+    stored, cached = asyncio.run(run())
+    assert stored
+    assert cached[-1]["summary"] == "Here is what I found."
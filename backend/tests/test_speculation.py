@@ -0,0 +1,49 @@
+"""Tests for adopting or discarding speculative agent runs."""
+
+import asyncio
+
+from agents.speculation import SpeculativeExecutor
+from agents.supervisor_langgraph import SupervisorAgentLangGraph
+
+
+PLAN = {"use_googlemap": True, "use_research": False}
+
+
+def _plan(query=None, location=None):
+    plan = dict(PLAN)
+    if query:
+        plan["arguments"] = {"googlemap": {"query": query, "location": location}}
+    return plan
+
+
+def _run(speculative_plan, final_plan):
+    executor = SpeculativeExecutor(enabled=True, threshold=0.5)
+    arguments = SupervisorAgentLangGraph._speculation_arguments
+
+    async def googlemap():
+        return {"agent_outputs": {"googleMap": {"success": True}}}
+
+    async def run():
+        executor.start("run", {"googlemap": 0.9}, {"googlemap": googlemap}, arguments(speculative_plan))
+        executor.resolve("run", final_plan, arguments(final_plan))
+        return await executor.adopt("run", "googlemap")
+
+    return asyncio.run(run())
+
+
+def test_run_with_the_planned_arguments_is_adopted():
+    assert _run(_plan("sushi", "Taipei 101"), _plan("Sushi", "taipei 101 ")) is not None
+
+
+def test_run_with_other_arguments_is_discarded():
+    assert _run(_plan("sushi", "Taipei 101"), _plan("ramen", "Taipei 101")) is None
+    assert _run(_plan("sushi", "Taipei 101"), _plan("sushi", "Shilin Night Market")) is None
+
+
+def test_agent_run_is_discarded_when_the_plan_names_arguments():
+    assert _run(_plan(), _plan("sushi", "Taipei 101")) is None
+    assert _run(_plan(), _plan()) is not None
+
+
+def test_run_is_discarded_when_the_plan_drops_the_agent():
+    assert _run(_plan("sushi", "Taipei 101"), {"use_googlemap": False}) is None
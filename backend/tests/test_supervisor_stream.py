@@ -0,0 +1,67 @@
+"""Tests for the streaming supervisor's outer deadline guard."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import agents.supervisor_langgraph as supervisor_module
+from agents.deadline import DeadlineExceeded
+from agents.supervisor_langgraph import SupervisorAgentLangGraph
+
+
+class StuckGraph:
+    """Emits the plan, then hangs like a node that ignores the deadline."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def astream(self, state, stream_mode=None):
+        try:
+            yield "updates", {"plan": {"plan": {"use_googlemap": True}}}
+            await asyncio.sleep(60)
+        finally:
+            self.closed = True
+
+
+def test_stream_ends_at_deadline_plus_grace(monkeypatch):
+    monkeypatch.setattr(supervisor_module, "GRACE_SECONDS", 0.1)
+    supervisor = SupervisorAgentLangGraph.__new__(SupervisorAgentLangGraph)
+    supervisor.graph = StuckGraph()
+    supervisor.speculation = SimpleNamespace(discard=lambda run_id: None)
+
+    async def run():
+        chunks = []
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            async for chunk in supervisor.stream_query("sushi near Taipei 101", deadline_seconds=0.2):
+                chunks.append(chunk)
+        return chunks, time.monotonic() - started
+
+    chunks, elapsed = asyncio.run(run())
+    assert [chunk["plan"] for chunk in chunks] == [{"use_googlemap": True}]
+    assert elapsed < 2.0
+    assert supervisor.graph.closed
+
+
+class SummaryGraph:
+    """Streams part of an LLM summary, then the deadline template replacing it."""
+
+    async def astream(self, state, stream_mode=None):
+        yield "custom", {"summary_delta": "The best sushi is at"}
+        yield "custom", {"summary_delta": "Found 1 place: Sushi Bar", "replace": True}
+
+
+def test_template_after_deadline_replaces_streamed_summary():
+    supervisor = SupervisorAgentLangGraph.__new__(SupervisorAgentLangGraph)
+    supervisor.graph = SummaryGraph()
+    supervisor.speculation = SimpleNamespace(discard=lambda run_id: None)
+
+    async def run():
+        return [chunk async for chunk in supervisor.stream_query("sushi near Taipei 101", deadline_seconds=5)]
+
+    assert asyncio.run(run()) == [
+        {"summary_delta": "The best sushi is at"},
+        {"summary_delta": "Found 1 place: Sushi Bar", "replace": True}
+    ]
@@ -40,6 +40,10 @@ export function useQueryStream() {
         ...prev,
         [agentKey]: outputText
       }))
+    } else if (data.type === 'summary_delta') {
+      // Summary tokens as they are generated; 'complete' replaces them with the final text
+      const delta = data.delta || ''
+      setResponse(prev => data.replace ? delta : prev + delta)
     } else if (data.type === 'complete') {
       const supervisorResponse = extractText(data.response || '')
       setResponse(supervisorResponse)
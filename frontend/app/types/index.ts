@@ -13,13 +13,17 @@ export interface AgentOutputs {
 }
 
 export interface StreamData {
-  type: 'status' | 'task' | 'agent_output' | 'complete' | 'error'
+  type: 'status' | 'task' | 'agent_output' | 'summary_delta' | 'complete' | 'error'
   message?: string
+  delta?: string
+  // summary_delta: replace the summary streamed so far instead of appending
+  replace?: boolean
   agent?: AgentType | string
   output?: unknown
   response?: unknown
   agent_outputs?: Record<string, unknown>
   error?: unknown
+  cache?: 'hit' | 'miss' | 'bypass'
 }
 
 export interface QueryResponse {